@@ -1,35 +1,19 @@
+import os
+import sys
 import streamlit as st
 import pandas as pd
-from resume_parser import parse_resume
-from job_parser import parse_job_description
-from matcher import compute_matching_score
-import os
-import tempfile
 
-# === Utility: Extract text from uploaded file ===
-def extract_text_from_file(uploaded_file):
-    ext = uploaded_file.name.split('.')[-1].lower()
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.' + ext) as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        tmp_path = tmp_file.name
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Scripts.resume_parser import parse_resume_uploads
+from Scripts.job_parser import parse_job_upload
+from Scripts.matcher import score_resumes
 
-    # Add your own parsing logic here for PDF/DOCX/TXT
-    if ext == 'txt':
-        with open(tmp_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    elif ext == 'pdf':
-        import fitz  # PyMuPDF
-        text = ""
-        with fitz.open(tmp_path) as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
-    elif ext == 'docx':
-        import docx
-        doc = docx.Document(tmp_path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    else:
-        return ""
+# Uploads are parsed straight from memory (no temp files). Extracted text goes through the shared
+# text cache and parsed resumes are memoised by content hash, so re-running with the same files
+# only re-scores them.
+@st.cache_data(show_spinner=False)
+def parse_job(data, filename):
+    return parse_job_upload(data, filename)
 
 # === UI ===
 st.title("Live Resume Matcher")
@@ -42,30 +26,34 @@ min_score = st.number_input("Minimum Matching Score", min_value=0.0, max_value=1
 
 if uploaded_job and uploaded_resumes and st.button("Match Resumes"):
     # Parse job description
-    job_text = extract_text_from_file(uploaded_job)
-    job_data = parse_job_description(job_text)
-    job_title = job_data.get("job_title", "")
-    job_skills = job_data.get("skills", [])
+    job_data = parse_job(uploaded_job.getvalue(), uploaded_job.name)
+    job_skills = job_data["skills"] if job_data else {}
 
-    # Parse resumes and compute match
-    results = []
-    for resume_file in uploaded_resumes:
-        resume_text = extract_text_from_file(resume_file)
-        resume_data = parse_resume(resume_text)
-
-        score = compute_matching_score(resume_data["skills"], job_skills)
+    # Parse all resumes in one batch (new ones in parallel, one process per core), then score them
+    # against the job together
+    resumes = parse_resume_uploads([(f.name, f.getvalue()) for f in uploaded_resumes], workers=os.cpu_count())
+    parsed = [(f, r) for f, r in zip(uploaded_resumes, resumes) if r is not None]
+    scores = score_resumes([r["skills"] for _, r in parsed], job_skills) if parsed else []
 
+    results = []
+    for (resume_file, resume_data), (score, matched, missing) in zip(parsed, scores):
         if score >= min_score:
             results.append({
-                "Name": resume_data.get("name", resume_file.name),
-                "Email": resume_data.get("email", ""),
-                "Phone": resume_data.get("phone", ""),
-                "Matching Score": round(score, 2)
+                "Name": resume_data["name"] or resume_file.name,
+                "Email": resume_data["email"],
+                "Phone": resume_data["phone"],
+                "Matching Score": round(score, 2),
+                "Matched Skills": ", ".join(matched),
+                "Missing Skills": ", ".join(missing),
             })
 
+    if job_data:
+        st.caption(f"Job title: {job_data['job_title']}")
+    if len(parsed) < len(uploaded_resumes):
+        st.warning(f"{len(uploaded_resumes) - len(parsed)} resume(s) could not be read.")
     if results:
         st.success("Matched Resumes:")
-        df = pd.DataFrame(results).sort_values(by="Matching Score", ascending=False)
+        df = pd.DataFrame(results).sort_values(by="Matching Score", ascending=False, kind="stable")
         st.dataframe(df)
     else:
-        st.warning("No resumes matched the criteria.")
\ No newline at end of file
+        st.warning("No resumes matched the criteria.")
@@ -0,0 +1,140 @@
+import io
+import os
+import re
+import sys
+import time
+import logging
+import zipfile
+from xml.etree import ElementTree
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import PDF_MIN_CHARS_PER_PAGE, PDF_MAX_BAD_CHAR_RATIO, EXTRACT_RETRY_PAGES, LOG_FILE
+from utils import setup_logger
+from Scripts import metrics
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Document text extraction shared by the resume and job description parsers. Sources are
+# file paths or the raw bytes of an upload. PDFs are read with PyMuPDF; pdfplumber, many times
+# slower, is only run on documents whose PyMuPDF text fails pdf_text_ok(). Document libraries
+# are imported on first use, so importing this module (and starting workers) stays cheap.
+
+# Text cache keys; bump a version whenever its extractor's output changes
+DOCX_EXTRACTOR = ("docx", 1)
+PDF_EXTRACTOR = ("pdf", 1)  # PyMuPDF with pdfplumber fallback
+# Cheaper retry tiers (Scripts/isolation.py), cached under their own keys
+DOCX_XML_EXTRACTOR = ("docx-xml", 1)
+PDF_HEAD_EXTRACTOR = (f"pdf-first{EXTRACT_RETRY_PAGES}", 1)  # PyMuPDF only, first pages only
+
+BAD_CHAR_RE = re.compile("[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f]")
+BOLD_FLAG = 16  # PyMuPDF span flag
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class PageLimitError(ValueError):
+    pass
+
+def _name(source):
+    return source if isinstance(source, str) else "<upload>"
+
+def _open_pdf(source):
+    import fitz
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+# ------------ DOCX Section ------------ #
+
+def read_docx(source):
+    from docx import Document
+    start = time.perf_counter()
+    doc = Document(source if isinstance(source, str) else io.BytesIO(source))
+    text = "\n".join([p.text for p in doc.paragraphs])
+    metrics.document(_name(source), DOCX_EXTRACTOR[0], time.perf_counter() - start)
+    return text
+
+def docx_heading(source):
+    # First heading or non-empty paragraph; "" if the document has neither
+    from docx import Document
+    doc = Document(source if isinstance(source, str) else io.BytesIO(source))
+    for para in doc.paragraphs:
+        if para.style.name.lower().startswith("heading") or para.text.strip():
+            return para.text.strip()
+    return ""
+
+def read_docx_xml(source):
+    # Paragraph text straight from word/document.xml, streamed: no python-docx object model
+    start = time.perf_counter()
+    paragraphs, parts = [], []
+    with zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source)) as archive:
+        with archive.open("word/document.xml") as xml:
+            for _, element in ElementTree.iterparse(xml):
+                if element.tag == WORD_NS + "t":
+                    parts.append(element.text or "")
+                elif element.tag == WORD_NS + "tab":
+                    parts.append("\t")
+                elif element.tag in (WORD_NS + "br", WORD_NS + "cr"):
+                    parts.append("\n")
+                elif element.tag == WORD_NS + "p":
+                    paragraphs.append("".join(parts))
+                    parts = []
+                    element.clear()
+    metrics.document(_name(source), DOCX_XML_EXTRACTOR[0], time.perf_counter() - start)
+    return "\n".join(paragraphs)
+
+# ------------ PDF Section ------------ #
+
+def pdf_text_ok(text, pages):
+    # PyMuPDF text is kept unless it is (nearly) empty for its page count, e.g. a scan or
+    # text drawn as vector paths, or largely replacement/control characters from a broken font map
+    chars = len(text) - text.count(" ") - text.count("\n")
+    if chars < PDF_MIN_CHARS_PER_PAGE * max(pages, 1):
+        return False
+    return len(BAD_CHAR_RE.findall(text)) <= PDF_MAX_BAD_CHAR_RATIO * chars
+
+def _pdfplumber_text(source):
+    import pdfplumber
+    with pdfplumber.open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        page_texts = [page.extract_text() for page in pdf.pages]
+    return "\n".join(text for text in page_texts if text)
+
+def read_pdf(source, max_pages=None):
+    start = time.perf_counter()
+    with _open_pdf(source) as doc:
+        pages = len(doc)
+        if max_pages and pages > max_pages:
+            raise PageLimitError(f"{pages} pages, over the {max_pages} page limit")
+        text = "".join(page.get_text() for page in doc)
+    extractor = "fitz"
+    if not pdf_text_ok(text, pages):
+        metrics.incr("pdf_fallbacks")
+        try:
+            fallback = _pdfplumber_text(source)
+        except Exception as e:
+            logger.error(f"pdfplumber fallback failed for {_name(source)}: {e}")
+            fallback = ""
+        if len(fallback.strip()) > len(text.strip()):
+            text, extractor = fallback, "pdfplumber"
+    metrics.document(_name(source), extractor, time.perf_counter() - start, pages)
+    return text
+
+def read_pdf_head(source, pages=EXTRACT_RETRY_PAGES):
+    # PyMuPDF text of the first pages only, without the pdfplumber fallback
+    start = time.perf_counter()
+    with _open_pdf(source) as doc:
+        pages = min(pages, len(doc))
+        text = "".join(doc[i].get_text() for i in range(pages))
+    metrics.document(_name(source), PDF_HEAD_EXTRACTOR[0], time.perf_counter() - start, pages)
+    return text
+
+def pdf_bold_title(source, min_size=10):
+    # Text of the first bold span larger than min_size points (a heading); "" if there is none
+    with _open_pdf(source) as doc:
+        for page in doc:
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", ()):
+                    for span in line["spans"]:
+                        bold = span["flags"] & BOLD_FLAG or "bold" in span["font"].lower()
+                        if bold and span["size"] > min_size and span["text"].strip():
+                            return span["text"].strip()
+    return ""
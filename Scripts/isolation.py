@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import atexit
+import logging
+import threading
+import multiprocessing
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import (EXTRACT_ISOLATION, EXTRACT_SANDBOXES, EXTRACT_TIMEOUT_SECONDS, EXTRACT_MEMORY_MB,
+                      EXTRACT_MAX_PAGES, QUARANTINE_FILE, QUARANTINE_AFTER_FAILURES, TEXT_CACHE_ENABLED, LOG_FILE)
+from utils import setup_logger
+from Scripts import metrics, extraction
+from Scripts.text_cache import get_text, put_text, file_hash, bytes_hash
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Fault-isolated document extraction. A document missing from the text cache is extracted in a
+# sandbox process (up to EXTRACT_SANDBOXES shared by the threads of a process, reused across
+# documents and stopped at exit) that is killed when it runs past EXTRACT_TIMEOUT_SECONDS, and
+# that dies on its own past EXTRACT_MEMORY_MB, so a pathological file costs one bounded attempt
+# instead of stalling or crashing the batch. Each document type has a full extractor and a
+# cheaper one that is tried when the first fails or the PDF has more than EXTRACT_MAX_PAGES
+# pages. When both fail, a line is appended to QUARANTINE_FILE; content hashes with
+# QUARANTINE_AFTER_FAILURES such lines are skipped by later runs. Delete their lines (or the
+# file) to try them again.
+
+class ExtractionError(Exception):
+    # One extractor failed, timed out or was killed
+    pass
+
+class ExtractionFailed(Exception):
+    # No text for the document: every extractor failed, or it is quarantined
+    pass
+
+# (text cache key, extraction function in Scripts/extraction.py, its options), full extractor first
+TIERS = {
+    "pdf": [(extraction.PDF_EXTRACTOR, "read_pdf", {"max_pages": EXTRACT_MAX_PAGES}),
+            (extraction.PDF_HEAD_EXTRACTOR, "read_pdf_head", {})],
+    "docx": [(extraction.DOCX_EXTRACTOR, "read_docx", {}),
+             (extraction.DOCX_XML_EXTRACTOR, "read_docx_xml", {})],
+}
+
+# ------------ Sandbox Section ------------ #
+
+def _sandbox_main(conn, memory_mb, collect_metrics):
+    # Sandbox process: runs the extraction functions it is sent until the pipe is closed
+    if resource is not None and memory_mb:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024, hard))
+    if collect_metrics:
+        metrics.enable()
+    conn.send("ready")
+    while True:
+        try:
+            name, source, kwargs = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, getattr(extraction, name)(source, **kwargs))
+        except Exception as e:  # MemoryError included
+            result = (False, f"{type(e).__name__}: {e}")
+        conn.send(result + (metrics.take(),))
+
+class Sandbox:
+    def __init__(self, timeout=EXTRACT_TIMEOUT_SECONDS, memory_mb=EXTRACT_MEMORY_MB):
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.pid = os.getpid()  # a forked pool worker must not use its parent's sandbox
+        self._process = None
+        self._conn = None
+
+    def _start(self):
+        # Spawned rather than forked: extraction threads may be running in this process
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_sandbox_main, daemon=True,
+                                        args=(child_conn, self.memory_mb, metrics.is_enabled()))
+        self._process.start()
+        child_conn.close()
+        try:
+            self._conn.recv()  # startup (imports) does not count against the first document's timeout
+        except EOFError:
+            self.stop()
+            raise SandboxUnavailable("extraction process failed to start") from None
+
+    def run(self, name, source, kwargs=None):
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        self._conn.send((name, source, kwargs or {}))
+        if not self._conn.poll(self.timeout):
+            self.stop()
+            metrics.incr("extraction.timeouts")
+            raise ExtractionError(f"timed out after {self.timeout}s")
+        try:
+            ok, result, child_metrics = self._conn.recv()
+        except EOFError:
+            self.stop()
+            raise ExtractionError("extraction process died (over the memory limit?)") from None
+        metrics.merge(child_metrics)
+        if not ok:
+            raise ExtractionError(result)
+        return result
+
+    def stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self):
+        # Closing the pipe ends the sandbox loop; kill it only if it does not exit in time
+        if self._process is not None:
+            self._conn.close()
+            self._process.join(1)
+        self.stop()
+
+class SandboxUnavailable(ExtractionError):
+    # The sandbox process could not be started at all; says nothing about the document
+    pass
+
+class SandboxPool:
+    # Up to `size` sandboxes shared by every thread of one process: a thread borrows an idle one
+    # (starting it on first use) or waits for one to be returned
+    def __init__(self, size=EXTRACT_SANDBOXES):
+        self.size = max(1, size)
+        self.pid = os.getpid()  # a forked pool worker must not use its parent's sandboxes
+        self.available = True
+        self._idle = []
+        self._count = 0
+        self._cond = threading.Condition()
+
+    def run(self, name, source, kwargs=None):
+        sandbox = self._acquire()
+        try:
+            return sandbox.run(name, source, kwargs)
+        finally:
+            self._release(sandbox)
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._count >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        return Sandbox()
+
+    def _release(self, sandbox):
+        with self._cond:
+            self._idle.append(sandbox)
+            self._cond.notify()
+
+    def shutdown(self):
+        # Stops the idle sandboxes; one still in use is a daemon process and ends with this one
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for sandbox in idle:
+            sandbox.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = SandboxPool()
+        return _pool
+
+def shutdown():
+    # Registered with atexit; safe to call more than once
+    with _pool_lock:
+        pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        pool.shutdown()
+
+atexit.register(shutdown)
+
+def _run_in_process(name, source, kwargs):
+    try:
+        return getattr(extraction, name)(source, **kwargs)
+    except Exception as e:
+        raise ExtractionError(f"{type(e).__name__}: {e}") from e
+
+def run_extractor(name, source, **kwargs):
+    # extraction.<name>(source, **kwargs) in a pooled sandbox (in-process without EXTRACT_ISOLATION,
+    # or when no sandbox can be started); any failure is raised as ExtractionError
+    pool = _get_pool() if EXTRACT_ISOLATION else None
+    if pool is None or not pool.available:
+        return _run_in_process(name, source, kwargs)
+    try:
+        return pool.run(name, source, kwargs)
+    except SandboxUnavailable as e:
+        if pool.available:
+            pool.available = False
+            logger.error(f"Extraction sandbox unavailable, extracting in-process: {e}")
+            print(" Extraction sandbox could not start; extracting in-process from now on")
+        return _run_in_process(name, source, kwargs)
+
+# ------------ Quarantine Section ------------ #
+
+_failures = None  # content hash -> failed runs, read from QUARANTINE_FILE once per process
+_quarantine_lock = threading.Lock()
+
+def _load_failures():
+    global _failures
+    with _quarantine_lock:
+        if _failures is None:
+            failures = {}
+            try:
+                with open(QUARANTINE_FILE, mode='r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            digest = json.loads(line)["hash"]
+                        except (ValueError, KeyError, TypeError):
+                            continue  # e.g. a line cut short by a crash
+                        failures[digest] = failures.get(digest, 0) + 1
+            except FileNotFoundError:
+                pass
+            _failures = failures
+        return _failures
+
+def failed_runs(digest):
+    return _load_failures().get(digest, 0)
+
+def _record_failure(digest, label, errors):
+    # One appended line per failed attempt; concurrent workers only ever append whole lines
+    failures = _load_failures()
+    event = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "hash": digest,
+             "file": label, "errors": errors}
+    with _quarantine_lock:
+        failures[digest] = failures.get(digest, 0) + 1
+        os.makedirs(os.path.dirname(QUARANTINE_FILE) or ".", exist_ok=True)
+        with open(QUARANTINE_FILE, mode='a', encoding='utf-8') as f:
+            f.write(json.dumps(event) + "\n")
+        return failures[digest]
+
+# ------------ Extraction Section ------------ #
+
+# Text of a "pdf" or "docx" document (a path, or the bytes of an upload named by label), from the
+# text cache or the first extractor tier that succeeds. Raises ExtractionFailed.
+def extract_document(source, kind, digest=None, label=None):
+    label = label or extraction._name(source)
+    digest = digest or (file_hash(source) if isinstance(source, str) else bytes_hash(source))
+    failures = failed_runs(digest)
+    if failures >= QUARANTINE_AFTER_FAILURES:
+        metrics.incr("extraction.quarantined")
+        raise ExtractionFailed(f"{label} is quarantined after {failures} failed extractions (see {QUARANTINE_FILE})")
+
+    tiers = TIERS[kind]
+    if TEXT_CACHE_ENABLED:
+        # A document only the cheaper extractor could read is served from its entry
+        for (extractor, version), _, _ in tiers:
+            text = get_text(digest, extractor, version)
+            if text is not None:
+                metrics.incr("text_cache.hits")
+                return text
+        metrics.incr("text_cache.misses")
+
+    errors = []
+    for (extractor, version), name, kwargs in tiers:
+        if errors:
+            metrics.incr("extraction.retries")
+        try:
+            text = run_extractor(name, source, **kwargs)
+        except ExtractionError as e:
+            errors.append(f"{extractor}: {e}")
+            continue
+        if errors:
+            print(f" Extracted {label} with {extractor} after: {'; '.join(errors)}")
+        if TEXT_CACHE_ENABLED:
+            put_text(digest, extractor, version, text)
+        return text
+
+    metrics.incr("extraction.failures")
+    failures = _record_failure(digest, label, errors)
+    status = "quarantined" if failures >= QUARANTINE_AFTER_FAILURES else f"failed {failures} time(s)"
+    raise ExtractionFailed(f"Could not extract {label} ({status}): {'; '.join(errors)}")
@@ -1,51 +1,56 @@
-import pandas as pd
 import re
 import os
 import logging
 import csv
 from datetime import datetime
 from collections import defaultdict
-import pdfplumber
-from docx import Document
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from settings import JD_FOLDER, PARSED_JD_FILE, KEYWORDS_FILE, LOG_FILE
 
 from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.text_cache import bytes_hash
+from Scripts.isolation import extract_document, run_extractor
+from Scripts.taxonomy import get_taxonomy
+from Scripts.keyword_matcher import KeywordMatcher
+from Scripts.manifest import load_manifest, save_manifest, scan_folder, file_entry, keywords_changed, mark_keywords
 
 setup_logger(LOG_FILE)
 logger = logging.getLogger(__name__)
 
+# Served from the shared taxonomy, which is only rebuilt when KEYWORDS_FILE changes
 @log_exceptions
 def load_keywords():
-    df = pd.read_csv(KEYWORDS_FILE)
-    if 'Skills' not in df.columns or 'Keywords' not in df.columns:
-        raise KeyError("Both 'Skills' and 'Keywords' columns are required.")
+    taxonomy = get_taxonomy()
+    return taxonomy.skill_keywords, taxonomy.requirement_keywords
 
-    skill_keywords = df['Skills'].dropna().str.lower().str.strip().str.split(',').explode().str.strip().tolist()
-    requirement_keywords = df['Keywords'].dropna().str.lower().str.strip().str.split(',').explode().str.strip().tolist()
+def keyword_matcher_for(skill_keywords, requirement_keywords):
+    taxonomy = get_taxonomy()
+    if skill_keywords is taxonomy.skill_keywords and requirement_keywords is taxonomy.requirement_keywords:
+        return taxonomy.keyword_matcher
+    return KeywordMatcher(sorted(set(skill_keywords) | set(requirement_keywords)))
 
-    return set(skill_keywords), set(requirement_keywords)
-
-def extract_keywords(description, skill_keywords, requirement_keywords):
+def extract_keywords(description, skill_keywords, requirement_keywords, matcher=None):
     description_lower = description.lower()
     skill_freq = defaultdict(int)
     requirement_freq = defaultdict(int)
 
+    # One pass finds every whole-word keyword occurrence; skills still take precedence over requirements
+    matcher = matcher or keyword_matcher_for(skill_keywords, requirement_keywords)
+    counts = matcher.count(description_lower)
+
     for skill in skill_keywords:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        matches = re.findall(pattern, description_lower)
-        if matches:
-            skill_freq[skill] = len(matches)
+        if counts.get(skill):
+            skill_freq[skill] = counts[skill]
 
     for req in requirement_keywords:
         if req in skill_freq:
             continue
-        pattern = r'\b' + re.escape(req) + r'\b'
-        matches = re.findall(pattern, description_lower)
-        if matches:
-            requirement_freq[req] = len(matches)
+        if counts.get(req):
+            requirement_freq[req] = counts[req]
 
     return list(skill_freq.keys()), list(requirement_freq.keys()), skill_freq, requirement_freq
 
@@ -56,112 +61,303 @@ def extract_job_title(description):
             return match.group(1).strip()
     return "Unknown"
 
-def extract_title_from_formatting(filepath):
+def extract_title_from_formatting(filepath, data=None):
+    # data: the file's contents when it only exists in memory (uploads); filepath then only names it
+    source = data if data is not None else filepath
     try:
         if filepath.endswith(".pdf"):
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    words = page.extract_words(use_text_flow=True)
-                    for word in words:
-                        if float(word.get("size", 0)) > 10 and word.get("fontname", "").lower().startswith("bold"):
-                            return word['text'].strip()
+            return run_extractor("pdf_bold_title", source) or "Unknown"
         elif filepath.endswith(".docx"):
-            doc = Document(filepath)
-            for para in doc.paragraphs:
-                if para.style.name.lower().startswith("heading") or para.text.strip():
-                    return para.text.strip()
+            return run_extractor("docx_heading", source) or "Unknown"
         return "Unknown"
     except Exception as e:
         logger.error(f"Formatting-based title extraction failed: {e}")
         return "Unknown"
 
+# ------------ Job Index Section ------------ #
+
+JOB_COLUMNS = ['job_id', 'job_title', 'skill', 'weight', 'timestamp']
+JOB_ID_RE = re.compile(r'JOB(\d+)')
+
+def _normalize_title(job_title):
+    return job_title.strip().lower()
+
+# In-memory view of PARSED_JD_FILE: existing rows, first job ID per (normalized) title and the
+# highest JOBnnn number. Loaded once per batch so dedup and ID allocation never re-read the CSV;
+# new rows are buffered and written in one go by commit().
+class JobIndex:
+    def __init__(self, output_file=PARSED_JD_FILE):
+        self.output_file = output_file
+        self.rows = []
+        self._new_rows = []
+        self._rewrite = False
+        self._exists = os.path.exists(output_file)
+        if self._exists:
+            with open(output_file, mode='r', newline='', encoding='utf-8') as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                self.rows = [row for row in reader if row]
+        self._reindex()
+
+    def _reindex(self):
+        self._titles = {}
+        self._max_number = None
+        for row in self.rows:
+            self._register(row[0], row[1] if len(row) > 1 else "")
+
+    def _register(self, job_id, job_title):
+        # Empty titles and IDs were NaN to the original pandas lookups and never matched
+        if _normalize_title(job_title):
+            self._titles.setdefault(_normalize_title(job_title), job_id)
+        match = JOB_ID_RE.match(job_id)
+        if match:
+            number = int(match.group(1))
+            self._max_number = number if self._max_number is None else max(self._max_number, number)
+
+    def find(self, job_title):
+        return self._titles.get(_normalize_title(job_title))
+
+    def next_id(self):
+        return f"JOB{self._max_number + 1}" if self._max_number is not None else "JOB101"
+
+    def add(self, job_id, job_title, skill_freq, requirement_freq, timestamp=None):
+        # A job without any keyword rows is not recorded, as with the original per-row CSV
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d")
+        rows = [[job_id, job_title, skill, freq, timestamp] for skill, freq in skill_freq.items()]
+        rows += [[job_id, job_title, req, freq, timestamp] for req, freq in requirement_freq.items()]
+        for row in rows:
+            self.rows.append(row)
+            self._new_rows.append(row)
+            self._register(job_id, job_title)
+
+    def remove_except(self, keep_ids):
+        self.rows = [row for row in self.rows if row[0] in keep_ids]
+        self._new_rows = [row for row in self._new_rows if row[0] in keep_ids]
+        self._rewrite = self._exists
+        self._reindex()
+
+    def commit(self):
+        # One bulk write: a full rewrite after removals, otherwise a single append
+        os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
+        if self._rewrite:
+            with open(self.output_file, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(JOB_COLUMNS)
+                writer.writerows(self.rows)
+        elif self._new_rows:
+            with open(self.output_file, mode='a', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                if not self._exists:
+                    writer.writerow(JOB_COLUMNS)
+                writer.writerows(self._new_rows)
+        self._exists = self._exists or self._rewrite or bool(self._new_rows)
+        self._new_rows = []
+        self._rewrite = False
+
 @log_exceptions
 def get_next_job_id(output_file):
-    if not os.path.exists(output_file):
-        return "JOB101"
-
-    df = pd.read_csv(output_file)
-    if 'job_id' not in df.columns or df.empty:
-        return "JOB101"
-    existing_ids = df['job_id'].dropna().tolist()
-    nums = [
-        int(re.search(r'JOB(\d+)', jid).group(1))
-        for jid in existing_ids if re.match(r'JOB\d+', jid)
-    ]
-    next_num = max(nums) + 1 if nums else 101
-    return f"JOB{next_num}"
+    return JobIndex(output_file).next_id()
 
 @log_exceptions
 def save_to_csv(output_file, job_id, job_title, skill_freq, requirement_freq):
-    file_exists = os.path.isfile(output_file)
-    with open(output_file, mode='a', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        if not file_exists:
-            writer.writerow(['job_id', 'job_title', 'skill', 'weight', 'timestamp'])
+    index = JobIndex(output_file)
+    index.add(job_id, job_title, skill_freq, requirement_freq)
+    index.commit()
 
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-
-        for skill, freq in skill_freq.items():
-            writer.writerow([job_id, job_title, skill, freq, timestamp])
+def is_duplicate_job(output_file, job_title):
+    return JobIndex(output_file).find(job_title) is not None
 
-        for req, freq in requirement_freq.items():
-            writer.writerow([job_id, job_title, req, freq, timestamp])
+# ------------ Ingestion Section ------------ #
 
-def is_duplicate_job(output_file, job_title):
-    if not os.path.exists(output_file):
-        return False
-    df = pd.read_csv(output_file)
-    return job_title.strip().lower() in df['job_title'].str.lower().str.strip().values
+def resolve_job_title(description, filepath, data=None):
+    job_title = extract_job_title(description)
+    if job_title == "Unknown" or job_title.lower() == "job title":
+        job_title = extract_title_from_formatting(filepath, data)
+    return job_title
 
+# Parsed job description as a dict, without storing it: title plus {keyword: weight} for skills
+# and requirements, as process_job_description would write them
 @log_exceptions
-def process_job_description(description, filepath, output_file=PARSED_JD_FILE):
+def parse_job_description(description, filepath=None, data=None):
     skill_keywords, requirement_keywords = load_keywords()
-    job_title = extract_job_title(description)
+    job_title = resolve_job_title(description, filepath, data) if filepath else extract_job_title(description)
+    _, _, skill_freq, requirement_freq = extract_keywords(description, skill_keywords, requirement_keywords)
+    return {"job_title": job_title, "skills": {**skill_freq, **requirement_freq},
+            "skill_freq": dict(skill_freq), "requirement_freq": dict(requirement_freq)}
+
+def read_job_bytes(data, filename):
+    if filename.endswith(".txt"):
+        return data.decode("utf-8")
+    elif filename.endswith(".docx"):
+        return extract_document(data, "docx", bytes_hash(data), filename)
+    elif filename.endswith(".pdf"):
+        return extract_document(data, "pdf", bytes_hash(data), filename)
+    return ""
 
-    if job_title == "Unknown" or job_title.lower() == "job title":
-        job_title = extract_title_from_formatting(filepath)
+@log_exceptions
+def parse_job_upload(data, filename):
+    return parse_job_description(read_job_bytes(data, filename), filename, data)
 
-    # ✅ Check for duplicate
-    if is_duplicate_job(output_file, job_title):
+def add_job(index, job_title, skill_freq, requirement_freq, job_id=None, timestamp=None):
+    # Returns the job ID the description was stored under (the existing ID for duplicates)
+    existing_id = index.find(job_title)
+    if existing_id is not None:
         print(f"Skipped duplicate job: {job_title}")
-        return
+        return existing_id
 
-    job_id = get_next_job_id(output_file)
-    skills, requirements, skill_freq, requirement_freq = extract_keywords(
-        description, skill_keywords, requirement_keywords
-    )
-
-    save_to_csv(output_file, job_id, job_title, skill_freq, requirement_freq)
+    job_id = job_id or index.next_id()
+    index.add(job_id, job_title, skill_freq, requirement_freq, timestamp)
     print(f"Processed job '{job_title}' (ID: {job_id})")
-@log_exceptions
-def parse_jobs():
-    for filename in os.listdir(JD_FOLDER):
-        filepath = os.path.join(JD_FOLDER, filename)
-        content = ""
-
-        try:
-            if filename.endswith(".txt"):
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    content = file.read()
-
-            elif filename.endswith(".docx"):
-                doc = Document(filepath)
-                content = "\n".join([para.text for para in doc.paragraphs])
+    return job_id
 
-            elif filename.endswith(".pdf"):
-                with pdfplumber.open(filepath) as pdf:
-                    content = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+# Returns the job ID the description was stored under (the existing ID for duplicates).
+@log_exceptions
+def process_job_description(description, filepath, output_file=PARSED_JD_FILE, job_id=None):
+    skill_keywords, requirement_keywords = load_keywords()
+    job_title = resolve_job_title(description, filepath)
+    _, _, skill_freq, requirement_freq = extract_keywords(description, skill_keywords, requirement_keywords)
+
+    index = JobIndex(output_file)
+    job_id = add_job(index, job_title, skill_freq, requirement_freq, job_id)
+    index.commit()
+    return job_id
+
+def read_job_file(filepath, digest=None):
+    if filepath.endswith(".txt"):
+        with open(filepath, 'r', encoding='utf-8') as file:
+            return file.read()
+    elif filepath.endswith(".docx"):
+        return extract_document(filepath, "docx", digest)
+    elif filepath.endswith(".pdf"):
+        return extract_document(filepath, "pdf", digest)
+    return ""
+
+def list_job_files():
+    return sorted(f for f in os.listdir(JD_FOLDER) if f.endswith((".txt", ".docx", ".pdf")))
+
+def _extract_job_task(task):
+    # Text, title and keyword counts of one JD file; runs in worker processes
+    filename, digest = task
+    filepath = os.path.join(JD_FOLDER, filename)
+    try:
+        content = read_job_file(filepath, digest)
+        if not content:
+            return filename, None, None
+        metrics.incr("jobs.parsed")
+        metrics.incr("regex_scans")  # title pattern
+        taxonomy = get_taxonomy()
+        job_title = resolve_job_title(content, filepath)
+        _, _, skill_freq, requirement_freq = extract_keywords(
+            content, taxonomy.skill_keywords, taxonomy.requirement_keywords, taxonomy.keyword_matcher)
+        return filename, (job_title, dict(skill_freq), dict(requirement_freq)), None
+    except Exception as e:
+        logger.error(f"Failed to process {filename}: {e}")
+        return filename, None, str(e)
 
-            if content:
-                process_job_description(content, filepath)
-                print(f"Processed: {filename}")
+def _extract_job_worker_task(task):
+    return _extract_job_task(task), metrics.take()
 
-        except Exception as e:
-            logger.error(f"Failed to process {filename}: {e}")
-            print(f"Failed to process {filename}: {e}")
+def _extract_job_files(tasks, workers=1):
+    if workers <= 1 or len(tasks) <= 1:
+        yield from map(_extract_job_task, tasks)
+        return
+    chunksize = max(1, min(16, len(tasks) // (workers * 4)))
+    # Forked workers start with a copy of the parent's metrics, so they reset before collecting
+    with ProcessPoolExecutor(max_workers=workers, initializer=metrics.reset) as pool:
+        for result, worker_metrics in pool.map(_extract_job_worker_task, tasks, chunksize=chunksize):
+            metrics.merge(worker_metrics)
+            yield result
+
+# Extracts the given (filename, manifest entry, job ID or None) files, in parallel with
+# workers > 1, then dedups titles and allocates IDs in file order against the index.
+# Returns {filename: job ID or None}; rows stay buffered in the index until commit().
+def ingest_job_files(index, files, workers=1):
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    forced_ids = {filename: job_id for filename, _, job_id in files}
+    tasks = [(filename, entry["hash"]) for filename, entry, _ in files]
+
+    job_ids = {}
+    for filename, extracted, error in _extract_job_files(tasks, workers):
+        job_ids[filename] = None
+        if error is not None:
+            print(f"Failed to process {filename}: {error}")
+        elif extracted is not None:
+            job_title, skill_freq, requirement_freq = extracted
+            job_ids[filename] = add_job(index, job_title, skill_freq, requirement_freq,
+                                        forced_ids[filename], timestamp)
+            print(f"Processed: {filename}")
+    return job_ids
+
+def update_jobs(manifest, output_file=PARSED_JD_FILE, workers=1):
+    entries, changed, removed = scan_folder(JD_FOLDER, list_job_files(), manifest["jobs"])
+
+    # Several files map to one job ID when their titles are duplicates, and its rows came from the
+    # first of them. So every file sharing an ID with a changed or removed file is re-parsed too.
+    stale_ids = {entry.get("id") for entry in removed.values()} | {entries[f].get("id") for f in changed}
+    stale_ids.discard(None)
+    reparse = [name for name, entry in entries.items() if name in changed or entry.get("id") in stale_ids]
+
+    # Drop the rows of those IDs, then re-parse the files in order; the first file of each ID keeps it
+    keep_ids = {entry["id"] for entry in entries.values() if entry.get("id") and entry["id"] not in stale_ids}
+    index = JobIndex(output_file)
+    index.remove_except(keep_ids)
+
+    files, claimed = [], set()
+    for filename in reparse:
+        job_id = entries[filename].get("id")
+        files.append((filename, entries[filename], job_id if job_id not in claimed else None))
+        claimed.add(job_id)
+    job_ids = ingest_job_files(index, files, workers)
+    index.commit()
+
+    changed_ids = set()
+    for filename in reparse:
+        entries[filename]["id"] = job_ids[filename]
+        if job_ids[filename]:
+            changed_ids.add(job_ids[filename])
+
+    for filename in removed:
+        print(f"Removed: {filename}")
+
+    manifest["jobs"] = entries
+    print(f"{len(changed)} changed and {len(removed)} removed job description files")
+    return changed_ids
+
+# Returns the set of job IDs whose rows changed in incremental mode, or None after a full run.
+@log_exceptions
+def parse_jobs(incremental=False, workers=1):
+    with metrics.stage("job_parsing"):
+        return _parse_jobs(incremental, workers)
+
+def _parse_jobs(incremental, workers):
+    # Imported here: the Arrow store pulls in pyarrow, pandas and scipy, which parsing never needs
+    from Scripts.parsed_store import save_job_store_from_csv
+
+    manifest = load_manifest()
+
+    if incremental:
+        if not keywords_changed(manifest, "jobs"):
+            changed_ids = update_jobs(manifest, workers=workers)
+            save_job_store_from_csv()
+            save_manifest(manifest)
+            return changed_ids
+
+    index = JobIndex()
+    if incremental:
+        # New taxonomy: rows parsed with the old keywords cannot be kept
+        index.remove_except(set())
+
+    entries = {filename: file_entry(os.path.join(JD_FOLDER, filename)) for filename in list_job_files()}
+    job_ids = ingest_job_files(index, [(f, entry, None) for f, entry in entries.items()], workers)
+    index.commit()
+    for filename, entry in entries.items():
+        entry["id"] = job_ids[filename]
+
+    manifest["jobs"] = entries
+    save_job_store_from_csv()
+    mark_keywords(manifest, "jobs")
+    save_manifest(manifest)
+    return None
 
 if __name__ == "__main__":
     parse_jobs()
-
-
-
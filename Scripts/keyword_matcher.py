@@ -0,0 +1,86 @@
+from collections import deque
+from Scripts import metrics
+
+# Aho-Corasick automaton: finds every occurrence of every keyword in one pass over the text,
+# instead of one regex scan per keyword.
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # Empty keywords are dropped; as a regex (\b\b) they would match every word boundary
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._lengths = [len(k) for k in self.keywords]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for idx, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (idx,)
+
+        # Breadth-first pass sets failure links and merges outputs along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def iter_matches(self, text):
+        # Yields (end, keyword index) for every occurrence, ordered by end position
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for idx in out[state]:
+                    yield i + 1, idx
+
+    def count(self, text, word_boundaries=True):
+        # Same counts as len(re.findall(r'\b' + re.escape(keyword) + r'\b', text)) for every keyword:
+        # occurrences of one keyword never overlap, different keywords may.
+        metrics.incr("keyword_scans")
+        metrics.incr("keyword_scan_chars", len(text))
+        counts = {}
+        last_end = {}
+        lengths = self._lengths
+        for end, idx in self.iter_matches(text):
+            start = end - lengths[idx]
+            if start < last_end.get(idx, 0):
+                continue
+            if word_boundaries and not (_is_boundary(text, start) and _is_boundary(text, end)):
+                continue
+            last_end[idx] = end
+            counts[idx] = counts.get(idx, 0) + 1
+        return {self.keywords[idx]: n for idx, n in counts.items()}
+
+    def present(self, text):
+        # Keywords occurring anywhere in text, i.e. the ones for which `keyword in text` holds
+        metrics.incr("keyword_scans")
+        metrics.incr("keyword_scan_chars", len(text))
+        return {self.keywords[idx] for _, idx in self.iter_matches(text)}
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+def _is_boundary(text, pos):
+    # Mirrors regex \b: a word character on exactly one side of pos
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
@@ -0,0 +1,90 @@
+import os
+import json
+import logging
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import MANIFEST_FILE, KEYWORDS_FILE, RESUME_SKILL_SECTIONS, LOG_FILE
+from utils import setup_logger
+from Scripts.text_cache import file_hash
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Manifest layout:
+# {
+#   "keywords": {"resumes": "<sha256 of KEYWORDS_FILE>[:RESUME_SKILL_SECTIONS]", "jobs": "<sha256 of KEYWORDS_FILE>"},
+#   "resumes": {"<file name>": {"size": int, "mtime": int, "hash": str, "id": "RES0001" | null}},
+#   "jobs":    {"<file name>": {"size": int, "mtime": int, "hash": str, "id": "JOB101" | null}},
+#   "matching": {"top_k": int | null, "min_score": float | null, "semantic": str | null, "threshold": int} | null
+# }
+
+def load_manifest(path=MANIFEST_FILE):
+    manifest = {"keywords": {}, "resumes": {}, "jobs": {}}
+    if os.path.exists(path):
+        try:
+            with open(path, mode='r', encoding='utf-8') as f:
+                manifest.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable manifest {path}: {e}")
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode='w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_match_options(path=MANIFEST_FILE):
+    return load_manifest(path).get("matching")
+
+def save_match_options(options, path=MANIFEST_FILE):
+    # Options MATCH_RESULTS_FILE was written with; None while it is being rewritten
+    manifest = load_manifest(path)
+    manifest["matching"] = options
+    save_manifest(manifest, path)
+
+def _keywords_fingerprint(section):
+    # Parsed resumes also depend on the sections their skills are searched in
+    fingerprint = file_hash(KEYWORDS_FILE)
+    if section == "resumes" and RESUME_SKILL_SECTIONS is not None:
+        fingerprint += ":" + ",".join(RESUME_SKILL_SECTIONS)
+    return fingerprint
+
+def keywords_changed(manifest, section):
+    # Parsed output depends on the taxonomy, so a new keywords file invalidates the whole section
+    return manifest["keywords"].get(section) != _keywords_fingerprint(section)
+
+def mark_keywords(manifest, section):
+    manifest["keywords"][section] = _keywords_fingerprint(section)
+
+def file_entry(path, old_entry=None, digest=None):
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": digest or file_hash(path),
+        "id": old_entry.get("id") if old_entry else None,
+    }
+
+# Returns (entries, changed file names, removed entries). Files with unchanged size and
+# mtime are trusted without hashing; the rest only count as changed if the content differs.
+def scan_folder(folder, file_names, old_entries):
+    entries = {}
+    changed = []
+    for name in file_names:
+        path = os.path.join(folder, name)
+        stat = os.stat(path)
+        old = old_entries.get(name)
+        if old and old.get("size") == stat.st_size and old.get("mtime") == stat.st_mtime_ns:
+            entries[name] = old
+            continue
+
+        entry = file_entry(path, old)
+        entries[name] = entry
+        if not old or old.get("hash") != entry["hash"]:
+            changed.append(name)
+
+    removed = {name: entry for name, entry in old_entries.items() if name not in entries}
+    return entries, changed, removed
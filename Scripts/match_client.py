@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import base64
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+from urllib.parse import urlencode, quote
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import SERVICE_HOST, SERVICE_PORT, SERVICE_TOP_K
+
+class MatchServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+# Thin client for Scripts/match_service.py; every method returns the decoded JSON response
+class MatchClient:
+    def __init__(self, base_url=f"http://{SERVICE_HOST}:{SERVICE_PORT}", timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = Request(self.base_url + path, data=data, method=method,
+                          headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise MatchServiceError(e.code, message) from None
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def match_text(self, text, top_k=SERVICE_TOP_K, min_score=None):
+        return self._request("POST", "/match", {"text": text, "top_k": top_k, "min_score": min_score})
+
+    def match_file(self, path, top_k=SERVICE_TOP_K, min_score=None):
+        with open(path, "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+        return self._request("POST", "/match", {"file": data, "filename": os.path.basename(path),
+                                                "top_k": top_k, "min_score": min_score})
+
+    def match_job(self, job_id, top_k=SERVICE_TOP_K, min_score=None):
+        params = {k: v for k, v in {"top_k": top_k, "min_score": min_score}.items() if v is not None}
+        return self._request("GET", f"/jobs/{quote(job_id)}/matches?{urlencode(params)}")
+
+    def add_resume(self, skills, resume_id=None, **fields):
+        return self._request("POST", "/resumes", {"resume_id": resume_id, "skills": list(skills), **fields})["resume_id"]
+
+    def add_resume_file(self, path, resume_id=None):
+        with open(path, "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+        return self._request("POST", "/resumes", {"file": data, "filename": os.path.basename(path),
+                                                  "resume_id": resume_id})["resume_id"]
+
+    def remove_resume(self, resume_id):
+        return self._request("DELETE", f"/resumes/{quote(resume_id)}")
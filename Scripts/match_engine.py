@@ -0,0 +1,206 @@
+import os
+import sys
+import numpy as np
+from scipy import sparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Scripts.skill_similarity import SkillSimilarity, get_skill_similarity
+
+# Jobs scored per sparse product; bounds the dense (resumes x block) score buffer
+JOB_BLOCK_SIZE = 64
+FUZZY_THRESHOLD = 85  # default fuzz.partial_ratio score at which two skills match
+
+def round_percent(values):
+    # np.round(x, 1) may differ from Python's round(x, 1) (used by calculate_match) right at a
+    # ...5 boundary, so values close to one are re-rounded with round()
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for idx in zip(*np.nonzero(near_half)):
+        rounded[idx] = round(float(values[idx]), 1)
+    return rounded
+
+# Batch scorer for every resume x job pair:
+#   R  resumes x resume skills    indicator (CSR)
+#   E  job skills x resume skills fuzzy equivalence at `threshold` (CSR)
+#   M  resumes x job skills       = (R @ E.T) > 0, i.e. "resume has a skill matching this job skill"
+#   W  jobs x job skills          weights from parsed_job_skills
+# Matched weight for a block of jobs is M @ W_block.T; match percentages follow the exact
+# arithmetic of calculate_match. Matched/missing lists are only built for rows asked for.
+def skill_matrix(skill_lists):
+    # (rows x vocabulary CSR indicator, vocabulary in first-seen order) for lists of skill strings
+    vocab = {}
+    indptr, indices = [0], []
+    for skills in skill_lists:
+        indices.extend(vocab.setdefault(skill, len(vocab)) for skill in skills)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocab)))
+    return matrix, list(vocab)
+
+# resume_skills is either one list of skill strings per resume, or an already built
+# (CSR indicator, vocabulary) pair such as ResumeTable.skill_matrix() returns.
+class MatchEngine:
+    def __init__(self, resume_skills, jobs, similarity=None, threshold=FUZZY_THRESHOLD):
+        self.job_ids = list(jobs)
+        self.job_titles = [title for title, _ in jobs.values()]
+        self.job_skills = [list(skills.keys()) for _, skills in jobs.values()]
+
+        job_vocab = {}
+        for skills in self.job_skills:
+            for skill in skills:
+                job_vocab.setdefault(skill, len(job_vocab))
+
+        if isinstance(resume_skills, tuple):
+            resume_matrix, vocab = resume_skills
+        else:
+            resume_matrix, vocab = skill_matrix(resume_skills)
+        resume_vocab = {skill: i for i, skill in enumerate(vocab)}
+        self.n_resumes = resume_matrix.shape[0]
+
+        similarity = similarity or get_skill_similarity()
+        if threshold < similarity.min_score:
+            similarity = SkillSimilarity(min_score=threshold)
+        similarity.ensure(job_vocab, resume_vocab)
+        self.similarity = similarity
+
+        eq_rows, eq_cols = [], []
+        for skill, row in job_vocab.items():
+            for resume_skill in similarity.matches(skill, threshold):
+                col = resume_vocab.get(resume_skill)
+                if col is not None:
+                    eq_rows.append(row)
+                    eq_cols.append(col)
+        equivalence = sparse.csr_matrix(
+            (np.ones(len(eq_rows), dtype=np.int32), (eq_rows, eq_cols)),
+            shape=(len(job_vocab), len(resume_vocab)))
+
+        matched = (resume_matrix @ equivalence.T).tocsr()
+        matched.data[:] = 1
+        self.matched = matched
+        # Column j lists the resumes covering job skill j: the inverted index used by retrieve()
+        self._matched_csc = matched.tocsc()
+        self._matched_csc.sort_indices()
+
+        w_rows, w_cols, w_data = [], [], []
+        self.job_columns = []
+        self.job_weights = []
+        for job_idx, (_, skills) in enumerate(jobs.values()):
+            columns = [job_vocab[skill] for skill in skills]
+            self.job_columns.append(np.array(columns, dtype=np.int64))
+            self.job_weights.append(np.array(list(skills.values()), dtype=np.float64))
+            w_rows.extend([job_idx] * len(columns))
+            w_cols.extend(columns)
+            w_data.extend(skills.values())
+        self.weights = sparse.csr_matrix(
+            (np.array(w_data, dtype=np.float64), (w_rows, w_cols)),
+            shape=(len(self.job_ids), len(job_vocab)))
+        self.job_totals = np.asarray(self.weights.sum(axis=1)).ravel()
+
+        self._block = None
+
+    def _score_block(self, block):
+        start = block * JOB_BLOCK_SIZE
+        stop = min(start + JOB_BLOCK_SIZE, len(self.job_ids))
+        matched_weight = (self.matched @ self.weights[start:stop].T).toarray()
+        totals = self.job_totals[start:stop]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = round_percent((matched_weight / totals) * 100)
+        scores[:, totals == 0] = 0.0
+        return scores
+
+    def job_scores(self, job_idx):
+        # Match percent of every resume for one job, equal to calculate_match's match_score
+        block = job_idx // JOB_BLOCK_SIZE
+        if self._block is None or self._block[0] != block:
+            self._block = (block, self._score_block(block))
+        return self._block[1][:, job_idx % JOB_BLOCK_SIZE]
+
+    def _split_skills(self, skills, hits, row):
+        positions = set(hits.indices[hits.indptr[row]:hits.indptr[row + 1]].tolist())
+        matched = [skill for i, skill in enumerate(skills) if i in positions]
+        missing = [skill for i, skill in enumerate(skills) if i not in positions]
+        return matched, missing
+
+    def iter_job_rows(self, job_idx, resume_indices=None):
+        # Yields (resume index, match percent, matched skills, missing skills) in resume order
+        scores = self.job_scores(job_idx)
+        skills = self.job_skills[job_idx]
+        hits = self._matched_csc[:, self.job_columns[job_idx]].tocsr()
+
+        if resume_indices is None:
+            resume_indices = range(self.n_resumes)
+        for r in resume_indices:
+            matched, missing = self._split_skills(skills, hits, r)
+            yield r, float(scores[r]), matched, missing
+
+    def _percent(self, job_idx, matched_weight):
+        total = self.job_totals[job_idx]
+        if not total:
+            return np.zeros(len(matched_weight))
+        return round_percent((matched_weight / total) * 100)
+
+    def retrieve(self, job_idx, top_k=None, min_score=None):
+        # Resume indices and match percents for the best resumes of one job, best first
+        # (ties in resume order). Only resumes that can still reach the current cut-off are
+        # scored: terms are visited by descending weight (MaxScore), and once the weight of the
+        # remaining terms drops below the cut-off, resumes not yet seen can no longer qualify.
+        columns = self.job_columns[job_idx]
+        weights = self.job_weights[job_idx]
+        total = self.job_totals[job_idx]
+        indptr, postings = self._matched_csc.indptr, self._matched_csc.indices
+
+        # Lowest raw weight that can still round up to min_score
+        floor = max(0.0, (min_score - 0.05) * total / 100 - 1e-9) if min_score else 0.0
+        order = np.argsort(-weights, kind="stable")
+        remaining = np.cumsum(weights[order][::-1])[::-1]
+
+        seen = np.zeros(self.n_resumes, dtype=bool)
+        found_idx, found_weight = [], []
+        cutoff = floor
+        for term, upper_bound in zip(order, remaining):
+            if upper_bound <= 0 or upper_bound < cutoff:
+                break
+            col = columns[term]
+            posting = postings[indptr[col]:indptr[col + 1]]
+            new = posting[~seen[posting]]
+            if not len(new):
+                continue
+            seen[new] = True
+            found_idx.append(new)
+            found_weight.append(self.matched[new][:, columns] @ weights)
+
+            if top_k and sum(len(w) for w in found_weight) >= top_k:
+                kth = np.partition(np.concatenate(found_weight), -top_k)[-top_k]
+                cutoff = max(floor, kth)
+
+        idx = np.concatenate(found_idx) if found_idx else np.zeros(0, dtype=np.int64)
+        raw = np.concatenate(found_weight) if found_weight else np.zeros(0)
+        ranking = np.lexsort((idx, -raw))
+        idx, scores = idx[ranking], self._percent(job_idx, raw[ranking])
+        if min_score:
+            keep = scores >= min_score
+            idx, scores = idx[keep], scores[keep]
+        if top_k:
+            idx, scores = idx[:top_k], scores[:top_k]
+            if len(idx) < top_k and not (min_score and min_score > 0):
+                # Pad with zero-score resumes in resume order, as a full ranking would
+                zeros = np.flatnonzero(~seen)[:top_k - len(idx)]
+                idx = np.concatenate([idx, zeros])
+                scores = np.concatenate([scores, np.zeros(len(zeros))])
+        elif not min_score or min_score <= 0:
+            zeros = np.flatnonzero(~seen)
+            idx = np.concatenate([idx, zeros])
+            scores = np.concatenate([scores, np.zeros(len(zeros))])
+        return idx, scores
+
+    def iter_top_rows(self, job_idx, top_k=None, min_score=None):
+        # Same rows as iter_job_rows, restricted to retrieve()'s resumes and in its order
+        idx, scores = self.retrieve(job_idx, top_k, min_score)
+        skills = self.job_skills[job_idx]
+        hits = self.matched[idx][:, self.job_columns[job_idx]]
+        hits.sort_indices()
+        for row, (r, score) in enumerate(zip(idx.tolist(), scores.tolist())):
+            matched, missing = self._split_skills(skills, hits, row)
+            yield r, score, matched, missing
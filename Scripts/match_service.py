@@ -0,0 +1,399 @@
+import os
+import re
+import sys
+import json
+import base64
+import logging
+import argparse
+import tempfile
+import threading
+import contextlib
+import numpy as np
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import SERVICE_HOST, SERVICE_PORT, SERVICE_TOP_K, LOG_FILE
+from utils import setup_logger, log_exceptions
+from Scripts.taxonomy import get_taxonomy
+from Scripts.text_cache import bytes_hash
+from Scripts.skill_similarity import get_skill_similarity
+from Scripts.match_engine import round_percent
+from Scripts.parsed_store import load_resume_table, load_job_table
+from Scripts.job_parser import extract_keywords, extract_job_title, read_job_file, resolve_job_title
+from Scripts.resume_parser import parse_resume_file
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+RESUME_FIELDS = ["name", "email", "phone", "current_job_title"]
+
+class NotFound(LookupError):
+    # An unknown job or resume ID in the request path (404); a malformed body is a 400
+    pass
+
+# ------------ Resume Index Section ------------ #
+
+# Mutable skill -> resumes index for the service. Resumes get a permanent position on add;
+# removal only clears their `alive` flag, so postings never have to be rewritten.
+class ResumeIndex:
+    def __init__(self):
+        self.ids = []
+        self.fields = []
+        self.skills = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.positions = {}
+        self._postings = {}   # resume skill -> positions: numpy array plus appended list
+        self._arrays = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    @classmethod
+    def from_table(cls, table):
+        # Bulk load from a ResumeTable: postings come straight from its CSR skill matrix
+        index = cls()
+        matrix, vocab = table.skill_matrix()
+        index.ids = table.column("resume_id")
+        index.fields = [dict(zip(RESUME_FIELDS, values)) for values in zip(
+            table.column("Name"), table.column("Email"), table.column("Phone"), table.column("Job Title"))]
+        index.skills = table.skill_lists()
+        index.alive = np.ones(len(index.ids), dtype=bool)
+        index.positions = {resume_id: i for i, resume_id in enumerate(index.ids)}
+        columns = matrix.tocsc()
+        columns.sum_duplicates()
+        for col, skill in enumerate(vocab):
+            index._postings[skill] = [columns.indices[columns.indptr[col]:columns.indptr[col + 1]].astype(np.int64), []]
+        return index
+
+    def vocabulary(self):
+        return self._postings.keys()
+
+    def posting(self, skill):
+        array = self._arrays.get(skill)
+        if array is None:
+            stored, appended = self._postings[skill]
+            array = np.concatenate([stored, np.array(appended, dtype=np.int64)]) if appended else stored
+            self._arrays[skill] = array
+        return array
+
+    def add(self, resume_id, fields, skills):
+        if resume_id in self.positions:
+            self.remove(resume_id)
+        position = len(self.ids)
+        self.ids.append(resume_id)
+        self.fields.append(fields)
+        self.skills.append(list(skills))
+        self.alive = np.append(self.alive, True)
+        self.positions[resume_id] = position
+        for skill in dict.fromkeys(skills):
+            self._postings.setdefault(skill, [np.zeros(0, dtype=np.int64), []])[1].append(position)
+            self._arrays.pop(skill, None)
+        return position
+
+    def remove(self, resume_id):
+        position = self.positions.pop(resume_id, None)
+        if position is None:
+            return False
+        self.alive[position] = False
+        return True
+
+    def next_id(self):
+        numbers = [int(m.group(1)) for m in map(re.compile(r"RES(\d+)$").match, self.positions) if m]
+        return f"RES{max(numbers + [0]) + 1:04d}"
+
+# ------------ Match Service Section ------------ #
+
+# Any number of readers at once, or one writer. A waiting writer holds off new readers, so a
+# steady stream of queries cannot starve resume updates.
+class ReadWriteLock:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+# Everything a query needs stays in memory: taxonomy (keyword matcher), fuzzy skill similarity,
+# the resume index and the parsed jobs. Queries run concurrently under the read lock; adding or
+# removing resumes, and scoring job skills not seen before, take the write lock. The caches
+# queries fill in (postings, skill rows, similarity matches) only ever gain entries that any
+# reader would compute the same way, and are cleared under the write lock.
+class MatchService:
+    def __init__(self, resumes, jobs, taxonomy=None, similarity=None, threshold=85):
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.similarity = similarity or get_skill_similarity()
+        self.threshold = threshold
+        self.resumes = resumes
+        self.jobs = jobs
+        self.lock = ReadWriteLock()
+        self._skill_rows = {}
+        self.similarity.ensure((), self.resumes.vocabulary())
+
+    @classmethod
+    def from_store(cls, **kwargs):
+        taxonomy = get_taxonomy()
+        return cls(ResumeIndex.from_table(load_resume_table()), load_job_table(taxonomy.intern), taxonomy, **kwargs)
+
+    def _rows_for(self, job_skill):
+        # Positions of resumes with a skill matching job_skill, cached until resumes are added
+        rows = self._skill_rows.get(job_skill)
+        if rows is None:
+            vocabulary = self.resumes.vocabulary()
+            postings = [self.resumes.posting(s) for s in self.similarity.matches(job_skill, self.threshold) if s in vocabulary]
+            rows = np.unique(np.concatenate(postings)) if postings else np.zeros(0, dtype=np.int64)
+            self._skill_rows[job_skill] = rows
+        return rows
+
+    def rank(self, job_skills, top_k=SERVICE_TOP_K, min_score=None):
+        # Ranked resumes for {skill: weight}, best first with ties in resume order
+        skills = list(job_skills)
+        with self.lock.read():
+            if self.similarity.covers(skills):
+                return self._rank(job_skills, skills, top_k, min_score)
+        with self.lock.write():
+            self.similarity.ensure(skills, ())
+            return self._rank(job_skills, skills, top_k, min_score)
+
+    def _rank(self, job_skills, skills, top_k, min_score):
+        # Called with the lock held
+        weights = np.array([float(job_skills[s]) for s in skills], dtype=np.float64)
+        hits = [self._rows_for(skill) for skill in skills]
+
+        matched_weight = np.zeros(len(self.resumes.ids), dtype=np.float64)
+        for rows, weight in zip(hits, weights):
+            matched_weight[rows] += weight
+        total = weights.sum()
+        scores = round_percent((matched_weight / total) * 100) if total else np.zeros(len(matched_weight))
+
+        candidates = np.flatnonzero(self.resumes.alive)
+        if min_score:
+            candidates = candidates[scores[candidates] >= min_score]
+        if top_k and len(candidates) > top_k:
+            kth = np.partition(-matched_weight[candidates], top_k - 1)[top_k - 1]
+            candidates = candidates[-matched_weight[candidates] <= kth]
+        order = np.lexsort((candidates, -matched_weight[candidates]))
+        candidates = candidates[order][:top_k] if top_k else candidates[order]
+
+        # Which candidates each job skill's sorted rows contain: one search per skill
+        present = np.zeros((len(skills), len(candidates)), dtype=bool)
+        for i, rows in enumerate(hits):
+            if len(rows):
+                present[i] = rows[np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)] == candidates
+
+        results = []
+        for position, found in zip(candidates.tolist(), present.T.tolist()):
+            matched = [s for s, hit in zip(skills, found) if hit]
+            missing = [s for s, hit in zip(skills, found) if not hit]
+            results.append({
+                "resume_id": self.resumes.ids[position],
+                **self.resumes.fields[position],
+                "match_percent": float(scores[position]),
+                "matched_skills": matched,
+                "missing_skills": missing,
+            })
+        return results
+
+    def parse_job(self, text):
+        _, _, skill_freq, requirement_freq = extract_keywords(
+            text, self.taxonomy.skill_keywords, self.taxonomy.requirement_keywords, self.taxonomy.keyword_matcher)
+        return {**skill_freq, **requirement_freq}
+
+    def match_text(self, text, top_k=SERVICE_TOP_K, min_score=None, job_title=None):
+        skills = self.parse_job(text)
+        return {"job_title": job_title or extract_job_title(text), "skills": skills,
+                "results": self.rank(skills, top_k, min_score)}
+
+    def match_file(self, data, filename, top_k=SERVICE_TOP_K, min_score=None):
+        with _temp_file(data, filename) as path:
+            text = read_job_file(path, bytes_hash(data))
+            return self.match_text(text, top_k, min_score, job_title=resolve_job_title(text, path))
+
+    def match_job(self, job_id, top_k=SERVICE_TOP_K, min_score=None):
+        job_title, skills = self.jobs[job_id]
+        return {"job_id": job_id, "job_title": job_title, "skills": {s: float(w) for s, w in skills.items()},
+                "results": self.rank(skills, top_k, min_score)}
+
+    def add_resume(self, resume_id=None, skills=(), **fields):
+        with self.lock.write():
+            resume_id = resume_id or self.resumes.next_id()
+            skills = [self.taxonomy.intern(s.strip().lower()) for s in skills if s.strip()]
+            self.similarity.ensure((), skills)
+            self.resumes.add(resume_id, {f: fields.get(f, "") for f in RESUME_FIELDS}, skills)
+            self._skill_rows.clear()
+            return resume_id
+
+    def add_resume_file(self, data, filename, resume_id=None):
+        with _temp_file(data, filename) as path:
+            row = parse_resume_file(path, self.taxonomy, bytes_hash(data))
+        if row is None:
+            raise ValueError(f"No text could be extracted from {filename}")
+        name, email, phone, _, job_title, skills = row
+        return self.add_resume(resume_id, skills.split(";"), name=name, email=email, phone=phone,
+                               current_job_title=job_title)
+
+    def remove_resume(self, resume_id):
+        with self.lock.write():
+            return self.resumes.remove(resume_id)
+
+class _temp_file:
+    # Uploaded bytes as a named file with the original extension, removed afterwards
+    def __init__(self, data, filename):
+        suffix = os.path.splitext(filename)[1].lower()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(data)
+            self.path = tmp.name
+
+    def __enter__(self):
+        return self.path
+
+    def __exit__(self, *exc):
+        os.remove(self.path)
+
+# ------------ HTTP Section ------------ #
+
+#   GET    /health                              resume and job counts
+#   POST   /match          {"text"} or {"file": base64, "filename"}, optional top_k, min_score
+#   GET    /jobs/<job_id>/matches?top_k=&min_score=
+#   POST   /resumes        {"resume_id"?, "name", "email", "phone", "current_job_title", "skills": [...]}
+#                          or {"file": base64, "filename", "resume_id"?}
+#   DELETE /resumes/<resume_id>
+class MatchHandler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object")
+        return body
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            status, payload = self._route(method, parts, query)
+        except NotFound as e:
+            status, payload = 404, {"error": f"Not found: {e}"}
+        except (ValueError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Match service request {method} {self.path} failed: {e}", exc_info=True)
+            status, payload = 500, {"error": str(e)}
+        self._send(status, payload)
+
+    def _route(self, method, parts, query):
+        service = self.service
+        if method == "GET" and parts == ["health"]:
+            return 200, {"resumes": len(service.resumes), "jobs": len(service.jobs)}
+        if method == "GET" and len(parts) == 3 and parts[0] == "jobs" and parts[2] == "matches":
+            if parts[1] not in service.jobs:
+                raise NotFound(parts[1])
+            return 200, service.match_job(parts[1], *_limits(query))
+        if method == "POST" and parts == ["match"]:
+            body = self._body()
+            if "file" in body:
+                return 200, service.match_file(base64.b64decode(body["file"]), _field(body, "filename"), *_limits(body))
+            if "text" not in body:
+                raise ValueError("Expected a 'text' or 'file' field")
+            return 200, service.match_text(body["text"], *_limits(body))
+        if method == "POST" and parts == ["resumes"]:
+            body = self._body()
+            if "file" in body:
+                resume_id = service.add_resume_file(base64.b64decode(body["file"]), _field(body, "filename"), body.get("resume_id"))
+            else:
+                resume_id = service.add_resume(**body)
+            return 201, {"resume_id": resume_id}
+        if method == "DELETE" and len(parts) == 2 and parts[0] == "resumes":
+            if not service.remove_resume(parts[1]):
+                raise NotFound(parts[1])
+            return 200, {"removed": parts[1]}
+        return 404, {"error": f"No route for {method} /{'/'.join(parts)}"}
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+def _field(body, name):
+    if name not in body:
+        raise ValueError(f"Expected a '{name}' field")
+    return body[name]
+
+def _limits(params):
+    top_k = params.get("top_k", SERVICE_TOP_K)
+    min_score = params.get("min_score")
+    top_k = int(top_k) if top_k not in (None, "") else None
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be at least 1; leave it out (null) to return every resume")
+    return top_k, float(min_score) if min_score not in (None, "") else None
+
+def make_server(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    handler = type("BoundMatchHandler", (MatchHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+@log_exceptions
+def serve(host=SERVICE_HOST, port=SERVICE_PORT):
+    service = MatchService.from_store()
+    server = make_server(service, host, port)
+    print(f"Matching service on http://{host}:{server.server_port} ({len(service.resumes)} resumes, {len(service.jobs)} jobs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if service.similarity.dirty:
+            service.similarity.save()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve resume matching over HTTP from an in-memory index.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
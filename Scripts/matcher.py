@@ -1,44 +1,58 @@
 import pandas as pd
+import numpy as np
 from rapidfuzz import fuzz
-from sentence_transformers import SentenceTransformer, util
 import re
 import sys
 import os
+import pickle
 import logging
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from settings import RESUME_FILE, JOB_SKILL_FILE, MATCH_RESULTS_FILE, LOG_FILE
+from settings import (MATCH_RESULTS_FILE, MATCH_TOP_K, MATCH_MIN_SCORE,
+                      SEMANTIC_ENCODER, SEMANTIC_THRESHOLD, SEMANTIC_MIN_SCORE,
+                      MATCH_RESULTS_PARQUET, MATCH_RESULTS_PARQUET_FILE, STREAM_BATCH_SIZE, LOG_FILE)
 from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.taxonomy import get_taxonomy
+from Scripts.skill_similarity import get_skill_similarity
+from Scripts.match_engine import MatchEngine, FUZZY_THRESHOLD
+from Scripts.semantic import get_semantic_similarity, unit_vectors
+from Scripts.result_writer import ResultWriter, RESULT_COLUMNS
+from Scripts.parsed_store import load_resume_table, load_job_table, ResumeTable
+from Scripts.manifest import load_match_options, save_match_options
 
 setup_logger(LOG_FILE)
 logger = logging.getLogger(__name__)
 
 @log_exceptions
 def load_job_skills():
-    job_df = pd.read_csv(JOB_SKILL_FILE)
-    job_skills_dict = {}
-
-    for job_id, group in job_df.groupby("job_id"):
-        job_title = group["job_title"].iloc[0]
-        skill_weights = dict(zip(group["skill"].str.lower(), group["weight"]))
-        job_skills_dict[job_id] = (job_title, skill_weights)
-
-    return job_skills_dict
+    return load_job_table(get_taxonomy().intern)
 
 @log_exceptions
 def load_resumes():
-    df = pd.read_csv(RESUME_FILE)
-    df["skills"] = df["Skills"].fillna("").apply(lambda x: [s.strip().lower() for s in x.split(";") if s.strip()])
-    return df[["resume_id", "Name", "Email", "Phone", "Job Title", "skills"]]
+    table = load_resume_table()
+    df = pd.DataFrame({column: table.column(column) for column in ["resume_id", "Name", "Email", "Phone", "Job Title"]})
+    df["skills"] = table.skill_lists()
+    return df
 
 
 @log_exceptions
-def calculate_match(resume_skills, job_skills_with_weights, threshold=85):
+def calculate_match(resume_skills, job_skills_with_weights, threshold=85, similarity=None):
     matched = {}
     missing = {}
 
+    # Fuzzy scores come from the shared similarity matrix, so each skill pair is only scored once
+    similarity = similarity or get_skill_similarity()
+    use_matrix = threshold >= similarity.min_score
+    if use_matrix:
+        similarity.ensure(job_skills_with_weights.keys(), resume_skills)
+        resume_skill_set = set(resume_skills)
+
     for job_skill, weight in job_skills_with_weights.items():
-        is_matched = any(fuzz.partial_ratio(job_skill, res_skill) >= threshold for res_skill in resume_skills)
+        if use_matrix:
+            is_matched = not resume_skill_set.isdisjoint(similarity.matches(job_skill, threshold))
+        else:
+            is_matched = any(fuzz.partial_ratio(job_skill, res_skill) >= threshold for res_skill in resume_skills)
         if is_matched:
             matched[job_skill] = weight
         else:
@@ -50,35 +64,275 @@ def calculate_match(resume_skills, job_skills_with_weights, threshold=85):
 
     return match_score, list(matched.keys()), list(missing.keys())
 
+# Match percent of one resume for job_skills ({skill: weight}, or a list weighting each skill 1)
+@log_exceptions
+def compute_matching_score(resume_skills, job_skills, threshold=85):
+    if not isinstance(job_skills, dict):
+        job_skills = dict.fromkeys(job_skills, 1)
+    return calculate_match(resume_skills, job_skills, threshold)[0]
+
+# (match percent, matched skills, missing skills) of every resume for one job, in one batch
+@log_exceptions
+def score_resumes(resume_skill_lists, job_skills, threshold=85):
+    if not isinstance(job_skills, dict):
+        job_skills = dict.fromkeys(job_skills, 1)
+    # Lower-cased like the parsed CSVs the batch matcher reads
+    job_skills = {skill.lower(): weight for skill, weight in job_skills.items()}
+    resume_skill_lists = [[skill.lower() for skill in skills] for skills in resume_skill_lists]
+    engine = MatchEngine(resume_skill_lists, {"job": ("", job_skills)}, threshold=threshold)
+    return [(score, matched, missing) for _, score, matched, missing in engine.iter_job_rows(0)]
+
+# Options that shape MATCH_RESULTS_FILE's rows and columns. An incremental run only carries rows
+# over from a file written with the same options; anything else is recomputed in full.
+def match_options(top_k, min_score, semantic):
+    return {"top_k": top_k, "min_score": min_score, "semantic": semantic,
+            "threshold": SEMANTIC_THRESHOLD if semantic else FUZZY_THRESHOLD}
+
+def load_previous_results(current_resume_ids, current_job_ids, changed_resume_ids, changed_job_ids, columns=RESULT_COLUMNS):
+    # Read as strings so kept rows are written back exactly as they were. Rows with other columns
+    # (e.g. without title_similarity in semantic mode) are never mixed in: None recomputes them all.
+    try:
+        previous = pd.read_csv(MATCH_RESULTS_FILE, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:  # zero rows and no header
+        return None
+    if previous.empty or list(previous.columns) != list(columns):
+        return None
+    keep = (
+        previous["resume_id"].isin(set(current_resume_ids) - set(changed_resume_ids))
+        & previous["job_id"].isin(set(current_job_ids) - set(changed_job_ids))
+    )
+    return previous[keep]
+
+# Passing the changed resume and job IDs from an incremental parse only recomputes
+# pairs involving them; rows for unchanged pairs are carried over from MATCH_RESULTS_FILE.
+# With top_k and/or min_score only each job's best resumes are written, best first. Retrieval
+# is pruned through the engine's skill -> resumes index and always covers every job, since a
+# changed resume can push a carried-over row out of another job's top K.
+# semantic ("hashing" or a local model directory) matches skills by embedding cosine similarity
+# instead of fuzz.partial_ratio and adds a title_similarity column (current vs target title).
+# parquet also writes the rows to MATCH_RESULTS_PARQUET_FILE (see ResultWriter).
 @log_exceptions
-def match_all_resumes():
-    all_jobs = load_job_skills()
-    resumes = load_resumes()
-    results = []
-
-    for job_id, (job_title, job_skills) in all_jobs.items():
-        for _, row in resumes.iterrows():
-            resume_id = row["resume_id"]
-            resume_skills = row["skills"]
-            match_score, matched_skills, missing_skills = calculate_match(resume_skills, job_skills)
-
-            results.append({
-                "resume_id": resume_id,
-                "name": row.get("Name", ""),
-                "email": row.get("Email", ""),
-                "phone": row.get("Phone", ""),
-                "current_job_title": row.get("Job Title", ""),
-                "job_id": job_id,
-                "target_job_title": job_title,
-                "match_percent": match_score,
-                "matched_skills": ", ".join(matched_skills),
-                "missing_skills": ", ".join(missing_skills)
-            })
-
-
-    df = pd.DataFrame(results)
-    df.to_csv(MATCH_RESULTS_FILE, index=False)
+def match_all_resumes(changed_resume_ids=None, changed_job_ids=None, top_k=MATCH_TOP_K, min_score=MATCH_MIN_SCORE,
+                      semantic=SEMANTIC_ENCODER, parquet=MATCH_RESULTS_PARQUET):
+    with metrics.stage("matching"):
+        _match_all_resumes(changed_resume_ids, changed_job_ids, top_k, min_score, semantic, parquet)
+
+def _match_all_resumes(changed_resume_ids, changed_job_ids, top_k, min_score, semantic, parquet):
+    with metrics.stage("matching.load"):
+        all_jobs = load_job_skills()
+        resumes = load_resume_table()
+
+    # All match percentages come from sparse matrix products over the whole skill vocabulary
+    with metrics.stage("matching.similarity"):
+        if semantic:
+            similarity = get_semantic_similarity(semantic, min(SEMANTIC_MIN_SCORE, SEMANTIC_THRESHOLD))
+            engine = MatchEngine(resumes.skill_matrix(), all_jobs, similarity, threshold=SEMANTIC_THRESHOLD)
+        else:
+            similarity = get_skill_similarity()
+            engine = MatchEngine(resumes.skill_matrix(), all_jobs, similarity)
+    resume_ids = resumes.column("resume_id")
+    names, emails, phones = resumes.column("Name"), resumes.column("Email"), resumes.column("Phone")
+    current_titles = resumes.column("Job Title")
+    if semantic:
+        resume_titles = unit_vectors(similarity.store, ["" if t is None else str(t) for t in current_titles])
+        job_titles = unit_vectors(similarity.store, [str(title) for title, _ in all_jobs.values()])
+
+    previous = None
+    columns = RESULT_COLUMNS + ["title_similarity"] if semantic else RESULT_COLUMNS
+    options = match_options(top_k, min_score, semantic)
+    retrieval = top_k is not None or min_score is not None
+    incremental = changed_resume_ids is not None and changed_job_ids is not None and not retrieval
+    if incremental and os.path.exists(MATCH_RESULTS_FILE):
+        if load_match_options() == options:
+            previous = load_previous_results(resume_ids, all_jobs.keys(), changed_resume_ids, changed_job_ids, columns)
+        else:
+            print("Match options differ from the previous run's; recomputing every match row")
+    if previous is not None:
+        changed_positions = [i for i, resume_id in enumerate(resume_ids) if resume_id in changed_resume_ids]
+        resume_order = {resume_id: i for i, resume_id in enumerate(resume_ids)}
+        previous_by_job = {job_id: group.to_dict("records") for job_id, group in previous.groupby("job_id", sort=False)}
+
+    # Rows are streamed to disk job by job instead of being collected in one DataFrame
+    parquet_path = MATCH_RESULTS_PARQUET_FILE if parquet else None
+    recomputed = 0
+    save_match_options(None)
+    with metrics.stage("matching.write"), ResultWriter(MATCH_RESULTS_FILE, parquet_path, columns=columns) as writer:
+        for job_idx, (job_id, (job_title, job_skills)) in enumerate(all_jobs.items()):
+            job_changed = previous is None or job_id in changed_job_ids
+            if retrieval:
+                rows = engine.iter_top_rows(job_idx, top_k, min_score)
+            else:
+                rows = engine.iter_job_rows(job_idx, None if job_changed else changed_positions)
+            if semantic:
+                title_scores = ((resume_titles @ job_titles[job_idx]).astype(np.float64) * 100).round(1)
+
+            results = []
+            for r, match_score, matched_skills, missing_skills in rows:
+                result = {
+                    "resume_id": resume_ids[r],
+                    "name": names[r],
+                    "email": emails[r],
+                    "phone": phones[r],
+                    "current_job_title": current_titles[r],
+                    "job_id": job_id,
+                    "target_job_title": job_title,
+                    "match_percent": match_score,
+                    "matched_skills": matched_skills,
+                    "missing_skills": missing_skills
+                }
+                if semantic:
+                    result["title_similarity"] = float(title_scores[r])
+                if job_changed:
+                    writer.write(result)
+                else:
+                    results.append(result)
+                recomputed += 1
+
+            if not job_changed:
+                # Merge carried-over rows back in resume order, as a full run would write them
+                kept = previous_by_job.get(job_id, [])
+                writer.write_rows(sorted(kept + results, key=lambda row: resume_order[row["resume_id"]]))
+
+    save_match_options(options)
+    if similarity.dirty:
+        similarity.save()
+
+    metrics.incr("match_rows.written", writer.rows_written)
+    metrics.incr("match_rows.recomputed", recomputed)
+    if previous is not None:
+        print(f"Recomputed {recomputed} of {writer.rows_written} match rows")
     print(f"Matching results saved to: {MATCH_RESULTS_FILE}")
+    if parquet_path:
+        print(f"Matching results saved to: {parquet_path}")
+
+# ------------ Streaming Section ------------ #
+
+# Scores parsed resumes against every job in batches of batch_size as they arrive (main.py --stream)
+# and writes the same files as match_all_resumes. Each batch's rows go to a spill file grouped
+# by job; close() reads every job's segments back in batch order, so memory holds at most one
+# job's rows. With top_k/min_score a batch only spills its own best rows and close() ranks the
+# survivors as MatchEngine.retrieve() does: by matched weight, ties in resume order.
+class StreamingMatcher:
+    def __init__(self, top_k=MATCH_TOP_K, min_score=MATCH_MIN_SCORE, semantic=SEMANTIC_ENCODER,
+                 parquet=MATCH_RESULTS_PARQUET, batch_size=STREAM_BATCH_SIZE):
+        self.top_k = top_k
+        self.min_score = min_score
+        self.semantic = semantic
+        self.parquet_path = MATCH_RESULTS_PARQUET_FILE if parquet else None
+        self.batch_size = batch_size
+        self.retrieval = top_k is not None or min_score is not None
+
+        self.jobs = load_job_skills()
+        if semantic:
+            self.similarity = get_semantic_similarity(semantic, min(SEMANTIC_MIN_SCORE, SEMANTIC_THRESHOLD))
+            self.job_titles = unit_vectors(self.similarity.store, [str(title) for title, _ in self.jobs.values()])
+        else:
+            self.similarity = get_skill_similarity()
+
+        self.resumes = []  # (resume_id, name, email, phone, current title) by resume index
+        self._batch = []
+        self._segments = [[] for _ in self.jobs]  # (offset, size) of each batch's rows, per job
+        self._spill_path = f"{MATCH_RESULTS_FILE}.{os.getpid()}.spill"
+        self._spill = open(self._spill_path, "w+b")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._remove_spill()
+
+    def add(self, row):
+        # row as written to PARSED_RESUMES_FILE
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self._score_batch()
+
+    def _score_batch(self):
+        batch, self._batch = self._batch, []
+        first = len(self.resumes)
+        resumes = ResumeTable.from_rows(batch)
+        with metrics.stage("matching.batches"):
+            if self.semantic:
+                engine = MatchEngine(resumes.skill_matrix(), self.jobs, self.similarity, threshold=SEMANTIC_THRESHOLD)
+                resume_titles = unit_vectors(self.similarity.store,
+                                             ["" if t is None else str(t) for t in resumes.column("Job Title")])
+            else:
+                engine = MatchEngine(resumes.skill_matrix(), self.jobs, self.similarity)
+            self.resumes.extend(zip(*(resumes.column(c) for c in ["resume_id", "Name", "Email", "Phone", "Job Title"])))
+
+            for job_idx in range(len(self.jobs)):
+                if self.retrieval:
+                    rows = engine.iter_top_rows(job_idx, self.top_k, self.min_score)
+                else:
+                    rows = engine.iter_job_rows(job_idx)
+                if self.semantic:
+                    title_scores = ((resume_titles @ self.job_titles[job_idx]).astype(np.float64) * 100).round(1)
+
+                records = []
+                for r, match_score, matched_skills, missing_skills in rows:
+                    record = (first + r, match_score, matched_skills, missing_skills)
+                    records.append(record + (float(title_scores[r]),) if self.semantic else record)
+                data = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+                self._segments[job_idx].append((self._spill.tell(), len(data)))
+                self._spill.write(data)
+        metrics.incr("match_batches")
+
+    def _job_records(self, job_idx, job_skills):
+        records = []
+        for offset, size in self._segments[job_idx]:
+            self._spill.seek(offset)
+            records.extend(pickle.loads(self._spill.read(size)))
+        if self.retrieval:
+            # Weights are keyword counts, so these sums are exact and ties compare as in retrieve()
+            records.sort(key=lambda record: (-sum(job_skills[skill] for skill in record[2]), record[0]))
+            if self.top_k:
+                records = records[:self.top_k]
+        return records
+
+    def close(self):
+        if self._batch:
+            self._score_batch()
+
+        columns = RESULT_COLUMNS + ["title_similarity"] if self.semantic else RESULT_COLUMNS
+        save_match_options(None)
+        with metrics.stage("matching.write"), ResultWriter(MATCH_RESULTS_FILE, self.parquet_path, columns=columns) as writer:
+            for job_idx, (job_id, (job_title, job_skills)) in enumerate(self.jobs.items()):
+                for record in self._job_records(job_idx, job_skills):
+                    r, match_score, matched_skills, missing_skills = record[:4]
+                    resume_id, name, email, phone, current_title = self.resumes[r]
+                    result = {
+                        "resume_id": resume_id,
+                        "name": name,
+                        "email": email,
+                        "phone": phone,
+                        "current_job_title": current_title,
+                        "job_id": job_id,
+                        "target_job_title": job_title,
+                        "match_percent": match_score,
+                        "matched_skills": matched_skills,
+                        "missing_skills": missing_skills
+                    }
+                    if self.semantic:
+                        result["title_similarity"] = record[4]
+                    writer.write(result)
+        self._remove_spill()
+        save_match_options(match_options(self.top_k, self.min_score, self.semantic))
+
+        if self.similarity.dirty:
+            self.similarity.save()
+
+        metrics.incr("match_rows.written", writer.rows_written)
+        print(f"Matching results saved to: {MATCH_RESULTS_FILE}")
+        if self.parquet_path:
+            print(f"Matching results saved to: {self.parquet_path}")
+
+    def _remove_spill(self):
+        self._spill.close()
+        if os.path.exists(self._spill_path):
+            os.remove(self._spill_path)
 
 if __name__ == "__main__":
     match_all_resumes()
\ No newline at end of file
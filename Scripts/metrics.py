@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import METRICS_SLOWEST_DOCUMENTS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Run metrics: stage timers (wall and CPU), event counters and per-document extraction records.
+# Nothing is collected until enable() is called; until then every function returns after one
+# global check, so hooks only sit at per-document, per-batch or per-stage points and never in
+# per-line helpers.
+#
+# Counter names are dotted. Pairs named <cache>.hits / <cache>.misses are reported as cache
+# hit rates. Pool workers hand their share back with take() and the parent merge()s it.
+
+_enabled = False
+_counters = {}
+_stages = {}      # name -> [calls, wall seconds, cpu seconds]
+_documents = []   # (path, extractor, seconds, pages)
+_lock = threading.Lock()  # counters are also updated from extraction threads
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    _counters.clear()
+    _stages.clear()
+    _documents.clear()
+
+def incr(name, n=1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+def _cpu_seconds():
+    # This process plus finished children, so stages that run a process pool count its work
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+class _Stage:
+    __slots__ = ("name", "wall", "cpu")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = _cpu_seconds()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        totals = _stages.setdefault(self.name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += time.perf_counter() - self.wall
+        totals[2] += _cpu_seconds() - self.cpu
+        return False
+
+_NULL_STAGE = contextlib.nullcontext()
+
+def stage(name):
+    # with metrics.stage("matching"): ...  (nested stages are timed independently)
+    return _Stage(name) if _enabled else _NULL_STAGE
+
+def document(path, extractor, seconds, pages=None):
+    if _enabled:
+        _documents.append((path, extractor, seconds, pages))
+
+def take():
+    # Everything collected in this process since the last reset, which is then cleared
+    if not _enabled:
+        return None
+    state = (dict(_counters), {name: list(totals) for name, totals in _stages.items()}, list(_documents))
+    reset()
+    return state
+
+def merge(state):
+    if not state or not _enabled:
+        return
+    counters, stages, documents = state
+    for name, n in counters.items():
+        _counters[name] = _counters.get(name, 0) + n
+    for name, (calls, wall, cpu) in stages.items():
+        totals = _stages.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += calls
+        totals[1] += wall
+        totals[2] += cpu
+    _documents.extend(documents)
+
+def peak_rss_mb():
+    # Largest resident set of this process or any finished child (pool workers), in MB
+    if resource is None:
+        return None
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# ------------ Report Section ------------ #
+
+def report():
+    hit_rates = {}
+    for name in _counters:
+        cache, _, kind = name.rpartition(".")
+        if kind in ("hits", "misses") and cache not in hit_rates:
+            hits, misses = _counters.get(f"{cache}.hits", 0), _counters.get(f"{cache}.misses", 0)
+            hit_rates[cache] = round(hits / (hits + misses), 4) if hits + misses else None
+
+    slowest = sorted(_documents, key=lambda d: d[2], reverse=True)[:METRICS_SLOWEST_DOCUMENTS]
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "argv": sys.argv,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {name: {"calls": calls, "wall_seconds": round(wall, 6), "cpu_seconds": round(cpu, 6)}
+                   for name, (calls, wall, cpu) in _stages.items()},
+        "counters": dict(sorted(_counters.items())),
+        "cache_hit_rates": dict(sorted(hit_rates.items())),
+        "documents": {
+            "extracted": len(_documents),
+            "pages": sum(d[3] or 0 for d in _documents),
+            "extract_seconds": round(sum(d[2] for d in _documents), 6),
+            "slowest": [{"path": path, "extractor": extractor, "seconds": round(seconds, 6), "pages": pages}
+                        for path, extractor, seconds, pages in slowest],
+        },
+    }
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(run=None):
+    # Prometheus text exposition format, e.g. for the node_exporter textfile collector
+    run = run or report()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP resume_matching_{name} {help_text}")
+        lines.append(f"# TYPE resume_matching_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f"resume_matching_{name}{{{label_text}}} {value}" if label_text else f"resume_matching_{name} {value}")
+
+    stages = run["stages"].items()
+    metric("stage_wall_seconds", "gauge", "Wall time per pipeline stage.",
+           [({"stage": name}, s["wall_seconds"]) for name, s in stages])
+    metric("stage_cpu_seconds", "gauge", "CPU time per pipeline stage.",
+           [({"stage": name}, s["cpu_seconds"]) for name, s in stages])
+    metric("events_total", "counter", "Pipeline event counters.",
+           [({"name": name}, n) for name, n in run["counters"].items()])
+    metric("cache_hit_ratio", "gauge", "Cache hit rate.",
+           [({"cache": name}, rate) for name, rate in run["cache_hit_rates"].items() if rate is not None])
+    documents = run["documents"]
+    metric("documents_extracted_total", "counter", "Documents run through a text extractor.", [({}, documents["extracted"])])
+    metric("document_pages_total", "counter", "PDF pages extracted.", [({}, documents["pages"])])
+    metric("document_extract_seconds_total", "counter", "Time spent in text extractors.", [({}, documents["extract_seconds"])])
+    if run["peak_rss_mb"] is not None:
+        metric("peak_rss_bytes", "gauge", "Peak resident set size.", [({}, int(run["peak_rss_mb"] * 1024 * 1024))])
+    return "\n".join(lines) + "\n"
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_report(path, prometheus_path=None):
+    run = report()
+    _write(path, json.dumps(run, indent=2))
+    if prometheus_path:
+        _write(prometheus_path, prometheus_text(run))
+    return run
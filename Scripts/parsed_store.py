@@ -0,0 +1,167 @@
+import os
+import sys
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from scipy import sparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import PARSED_RESUMES_FILE, PARSED_JD_FILE, PARSED_RESUMES_STORE, PARSED_JD_STORE, LOG_FILE
+from utils import setup_logger, log_exceptions
+from Scripts import metrics
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+RESUME_COLUMNS = ['resume_id', 'Name', 'Email', 'Phone', 'Education', 'Job Title']
+
+# Columnar copies of the parsed CSVs, as uncompressed Arrow IPC files that are memory-mapped
+# on load. Skill columns are list<dictionary<int32, string>>: every row holds integer skill IDs
+# into one per-file vocabulary, which map straight onto the CSR arrays MatchEngine needs.
+#
+#   parsed_resumes.arrow      one row per resume: RESUME_COLUMNS + skills
+#   parsed_job_skills.arrow   one row per job: job_id, job_title, skills, weights
+#
+# Each store records the size and mtime of the CSV it was written with and is only used while
+# that CSV is unchanged, so a hand-edited or newer CSV always wins.
+
+# ------------ Arrow Helpers Section ------------ #
+
+def split_resume_skills(skills_str):
+    return [s.strip().lower() for s in skills_str.split(";") if s.strip()]
+
+def skill_list_array(skill_lists):
+    vocab = {}
+    offsets, indices = [0], []
+    for skills in skill_lists:
+        indices.extend(vocab.setdefault(skill, len(vocab)) for skill in skills)
+        offsets.append(len(indices))
+    values = pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), pa.array(list(vocab), type=pa.string()))
+    return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), values)
+
+def _source_stat(source):
+    stat = os.stat(source)
+    return {b"source_size": str(stat.st_size).encode(), b"source_mtime_ns": str(stat.st_mtime_ns).encode()}
+
+def _write_store(table, path, source):
+    table = table.replace_schema_metadata(_source_stat(source))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+def _read_store(path, source):
+    # The memory-mapped table, or None if missing, unreadable or older than its CSV
+    if not os.path.exists(path) or not os.path.exists(source):
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    except Exception as e:
+        logger.error(f"Ignoring unreadable parsed store {path}: {e}")
+        return None
+    if (table.schema.metadata or {}) != _source_stat(source):
+        return None
+    metrics.incr("parsed_store.hits")
+    return table
+
+# ------------ Resume Store Section ------------ #
+
+# Parsed resumes as Arrow columns; scalar columns are only converted to Python lists on request
+class ResumeTable:
+    def __init__(self, table):
+        self.table = table
+        self._columns = {}
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def column(self, name):
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = self.table.column(name).to_pylist()
+        return values
+
+    def skill_matrix(self):
+        # (resumes x vocabulary CSR indicator, vocabulary), read from the Arrow buffers without copying
+        skills = self.table.column("skills").combine_chunks()
+        dictionary = skills.values.dictionary.to_pylist()
+        indptr = skills.offsets.to_numpy()
+        indices = skills.values.indices.to_numpy()[indptr[0]:indptr[-1]]
+        indptr = indptr - indptr[0]
+        matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr),
+                                   shape=(len(self), len(dictionary)))
+        return matrix, dictionary
+
+    def skill_lists(self):
+        return self.table.column("skills").to_pylist()
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows as written to PARSED_RESUMES_FILE: RESUME_COLUMNS values then the "; "-joined skills
+        columns = list(zip(*rows)) if rows else [()] * (len(RESUME_COLUMNS) + 1)
+        arrays = [pa.array(list(values), type=pa.string()) for values in columns[:len(RESUME_COLUMNS)]]
+        arrays.append(skill_list_array(split_resume_skills(s) for s in columns[len(RESUME_COLUMNS)]))
+        return cls(pa.Table.from_arrays(arrays, names=RESUME_COLUMNS + ["skills"]))
+
+    @classmethod
+    def from_csv(cls, path=PARSED_RESUMES_FILE):
+        # Same parsing as the original CSV loader (pandas NA handling included)
+        df = pd.read_csv(path)
+        arrays = [pa.array(df[c].astype(object).where(df[c].notna(), None).tolist()) if c in df.columns
+                  else pa.nulls(len(df)) for c in RESUME_COLUMNS]
+        arrays.append(skill_list_array(split_resume_skills(s) for s in df["Skills"].fillna("").astype(str)))
+        return cls(pa.Table.from_arrays(arrays, names=RESUME_COLUMNS + ["skills"]))
+
+def save_resume_store(rows, path=PARSED_RESUMES_STORE, source=PARSED_RESUMES_FILE):
+    _write_store(ResumeTable.from_rows(rows).table, path, source)
+
+@log_exceptions
+def load_resume_table(path=PARSED_RESUMES_STORE, source=PARSED_RESUMES_FILE):
+    table = _read_store(path, source)
+    if table is not None:
+        return ResumeTable(table)
+    metrics.incr("parsed_store.misses")
+    return ResumeTable.from_csv(source)
+
+# ------------ Job Store Section ------------ #
+
+def jobs_from_frame(job_df, intern=None):
+    # job_id -> (job_title, {skill: weight}) from the long-format parsed_job_skills rows
+    intern = intern or sys.intern
+    jobs = {}
+    for job_id, group in job_df.groupby("job_id"):
+        job_title = group["job_title"].iloc[0]
+        if pd.isna(job_title):  # a blank title in the CSV
+            job_title = ""
+        jobs[job_id] = (job_title, dict(zip(map(intern, group["skill"].str.lower()), group["weight"])))
+    return jobs
+
+def save_job_store(jobs, path=PARSED_JD_STORE, source=PARSED_JD_FILE):
+    table = pa.Table.from_arrays([
+        pa.array([str(job_id) for job_id in jobs], type=pa.string()),
+        pa.array([str(title) for title, _ in jobs.values()], type=pa.string()),
+        skill_list_array(list(skills) for _, skills in jobs.values()),
+        pa.array([[float(w) for w in skills.values()] for _, skills in jobs.values()], type=pa.list_(pa.float64())),
+    ], names=["job_id", "job_title", "skills", "weights"])
+    _write_store(table, path, source)
+
+@log_exceptions
+def save_job_store_from_csv(path=PARSED_JD_STORE, source=PARSED_JD_FILE):
+    if os.path.exists(source):
+        save_job_store(jobs_from_frame(pd.read_csv(source)), path, source)
+
+@log_exceptions
+def load_job_table(intern=None, path=PARSED_JD_STORE, source=PARSED_JD_FILE):
+    table = _read_store(path, source)
+    if table is None:
+        metrics.incr("parsed_store.misses")
+        return jobs_from_frame(pd.read_csv(source), intern)
+    intern = intern or sys.intern
+    jobs = {}
+    columns = table.to_pydict()
+    for job_id, title, skills, weights in zip(columns["job_id"], columns["job_title"], columns["skills"], columns["weights"]):
+        jobs[job_id] = (title, dict(zip(map(intern, skills), weights)))
+    return jobs
@@ -0,0 +1,114 @@
+import os
+import sys
+import logging
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import MATCH_RESULTS_FILE, RESULT_CHUNK_ROWS, LOG_FILE
+from utils import setup_logger
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = ["resume_id", "name", "email", "phone", "current_job_title", "job_id", "target_job_title",
+                  "match_percent", "matched_skills", "missing_skills"]
+SKILL_COLUMNS = ("matched_skills", "missing_skills")
+DICTIONARY_COLUMNS = ("job_id", "target_job_title")
+
+def _joined(value):
+    return ", ".join(value) if isinstance(value, list) else value
+
+def _split(value):
+    if isinstance(value, list):
+        return value
+    return value.split(", ") if value else []
+
+# Streams match rows to MATCH_RESULTS_FILE in chunks of RESULT_CHUNK_ROWS, so memory stays flat
+# however many rows are written. Skill columns may be given as lists (joined with ", " for CSV)
+# or as already joined strings (rows carried over from a previous CSV).
+#
+# With parquet_path the same rows also go to a Parquet file: job_id and target_job_title are
+# dictionary-encoded and the skill columns are list<string>, so readers can load single columns.
+# Both files are written under temporary names and only replace the old ones on close().
+class ResultWriter:
+    def __init__(self, path=MATCH_RESULTS_FILE, parquet_path=None, chunk_rows=RESULT_CHUNK_ROWS, columns=RESULT_COLUMNS):
+        self.path = path
+        self.parquet_path = parquet_path
+        self.chunk_rows = chunk_rows
+        self.columns = list(columns)
+        self.rows_written = 0
+        self._chunk = []
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, mode='w', encoding='utf-8', newline='')
+        self._parquet = None
+        if parquet_path:
+            self._parquet_tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row):
+        self._chunk.append(row)
+        if len(self._chunk) >= self.chunk_rows:
+            self.flush()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        if not self._chunk:
+            return
+        chunk, self._chunk = self._chunk, []
+        csv_rows = [{**row, **{c: _joined(row[c]) for c in SKILL_COLUMNS if c in row}} for row in chunk]
+        pd.DataFrame(csv_rows, columns=self.columns).to_csv(self._file, header=self.rows_written == 0, index=False)
+        if self.parquet_path:
+            self._write_parquet(chunk)
+        self.rows_written += len(chunk)
+
+    def _write_parquet(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrays = []
+        for column in self.columns:
+            values = [row.get(column) for row in chunk]
+            if column in SKILL_COLUMNS:
+                arrays.append(pa.array([_split(v) for v in values], type=pa.list_(pa.string())))
+            elif column in DICTIONARY_COLUMNS:
+                arrays.append(pa.array([str(v) for v in values], type=pa.string()).dictionary_encode())
+            elif column in ("match_percent", "title_similarity"):
+                arrays.append(pa.array([float(v) for v in values], type=pa.float64()))
+            else:
+                arrays.append(pa.array([None if pd.isna(v) else str(v) for v in values], type=pa.string()))
+        table = pa.Table.from_arrays(arrays, names=self.columns)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self._parquet_tmp_path, table.schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        self.flush()
+        if self.rows_written == 0:
+            # Just the header, so readers of the file still find its columns
+            pd.DataFrame([], columns=self.columns).to_csv(self._file, index=False)
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        if self.parquet_path:
+            if self._parquet is None:
+                self._write_parquet([])
+            self._parquet.close()
+            os.replace(self._parquet_tmp_path, self.parquet_path)
+
+    def abort(self):
+        self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+        for tmp_path in (self._tmp_path, getattr(self, "_parquet_tmp_path", None)):
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,87 +1,101 @@
 import os
 import re
 import csv
-import fitz
-import docx
 import logging
-from fuzzywuzzy import fuzz
-import nltk
+import itertools
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from settings import KEYWORDS_FILE, RESUME_FOLDER, PARSED_RESUMES_FILE, LOG_FILE
+from settings import (KEYWORDS_FILE, RESUME_FOLDER, PARSED_RESUMES_FILE, PARSED_UPLOAD_CACHE_SIZE,
+                      RESUME_SKILL_SECTIONS, STREAM_EXTRACT_THREADS, STREAM_QUEUE_SIZE, LOG_FILE)
 from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.text_cache import file_hash, bytes_hash
+from Scripts.isolation import extract_document, ExtractionFailed
+from Scripts.taxonomy import get_taxonomy, SkillTaxonomy
+from Scripts.title_index import get_title_index
+from Scripts.resume_sections import segment_resume
+from Scripts.manifest import load_manifest, save_manifest, scan_folder, file_entry, keywords_changed, mark_keywords
 
 setup_logger(LOG_FILE)
 logger = logging.getLogger(__name__)
 
-nltk.download("stopwords", quiet=True)
-nltk.download("punkt", quiet=True)
+# Every extractor takes the resume text or, to share one segmentation between them, the
+# ResumeSections from segment_resume()
 
 # ------------ Skill Parsing Section ------------ #
 @log_exceptions
 def load_job_title_skill_map():
-    job_skill_map = {}
-    with open(KEYWORDS_FILE, mode='r', encoding='utf-8-sig') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            job = row.get('Job Title', '').strip()
-            skills_str = row.get('Skills', '').strip()
-            if job and skills_str:
-                job_skill_map[job] = skills_str
-    return job_skill_map
+    return get_taxonomy().skill_map
 
+def _taxonomy_for(job_skill_map):
+    # The shared taxonomy for load_job_title_skill_map()'s map, otherwise one built from the given map
+    taxonomy = get_taxonomy()
+    if job_skill_map is None or job_skill_map is taxonomy.skill_map:
+        return taxonomy
+    return SkillTaxonomy([{"Job Title": job, "Skills": skills} for job, skills in job_skill_map.items()])
+
+# job_skill_map ({title: skills string}, as from load_job_title_skill_map) is still accepted in
+# third place; the precompiled taxonomy and the title similarities are keyword-only.
 @log_exceptions
-def extract_skills_from_resume(resume_text, job_title, job_skill_map):
-    resume_text = resume_text.lower()
+def extract_skills_from_resume(resume_text, job_title, job_skill_map=None, *, taxonomy=None, similarities=None):
+    taxonomy = taxonomy or _taxonomy_for(job_skill_map)
+    if similarities is None:
+        similarities = get_title_index(taxonomy.titles).title_similarities(job_title)
     matched_skills = []
     fallback_skills = []
 
-    def split_skills(skill_str):
-        parts = re.split(r",| or | and |/|\\|;", skill_str, flags=re.IGNORECASE)
-        cleaned = []
-        for part in parts:
-            part = part.strip().lower()
-            part = re.sub(
-                r"^(proficient in|experienced with|experience in|strong|good knowledge of|familiarity with|bachelor's in|master's in|related field|skills in|including)\s*",
-                "", part)
-            if part and len(part) > 1 and not part.startswith("("):
-                cleaned.append(part)
-        return cleaned
-
-    for job, skills_str in job_skill_map.items():
-        similarity = fuzz.token_sort_ratio(job.lower(), job_title.lower())
-        skills = split_skills(skills_str)
-        found = [sk for sk in skills if sk in resume_text]
+    # Substring search for every taxonomy skill in a single pass over the (lower-cased) resume,
+    # or over its RESUME_SKILL_SECTIONS only
+    present = taxonomy.skill_matcher.present(segment_resume(resume_text).skill_text(RESUME_SKILL_SECTIONS))
+
+    for skills, similarity in zip(taxonomy.title_skills.values(), similarities):
+        found = [sk for sk in skills if sk in present]
         if similarity >= 70:
             matched_skills.extend(found)
         elif not matched_skills:
             fallback_skills.extend(found)
 
-    return list(set(matched_skills)) if matched_skills else list(set(fallback_skills))
+    # First-seen order (not set order) keeps output identical across processes and runs
+    return list(dict.fromkeys(matched_skills)) if matched_skills else list(dict.fromkeys(fallback_skills))
 
 # ------------ Resume Parsing Section ------------ #
 
 @log_exceptions
-def extract_text_from_docx(path):
-    doc = docx.Document(path)
-    return "\n".join([p.text for p in doc.paragraphs])
+def extract_text_from_docx(path, digest=None):
+    return extract_document(path, "docx", digest)
+
+@log_exceptions
+def extract_text_from_pdf(path, digest=None):
+    return extract_document(path, "pdf", digest)
 
 @log_exceptions
-def extract_text_from_pdf(path):
-    text = ""
-    with fitz.open(path) as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+def extract_text_from_bytes(data, filename):
+    kind = "pdf" if filename.lower().endswith('.pdf') else "docx"
+    return extract_document(data, kind, bytes_hash(data), filename)
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+PHONE_RE = re.compile(r"(\+?\d{1,2}[\s\-\.])?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}")
+DIGIT_RE = re.compile(r'\d')
+OCCUPATION_RE = re.compile(r"(analyst|engineer|manager|consultant|developer|nurse|student)")
+CAPS_LINE_RE = re.compile(r"^[A-Z\s]{5,}$")
+DEGREE_RE = re.compile(r"(Bachelor|Master|PhD|Doctor|Diploma|Certificate)[^0-9\n]*(?:in)?[^0-9\n]*?\b(?:19|20)\d{2}\b", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
+def _text(resume):
+    return resume if isinstance(resume, str) else resume.text
 
 @log_exceptions
 def extract_name(text):
-    for line in text.splitlines()[:10]:
+    resume = segment_resume(text)
+    for line, lower_line in zip(resume.header_lines(), resume.lower_lines):
         line = line.strip()
-        if not line or any(char in line for char in "@/|•") or re.search(r'\d', line):
+        if not line or any(char in line for char in "@/|•") or DIGIT_RE.search(line):
             continue
-        if re.search(r"(analyst|engineer|manager|consultant|developer|nurse|student)", line.lower()):
+        if OCCUPATION_RE.search(lower_line):
             continue
         words = line.split()
         if len(words) >= 2 and all(word[0].isupper() for word in words if word.isalpha()):
@@ -90,35 +104,34 @@ def extract_name(text):
 
 @log_exceptions
 def extract_email(text):
-    match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+    match = EMAIL_RE.search(_text(text))
     return match.group(0) if match else ""
 
 @log_exceptions
 def extract_phone(text):
-    match = re.search(r"(\+?\d{1,2}[\s\-\.])?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}", text)
+    match = PHONE_RE.search(_text(text))
     return match.group(0) if match else ""
 
 @log_exceptions
 def extract_education(text):
-    lines = text.splitlines()
-    capture = False
+    resume = segment_resume(text)
     edu_lines = []
     edu_block = ""
-    for line in lines:
-        if "education" in line.lower():
-            capture = True
+    # Up to three lines after the first line mentioning education, skipping further such lines
+    start = len(resume.lines) if resume.education_line is None else resume.education_line + 1
+    for i in range(start, len(resume.lines)):
+        if "education" in resume.lower_lines[i]:
             continue
-        if capture:
-            line = line.strip()
-            if not line or re.match(r"^[A-Z\s]{5,}$", line): break
-            edu_lines.append(line)
-            edu_block += " " + line
-            if len(edu_lines) >= 3: break
-
-    match = re.search(r"(Bachelor|Master|PhD|Doctor|Diploma|Certificate)[^0-9\n]*(?:in)?[^0-9\n]*?\b(?:19|20)\d{2}\b", edu_block, re.IGNORECASE)
+        line = resume.lines[i].strip()
+        if not line or CAPS_LINE_RE.match(line): break
+        edu_lines.append(line)
+        edu_block += " " + line
+        if len(edu_lines) >= 3: break
+
+    match = DEGREE_RE.search(edu_block)
     if match:
         entry = match.group().strip()
-        year = re.search(r"\b(19|20)\d{2}\b", entry)
+        year = YEAR_RE.search(entry)
         year = int(year.group()) if year else None
         parts = entry.split(str(year)) if year else [entry]
         course = parts[0].strip()
@@ -127,7 +140,7 @@ def extract_education(text):
         if len(edu_lines) < 2: return []
         course, institution = edu_lines[0], edu_lines[1]
         year_line = edu_lines[2] if len(edu_lines) > 2 else ""
-        year = re.search(r"\b(19|20)\d{2}\b", year_line or institution)
+        year = YEAR_RE.search(year_line or institution)
         year = int(year.group()) if year else None
 
     level_map = {
@@ -144,68 +157,329 @@ def extract_education(text):
         "year": year
     }]
 
+# Field extractors that each make one regex pass per document (name and education over their
+# lines, email and phone over the text); regex_scans is counted per document in parse_resume_text
+FIELD_EXTRACTORS = (extract_name, extract_email, extract_phone, extract_education)
+
+def _header_lines(text):
+    return [line.strip() for line in segment_resume(text).header_lines() if line.strip()]
+
+@log_exceptions
+def resolve_job_title(text, job_titles):
+    # Best matching reference title and every title's similarity to it, from one batched scoring
+    return get_title_index(job_titles).resolve(_header_lines(text))
+
 @log_exceptions
 def extract_job_title(text, job_titles):
-    lines = [line.strip() for line in text.splitlines()[:10] if line.strip()]
-    best_title = ""
-    best_score = 0
-    for ref_title in job_titles:
-        for line in lines:
-            score = fuzz.token_sort_ratio(ref_title.lower(), line.lower())
-            if score > best_score:
-                best_score, best_title = score, ref_title
-    return best_title
+    return resolve_job_title(text, job_titles)[0]
+
+def _extract_resume_text(path, digest):
+    # "" for a file that could not be extracted (or is quarantined), so it is skipped like an empty one
+    try:
+        return extract_text_from_pdf(path, digest) if path.endswith('.pdf') else extract_text_from_docx(path, digest)
+    except ExtractionFailed as e:
+        print(f" {e}")
+        return ""
 
 @log_exceptions
-def process_resumes():
-    job_skill_map = load_job_title_skill_map()
-    job_titles = list(job_skill_map.keys())
+def parse_resume_file(path, taxonomy, digest=None):
+    return parse_resume_text(_extract_resume_text(path, digest), taxonomy)
 
-    os.makedirs(os.path.dirname(PARSED_RESUMES_FILE), exist_ok=True)
+# Row written to PARSED_RESUMES_FILE (without resume_id), or None for an empty document
+def parse_resume_text(text, taxonomy=None):
+    taxonomy = taxonomy or get_taxonomy()
+    if not text.strip():
+        return None
+
+    metrics.incr("resumes.parsed")
+    metrics.incr("regex_scans", len(FIELD_EXTRACTORS))
+    resume = segment_resume(text)
+    name, email, phone, education = (extract(resume) for extract in FIELD_EXTRACTORS)
+    job_title, similarities = resolve_job_title(resume, taxonomy.titles)
+    skills = extract_skills_from_resume(resume, job_title, taxonomy=taxonomy, similarities=similarities)
+
+    edu_str = ""
+    if education:
+        edu = education[0]
+        edu_str = ", ".join(filter(None, [edu['course'], edu['institution'], str(edu['year'])]))
+
+    return [
+        name,
+        email,
+        f"\t{phone}",  # force Excel to treat phone as text
+        edu_str,
+        job_title,
+        "; ".join(skills)
+    ]
+
+# Parsed resume as a dict, e.g. for the Streamlit app; None for an empty document
+@log_exceptions
+def parse_resume(text, taxonomy=None):
+    row = parse_resume_text(text, taxonomy)
+    if row is None:
+        return None
+    name, email, phone, education, job_title, skills = row
+    return {"name": name, "email": email, "phone": phone.lstrip("\t"), "education": education,
+            "job_title": job_title, "skills": [s for s in skills.split("; ") if s]}
+
+# ------------ Parallel Parsing Section ------------ #
+
+# Taxonomy loaded once per pool worker (from its snapshot) instead of being shipped with every file
+_worker_state = {}
+
+def _init_worker():
+    metrics.reset()  # forked workers start with a copy of the parent's metrics
+    _worker_state["taxonomy"] = get_taxonomy()
+
+def _parse_task(task):
+    path, digest = task
+    digest = digest or file_hash(path)
+    try:
+        return digest, parse_resume_file(path, _worker_state["taxonomy"], digest)
+    except Exception as e:
+        # Logged by log_exceptions; the file is skipped rather than aborting the batch
+        print(f" Failed to parse {path}: {e}")
+        return digest, None
+
+def _parse_worker_task(task):
+    # _parse_task in a pool worker, plus the metrics it collected for the parent to merge
+    return _parse_task(task) + (metrics.take(),)
+
+# Yields (file_name, digest, row) in input order, so IDs match a serial run whatever the worker count.
+def parse_resume_files(file_names, taxonomy, digests=None, workers=1):
+    digests = digests or {}
+    tasks = [(os.path.join(RESUME_FOLDER, name), digests.get(name)) for name in file_names]
+
+    if workers <= 1 or len(tasks) <= 1:
+        _worker_state["taxonomy"] = taxonomy
+        for file_name, task in zip(file_names, tasks):
+            print(f" Processing: {file_name}")
+            yield (file_name,) + _parse_task(task)
+        return
+
+    chunksize = max(1, min(16, len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for file_name, (digest, row, worker_metrics) in zip(file_names, pool.map(_parse_worker_task, tasks, chunksize=chunksize)):
+            metrics.merge(worker_metrics)
+            print(f" Processing: {file_name}")
+            yield file_name, digest, row
+
+# ------------ Streaming Section ------------ #
+
+def _ordered_window(executor, fn, items, size):
+    # fn over items on executor with at most `size` calls in flight, results in input order.
+    # A new item is only taken once the oldest result is consumed, so a slow consumer stalls
+    # the stages feeding it instead of letting their output pile up in memory.
+    items = iter(items)
+    pending = deque(executor.submit(fn, item) for item in itertools.islice(items, size))
+    while pending:
+        result = pending.popleft().result()
+        for item in itertools.islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
+
+def _extract_stream_task(path):
+    # Runs on an extraction thread: file hash and (cached) text
+    digest = file_hash(path)
+    return digest, _extract_resume_text(path, digest)
 
+def _parse_text_task(task):
+    digest, text = task
+    try:
+        return digest, parse_resume_text(text, _worker_state["taxonomy"])
+    except Exception as e:
+        logger.error(f"Failed to parse resume {digest}: {e}", exc_info=True)
+        print(f" Failed to parse resume: {e}")
+        return digest, None
+
+def _parse_text_worker_task(task):
+    return _parse_text_task(task) + (metrics.take(),)
+
+# Same results as parse_resume_files, with the stages overlapped: text is extracted on
+# STREAM_EXTRACT_THREADS threads while earlier files are parsed (in a process pool with
+# workers > 1) and the caller consumes the rows. At most STREAM_QUEUE_SIZE files wait in each stage.
+def stream_resume_files(file_names, taxonomy, workers=1):
+    paths = [os.path.join(RESUME_FOLDER, name) for name in file_names]
+    _worker_state["taxonomy"] = taxonomy
+
+    if workers <= 1:
+        with ThreadPoolExecutor(max_workers=STREAM_EXTRACT_THREADS) as threads:
+            extracted = _ordered_window(threads, _extract_stream_task, paths, STREAM_QUEUE_SIZE)
+            for file_name, task in zip(file_names, extracted):
+                print(f" Processing: {file_name}")
+                yield (file_name,) + _parse_text_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        # Forks every worker now, before the extraction threads start: forking a process that
+        # already runs threads can leave locks held in the children
+        pool.submit(int).result()
+        with ThreadPoolExecutor(max_workers=STREAM_EXTRACT_THREADS) as threads:
+            extracted = _ordered_window(threads, _extract_stream_task, paths, STREAM_QUEUE_SIZE)
+            parsed = _ordered_window(pool, _parse_text_worker_task, extracted, STREAM_QUEUE_SIZE)
+            for file_name, (digest, row, worker_metrics) in zip(file_names, parsed):
+                metrics.merge(worker_metrics)
+                print(f" Processing: {file_name}")
+                yield file_name, digest, row
+
+def list_resume_files():
+    # Sorted so resume IDs do not depend on directory listing order
+    return sorted(f for f in os.listdir(RESUME_FOLDER) if f.lower().endswith(('.pdf', '.docx')))
+
+def load_parsed_resume_rows():
+    if not os.path.exists(PARSED_RESUMES_FILE):
+        return []
+    with open(PARSED_RESUMES_FILE, mode='r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return [row for row in reader if row]
+
+def save_parsed_resumes(rows):
+    os.makedirs(os.path.dirname(PARSED_RESUMES_FILE), exist_ok=True)
     with open(PARSED_RESUMES_FILE, mode='w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['resume_id', 'Name', 'Email', 'Phone', 'Education', 'Job Title', 'Skills'])
+        writer.writerows(rows)
+    metrics.incr("resumes.saved", len(rows))
+    # Imported here: the Arrow store pulls in pyarrow, pandas and scipy, which parsing never needs
+    from Scripts.parsed_store import save_resume_store
+    save_resume_store(rows)
 
-        idx = 1
-        for file_name in os.listdir(RESUME_FOLDER):
-            if not file_name.lower().endswith(('.pdf', '.docx')):
-                continue
+def _resume_number(resume_id):
+    match = re.match(r"RES(\d+)$", resume_id or "")
+    return int(match.group(1)) if match else 0
 
-            path = os.path.join(RESUME_FOLDER, file_name)
-            print(f" Processing: {file_name}")
+def update_resumes(manifest, taxonomy, workers=1):
+    old_entries = manifest["resumes"]
+    entries, changed, removed = scan_folder(RESUME_FOLDER, list_resume_files(), old_entries)
+
+    # Keep previously parsed rows only for files that are still tracked
+    tracked_ids = {entry["id"] for entry in entries.values() if entry.get("id")}
+    rows = {row[0]: row for row in load_parsed_resume_rows() if row[0] in tracked_ids}
+    next_idx = max([_resume_number(entry.get("id")) for entry in old_entries.values()] + [0]) + 1
+
+    changed_ids = set()
+    digests = {file_name: entries[file_name]["hash"] for file_name in changed}
+    for file_name, _, row in parse_resume_files(changed, taxonomy, digests, workers):
+        entry = entries[file_name]
+        if row is None:
+            print(f" Skipped empty or unreadable file: {file_name}")
+            rows.pop(entry.get("id"), None)
+            entry["id"] = None
+            continue
+
+        if not entry.get("id"):
+            entry["id"] = f"RES{next_idx:04d}"
+            next_idx += 1
+        rows[entry["id"]] = [entry["id"]] + row
+        changed_ids.add(entry["id"])
+
+    for file_name in removed:
+        print(f" Removed: {file_name}")
+
+    save_parsed_resumes(sorted(rows.values(), key=lambda row: _resume_number(row[0])))
+    manifest["resumes"] = entries
+    print(f"\n {len(changed)} changed and {len(removed)} removed resume files; parsed resumes saved to: {PARSED_RESUMES_FILE}")
+    return changed_ids
 
-            text = extract_text_from_pdf(path) if path.endswith('.pdf') else extract_text_from_docx(path)
-            if not text.strip():
-                print(f" Skipped empty or unreadable file: {file_name}")
-                continue
-
-            resume_id = f"RES{idx:04d}"
-            idx += 1
-
-            name = extract_name(text)
-            email = extract_email(text)
-            phone = extract_phone(text)
-            education = extract_education(text)
-            job_title = extract_job_title(text, job_titles)
-            skills = extract_skills_from_resume(text, job_title, job_skill_map)
-
-            edu_str = ""
-            if education:
-                edu = education[0]
-                edu_str = ", ".join(filter(None, [edu['course'], edu['institution'], str(edu['year'])]))
-
-            writer.writerow([
-                resume_id,
-                name,
-                email,
-                f"\t{phone}",  # force Excel to treat phone as text
-                edu_str,
-                job_title,
-                "; ".join(skills)
-            ])
+# Returns the set of resume IDs whose rows changed in incremental mode, or None after a full rebuild.
+# on_parsed (full rebuilds only) is called with each PARSED_RESUMES_FILE row as soon as it is
+# parsed, and switches to stream_resume_files.
+@log_exceptions
+def process_resumes(incremental=False, workers=1, on_parsed=None):
+    with metrics.stage("resume_parsing"):
+        return _process_resumes(incremental, workers, on_parsed)
+
+def _process_resumes(incremental, workers, on_parsed=None):
+    taxonomy = get_taxonomy()
+    manifest = load_manifest()
+
+    if incremental and not keywords_changed(manifest, "resumes"):
+        changed_ids = update_resumes(manifest, taxonomy, workers)
+        save_manifest(manifest)
+        return changed_ids
+
+    entries = {}
+    rows = []
+    idx = 1
+    parse_files = stream_resume_files if on_parsed else parse_resume_files
+    for file_name, digest, row in parse_files(list_resume_files(), taxonomy, workers=workers):
+        entry = file_entry(os.path.join(RESUME_FOLDER, file_name), digest=digest)
+        entries[file_name] = entry
+        if row is None:
+            print(f" Skipped empty or unreadable file: {file_name}")
+            continue
+
+        resume_id = f"RES{idx:04d}"
+        idx += 1
+        entry["id"] = resume_id
+        rows.append([resume_id] + row)
+        if on_parsed:
+            on_parsed(rows[-1])
 
+    save_parsed_resumes(rows)
+    manifest["resumes"] = entries
+    mark_keywords(manifest, "resumes")
+    save_manifest(manifest)
     print(f"\n Parsed resumes saved to: {PARSED_RESUMES_FILE}")
+    return None
+
+# ------------ Upload Parsing Section ------------ #
+
+# Parsed uploads by (content hash, taxonomy hash), kept for the life of the process so the same
+# file uploaded again, or a Streamlit rerun, is never parsed twice
+_parsed_uploads = OrderedDict()
+
+def _parse_upload_task(task):
+    data, filename = task
+    try:
+        return parse_resume(extract_text_from_bytes(data, filename), _worker_state.get("taxonomy"))
+    except Exception as e:
+        logger.error(f"Failed to parse uploaded resume {filename}: {e}")
+        return None
+
+def _parse_upload_worker_task(task):
+    return _parse_upload_task(task), metrics.take()
+
+def _parse_uploads(tasks, taxonomy, workers):
+    if workers <= 1:
+        _worker_state["taxonomy"] = taxonomy
+        return [_parse_upload_task(task) for task in tasks]
+    chunksize = max(1, min(16, len(tasks) // (workers * 4)))
+    # Spawned, not forked: the caller is typically a multithreaded server (the Streamlit app)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        parsed = []
+        for result, worker_metrics in pool.map(_parse_upload_worker_task, tasks, chunksize=chunksize):
+            metrics.merge(worker_metrics)
+            parsed.append(result)
+        return parsed
+
+# parse_resume() dicts (None for unreadable files) for (filename, bytes) uploads, in input order.
+# Uploads not parsed before are extracted from memory, and parsed in a pool of spawned processes
+# with workers > 1 (each pays an interpreter start, so only worth it for large batches).
+@log_exceptions
+def parse_resume_uploads(uploads, workers=1):
+    taxonomy = get_taxonomy()
+    keys = [(bytes_hash(data), taxonomy.source_hash) for _, data in uploads]
+    missing = {}
+    for key, (filename, data) in zip(keys, uploads):
+        if key not in _parsed_uploads and key not in missing:
+            missing[key] = (data, filename)
+
+    metrics.incr("upload_memo.hits", len(keys) - len(missing))
+    metrics.incr("upload_memo.misses", len(missing))
+    workers = min(workers or 1, len(missing))
+    for key, parsed in zip(missing, _parse_uploads(list(missing.values()), taxonomy, workers)):
+        _parsed_uploads[key] = parsed
+
+    results = []
+    for key in keys:
+        _parsed_uploads.move_to_end(key)
+        results.append(_parsed_uploads[key])
+    while len(_parsed_uploads) > PARSED_UPLOAD_CACHE_SIZE:
+        _parsed_uploads.popitem(last=False)
+    return results
 
 if __name__ == "__main__":
-    process_resumes()
\ No newline at end of file
+    process_resumes()
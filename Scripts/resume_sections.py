@@ -0,0 +1,65 @@
+import re
+
+# One pass over a resume's text: it is split into lines and lower-cased once, and every section
+# heading is found, so the resume parser's field extractors all read this structure instead of
+# re-splitting or re-scanning the whole text. Lines before the first heading form the "header"
+# section (name, title and contact details).
+
+HEADER_LINES = 10  # name and current title are only looked for in the first lines
+MAX_HEADING_CHARS = 40
+
+SECTION_PATTERNS = [
+    ("summary", r"(?:professional |career |executive )?(?:summary|profile)(?: of qualifications)?"
+                r"|(?:career )?objective|about me"),
+    ("skills", r"(?:core |key |technical |professional )?(?:skills|competencies|proficiencies)"
+               r"|skills (?:and|&) (?:abilities|competencies|qualifications)|summary of skills|(?:areas of )?expertise"),
+    ("experience", r"(?:(?:professional|work|relevant|employment|career) )*(?:experience|history)|employment"),
+    ("education", r"education(?: (?:and|&) (?:training|certifications?))?|academic (?:background|qualifications)"),
+    ("certifications", r"certifications?(?: (?:and|&) training)?|licen[cs]es(?: (?:and|&) certifications?)?|training"),
+    ("projects", r"(?:key |selected |academic )?projects"),
+    ("other", r"awards|publications|languages|interests|references|achievements|accomplishments"
+              r"|memberships|affiliations|volunteer(?:ing| experience| work)?"),
+]
+HEADING_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_PATTERNS))
+
+class ResumeSections:
+    __slots__ = ("text", "lines", "lower", "lower_lines", "sections", "education_line")
+
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.splitlines()
+        self.lower = text.lower()
+        self.lower_lines = self.lower.splitlines()  # lower() never adds or removes line breaks
+        self.sections = {}  # section name -> [(first line, end line)], headings excluded
+        self.education_line = None  # first line mentioning "education", where extract_education starts
+
+        current, start = "header", 0
+        for i, line in enumerate(self.lower_lines):
+            if self.education_line is None and "education" in line:
+                self.education_line = i
+            if len(line) > MAX_HEADING_CHARS:
+                continue
+            match = HEADING_RE.fullmatch(line.strip().rstrip(":").rstrip())
+            if match:
+                self.sections.setdefault(current, []).append((start, i))
+                current, start = match.lastgroup, i + 1
+        self.sections.setdefault(current, []).append((start, len(self.lines)))
+
+    def header_lines(self):
+        return self.lines[:HEADER_LINES]
+
+    def section_text(self, names):
+        # Lower-cased lines of the named sections, in document order
+        ranges = sorted(r for name in names for r in self.sections.get(name, ()))
+        return "\n".join(line for first, end in ranges for line in self.lower_lines[first:end])
+
+    def skill_text(self, names=None):
+        # Lower-cased text searched for skills: the named sections, or the whole text when names is
+        # None or no heading was recognized (nothing to restrict the search to)
+        if names is None or list(self.sections) == ["header"]:
+            return self.lower
+        return self.section_text(names)
+
+def segment_resume(resume):
+    # ResumeSections for a text; an already segmented resume is returned as is
+    return resume if isinstance(resume, ResumeSections) else ResumeSections(resume)
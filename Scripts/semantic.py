@@ -0,0 +1,202 @@
+import os
+import re
+import sys
+import hashlib
+import logging
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import (EMBEDDING_CACHE_DIR, EMBEDDING_DTYPE, SEMANTIC_BATCH_SIZE, SEMANTIC_MIN_SCORE,
+                      HASHING_ENCODER_DIM, LOG_FILE)
+from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.skill_similarity import SkillSimilarity
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Upper bound on cosine scores computed per matrix product
+COSINE_BLOCK_CELLS = 10_000_000
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# ------------ Encoder Section ------------ #
+
+# Deterministic offline encoder: signed feature hashing of words and character trigrams.
+# Needs no model download, so semantic mode runs anywhere (and identically) on CPU.
+class HashingEncoder:
+    def __init__(self, dim=HASHING_ENCODER_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text):
+        words = TOKEN_RE.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vectors[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return vectors
+
+# sentence-transformers model loaded from a local directory; imported only when used
+class LocalModelEncoder:
+    def __init__(self, model_dir, batch_size=SEMANTIC_BATCH_SIZE):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_dir, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{os.path.basename(os.path.normpath(model_dir))}-{self.dim}"
+        self.batch_size = batch_size
+
+    def encode(self, texts):
+        return self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True,
+                                 normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+
+def make_encoder(spec):
+    # "hashing" for the built-in encoder, otherwise a local sentence-transformers model directory
+    if spec == "hashing":
+        return HashingEncoder()
+    if not os.path.isdir(spec):
+        raise FileNotFoundError(f"Semantic encoder must be 'hashing' or a local model directory: {spec}")
+    return LocalModelEncoder(spec)
+
+# ------------ Embedding Cache Section ------------ #
+
+def text_key(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+# Vectors of every string ever encoded, in one memory-mapped file per encoder:
+#   <dir>/<encoder name>/vectors-<dtype>.bin   row-major (rows x dim) array
+#   <dir>/<encoder name>/keys.npy              uint64 string hash of each row
+# New strings are encoded in batches and appended, so reruns never encode a string twice.
+# Appends assume one writer: a read_only store (e.g. one of several concurrent matching shards)
+# keeps strings missing from the files in memory instead, rounded to dtype like stored rows.
+class EmbeddingStore:
+    def __init__(self, encoder, directory=EMBEDDING_CACHE_DIR, dtype=EMBEDDING_DTYPE, read_only=False):
+        self.encoder = encoder
+        self.dtype = np.dtype(dtype)
+        self.read_only = read_only
+        self.directory = os.path.join(directory, encoder.name)
+        self._vectors_path = os.path.join(self.directory, f"vectors-{self.dtype.name}.bin")
+        self._keys_path = os.path.join(self.directory, "keys.npy")
+        self._keys = []
+        self._index = {}
+        self._mmap = None
+        self._unsaved = {}  # key -> vector, read_only stores only
+        self._load()
+
+    def _load(self):
+        try:
+            keys = np.load(self._keys_path, allow_pickle=False)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Ignoring unreadable embedding index {self._keys_path}: {e}")
+            return
+        row_bytes = self.encoder.dim * self.dtype.itemsize
+        if not os.path.exists(self._vectors_path) or os.path.getsize(self._vectors_path) < len(keys) * row_bytes:
+            logger.error(f"Ignoring truncated embedding cache {self._vectors_path}")
+            return
+        self._keys = keys.tolist()
+        self._index = {key: row for row, key in enumerate(self._keys)}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _matrix(self):
+        if self._mmap is None or len(self._mmap) != len(self._keys):
+            self._mmap = np.memmap(self._vectors_path, dtype=self.dtype, mode="r",
+                                   shape=(len(self._keys), self.encoder.dim))
+        return self._mmap
+
+    def _append(self, keys, vectors):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._vectors_path, "ab") as f:
+            # Drops rows left behind by a run that died before saving its keys
+            f.truncate(len(self._keys) * self.encoder.dim * self.dtype.itemsize)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        for key in keys:
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+
+        tmp_path = f"{self._keys_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, np.array(self._keys, dtype=np.uint64))
+        os.replace(tmp_path, self._keys_path)
+        self._mmap = None
+
+    def vectors(self, texts):
+        # float32 (len(texts) x dim) array, encoding only strings not cached yet
+        keys = [text_key(t) for t in texts]
+        missing = list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in self._index and k not in self._unsaved))
+        metrics.incr("embedding_cache.hits", len(keys) - len(missing))
+        metrics.incr("embedding_cache.misses", len(missing))
+        for start in range(0, len(missing), SEMANTIC_BATCH_SIZE):
+            batch = missing[start:start + SEMANTIC_BATCH_SIZE]
+            vectors = self.encoder.encode(batch)
+            if self.read_only:
+                for text, vector in zip(batch, vectors.astype(self.dtype).astype(np.float32)):
+                    self._unsaved[text_key(text)] = vector
+            else:
+                self._append([text_key(t) for t in batch], vectors)
+        if not keys:
+            return np.zeros((0, self.encoder.dim), dtype=np.float32)
+        if not self._unsaved:
+            rows = np.fromiter((self._index[k] for k in keys), dtype=np.int64, count=len(keys))
+            return np.asarray(self._matrix()[rows], dtype=np.float32)
+
+        result = np.empty((len(keys), self.encoder.dim), dtype=np.float32)
+        stored = [i for i, k in enumerate(keys) if k in self._index]
+        if stored:
+            result[stored] = self._matrix()[[self._index[keys[i]] for i in stored]]
+        for i, k in enumerate(keys):
+            if k not in self._index:
+                result[i] = self._unsaved[k]
+        return result
+
+def normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def unit_vectors(store, texts):
+    # Cached embeddings scaled to unit length, so dot products are cosine similarities
+    return normalize_rows(store.vectors(texts))
+
+# ------------ Semantic Similarity Section ------------ #
+
+# Drop-in replacement for SkillSimilarity scoring cosine similarity * 100 of skill embeddings
+# instead of fuzz.partial_ratio, so MatchEngine and calculate_match use it unchanged.
+class SemanticSimilarity(SkillSimilarity):
+    def __init__(self, store, min_score=SEMANTIC_MIN_SCORE):
+        super().__init__(min_score)
+        self.store = store
+
+    def _score_block(self, queries, choices):
+        if not queries or not choices:
+            return
+        choice_vectors = unit_vectors(self.store, choices)
+        step = max(1, COSINE_BLOCK_CELLS // len(choices))
+        for start in range(0, len(queries), step):
+            query_vectors = unit_vectors(self.store, queries[start:start + step])
+            scores = (query_vectors @ choice_vectors.T).astype(np.float64) * 100
+            for i, j in zip(*np.nonzero(scores >= self.min_score)):
+                yield start + int(i), int(j), float(scores[i, j])
+
+    def save(self, path=None):
+        # Embeddings are persisted as they are encoded; the pair scores are cheap to rebuild
+        self.dirty = False
+
+_semantic = {}
+
+@log_exceptions
+def get_semantic_similarity(spec, min_score=SEMANTIC_MIN_SCORE, read_only=False):
+    key = (spec, min_score, read_only)
+    if key not in _semantic:
+        _semantic[key] = SemanticSimilarity(EmbeddingStore(make_encoder(spec), read_only=read_only), min_score)
+    return _semantic[key]
@@ -0,0 +1,238 @@
+import os
+import sys
+import zlib
+import heapq
+import pickle
+import logging
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import (MATCH_RESULTS_FILE, MATCH_RESULTS_PARQUET_FILE, MATCH_SHARD_DIR, MATCH_SHARD_BY, MATCH_TOP_K,
+                      MATCH_MIN_SCORE, MATCH_RESULTS_PARQUET, SEMANTIC_ENCODER, SEMANTIC_THRESHOLD, SEMANTIC_MIN_SCORE,
+                      PARSED_RESUMES_FILE, PARSED_JD_FILE, LOG_FILE)
+from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.text_cache import file_hash
+from Scripts.matcher import load_job_skills, match_options
+from Scripts.manifest import save_match_options
+from Scripts.match_engine import MatchEngine
+from Scripts.skill_similarity import get_skill_similarity
+from Scripts.semantic import get_semantic_similarity, unit_vectors
+from Scripts.result_writer import ResultWriter, RESULT_COLUMNS
+from Scripts.parsed_store import load_resume_table
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Sharded matching (main.py --shard i/N, --merge-shards N and --shards N). Resumes, or jobs, are
+# split into N shards by a stable hash of their ID, so every process or node reading the same
+# parsed files picks the same members. A shard matches its members against the whole other side
+# and writes a partial file under MATCH_SHARD_DIR:
+#
+#   pickled metadata (options, shard number, hashes of the parsed CSVs), then one pickle per job:
+#   (job position, [(resume position, matched weight, row values in column order), ...])
+#
+# Each job's rows are in output order: resume order, or best first with top_k/min_score. A failed
+# shard is simply run again and replaces its file. merge_shards() streams the N files job by job,
+# merges their rows (by resume position, or by matched weight with ties in resume order, as
+# MatchEngine.retrieve() ranks them) and writes the same files as a single match_all_resumes run.
+
+SHARD_FORMAT_VERSION = 1
+SHARD_BY = ("resumes", "jobs")
+
+def parse_shard(spec):
+    # "i/N" -> (i, N), with 0 <= i < N
+    try:
+        shard, shards = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}") from None
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {spec} is out of range: expected 0 <= i < N")
+    return shard, shards
+
+def shard_of(key, shards):
+    # crc32 rather than hash(), which is salted per process for strings
+    return zlib.crc32(str(key).encode("utf-8")) % shards
+
+def shard_path(shard, shards):
+    return os.path.join(MATCH_SHARD_DIR, f"resume_match_results.{shard}-of-{shards}.pkl")
+
+def _inputs_fingerprint():
+    return {"resumes": file_hash(PARSED_RESUMES_FILE), "jobs": file_hash(PARSED_JD_FILE)}
+
+# ------------ Shard Matching Section ------------ #
+
+@log_exceptions
+def match_shard(shard, shards, by=MATCH_SHARD_BY, top_k=MATCH_TOP_K, min_score=MATCH_MIN_SCORE,
+                semantic=SEMANTIC_ENCODER):
+    if by not in SHARD_BY:
+        raise ValueError(f"Shards split {' or '.join(SHARD_BY)}, not {by!r}")
+    with metrics.stage("matching.shard"):
+        return _match_shard(shard, shards, by, top_k, min_score, semantic)
+
+def _match_shard(shard, shards, by, top_k, min_score, semantic):
+    all_jobs = load_job_skills()
+    resumes = load_resume_table()
+    resume_ids = resumes.column("resume_id")
+    job_ids = list(all_jobs)
+    resume_positions = range(len(resume_ids))
+    job_positions = range(len(job_ids))
+    if by == "resumes":
+        resume_positions = [p for p, resume_id in enumerate(resume_ids) if shard_of(resume_id, shards) == shard]
+    else:
+        job_positions = [p for p, job_id in enumerate(job_ids) if shard_of(job_id, shards) == shard]
+    jobs = {job_ids[p]: all_jobs[job_ids[p]] for p in job_positions}
+
+    columns = RESULT_COLUMNS + ["title_similarity"] if semantic else RESULT_COLUMNS
+    meta = {"version": SHARD_FORMAT_VERSION, "shard": shard, "shards": shards, "by": by, "top_k": top_k,
+            "min_score": min_score, "semantic": semantic, "columns": columns, "inputs": _inputs_fingerprint()}
+    path = shard_path(shard, shards)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    rows_written = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(meta, f, pickle.HIGHEST_PROTOCOL)
+            if jobs and resume_positions:
+                for job_pos, records in _shard_records(resumes, resume_positions, jobs, job_positions,
+                                                       top_k, min_score, semantic):
+                    pickle.dump((job_pos, records), f, pickle.HIGHEST_PROTOCOL)
+                    rows_written += len(records)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    metrics.incr("match_rows.sharded", rows_written)
+    print(f"Shard {shard}/{shards}: {len(resume_positions)} resumes x {len(jobs)} jobs, "
+          f"{rows_written} match rows saved to: {path}")
+    return path
+
+def _shard_records(resumes, resume_positions, jobs, job_positions, top_k, min_score, semantic):
+    # Yields (job position, records) for every job of the shard, scored against its resumes only
+    matrix, vocab = resumes.skill_matrix()
+    if semantic:
+        # Read-only: shards running at the same time must not append to the shared embedding files
+        similarity = get_semantic_similarity(semantic, min(SEMANTIC_MIN_SCORE, SEMANTIC_THRESHOLD), read_only=True)
+        engine = MatchEngine((matrix[list(resume_positions)], vocab), jobs, similarity, threshold=SEMANTIC_THRESHOLD)
+    else:
+        similarity = get_skill_similarity()
+        engine = MatchEngine((matrix[list(resume_positions)], vocab), jobs, similarity)
+
+    fields = [[column[p] for p in resume_positions]
+              for column in map(resumes.column, ["resume_id", "Name", "Email", "Phone", "Job Title"])]
+    if semantic:
+        resume_titles = unit_vectors(similarity.store, ["" if t is None else str(t) for t in fields[4]])
+        job_titles = unit_vectors(similarity.store, [str(title) for title, _ in jobs.values()])
+
+    retrieval = top_k is not None or min_score is not None
+    for job_idx, (job_pos, (job_id, (job_title, job_skills))) in enumerate(zip(job_positions, jobs.items())):
+        rows = engine.iter_top_rows(job_idx, top_k, min_score) if retrieval else engine.iter_job_rows(job_idx)
+        if semantic:
+            title_scores = ((resume_titles @ job_titles[job_idx]).astype(np.float64) * 100).round(1)
+
+        records = []
+        for r, match_score, matched_skills, missing_skills in rows:
+            values = (fields[0][r], fields[1][r], fields[2][r], fields[3][r], fields[4][r], job_id, job_title,
+                      match_score, matched_skills, missing_skills)
+            if semantic:
+                values += (float(title_scores[r]),)
+            # Weights are keyword counts, so these sums are exact and ties compare as in retrieve()
+            records.append((resume_positions[r], sum(job_skills[skill] for skill in matched_skills), values))
+        yield job_pos, records
+
+    if similarity.dirty:
+        similarity.save()
+
+def cache_embeddings(semantic):
+    # Encodes every skill and title once, in this process, so read-only shards find them all cached
+    resumes = load_resume_table()
+    jobs = load_job_skills()
+    texts = list(dict.fromkeys(skill for _, skills in jobs.values() for skill in skills))
+    texts += resumes.skill_matrix()[1]
+    texts += [str(title) for title, _ in jobs.values()]
+    texts += ["" if t is None else str(t) for t in resumes.column("Job Title")]
+    get_semantic_similarity(semantic, min(SEMANTIC_MIN_SCORE, SEMANTIC_THRESHOLD)).store.vectors(list(dict.fromkeys(texts)))
+
+def _match_shard_worker_task(task):
+    return match_shard(*task), metrics.take()
+
+# Matches all N shards on one machine, on up to `workers` processes, then merges them
+@log_exceptions
+def run_shards(shards, workers=1, by=MATCH_SHARD_BY, top_k=MATCH_TOP_K, min_score=MATCH_MIN_SCORE,
+               semantic=SEMANTIC_ENCODER, parquet=MATCH_RESULTS_PARQUET):
+    tasks = [(shard, shards, by, top_k, min_score, semantic) for shard in range(shards)]
+    if semantic:
+        cache_embeddings(semantic)
+    if workers <= 1 or shards <= 1:
+        for task in tasks:
+            match_shard(*task)
+    else:
+        # Forked workers start with a copy of the parent's metrics, so they reset before collecting
+        with ProcessPoolExecutor(max_workers=min(workers, shards), initializer=metrics.reset) as pool:
+            for _, worker_metrics in pool.map(_match_shard_worker_task, tasks):
+                metrics.merge(worker_metrics)
+    merge_shards(shards, parquet)
+
+# ------------ Merge Section ------------ #
+
+def _read_segments(f):
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+def _in_resume_order(record):
+    return record[0]
+
+def _ranked(record):
+    return -record[1], record[0]
+
+def _check_shards(metas, shards):
+    options = {k: v for k, v in metas[0].items() if k not in ("shard", "inputs")}
+    inputs = _inputs_fingerprint()
+    stale = [i for i, meta in enumerate(metas)
+             if meta.get("shard") != i or meta.get("inputs") != inputs
+             or {k: v for k, v in meta.items() if k not in ("shard", "inputs")} != options]
+    if stale:
+        raise ValueError(f"Shard(s) {', '.join(map(str, stale))} of {shards} do not match shard 0's options or the "
+                         f"current parsed files; re-run them with --shard i/{shards}")
+    return metas[0]
+
+# Combines the N shard files into MATCH_RESULTS_FILE (and MATCH_RESULTS_PARQUET_FILE with parquet),
+# with the options the shards were matched with
+@log_exceptions
+def merge_shards(shards, parquet=MATCH_RESULTS_PARQUET):
+    paths = [shard_path(shard, shards) for shard in range(shards)]
+    missing = [str(shard) for shard, path in enumerate(paths) if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Missing shard(s) {', '.join(missing)} of {shards}; run them with --shard i/{shards}")
+
+    with metrics.stage("matching.merge"), contextlib.ExitStack() as stack:
+        files = [stack.enter_context(open(path, "rb")) for path in paths]
+        meta = _check_shards([pickle.load(f) for f in files], shards)
+        top_k = meta["top_k"]
+        rank = _ranked if top_k is not None or meta["min_score"] is not None else _in_resume_order
+
+        parquet_path = MATCH_RESULTS_PARQUET_FILE if parquet else None
+        columns = meta["columns"]
+        segments = heapq.merge(*map(_read_segments, files), key=lambda segment: segment[0])
+        save_match_options(None)
+        with ResultWriter(MATCH_RESULTS_FILE, parquet_path, columns=columns) as writer:
+            for _, group in itertools.groupby(segments, key=lambda segment: segment[0]):
+                records = heapq.merge(*(records for _, records in group), key=rank)
+                if top_k:
+                    records = itertools.islice(records, top_k)
+                for _, _, values in records:
+                    writer.write(dict(zip(columns, values)))
+
+    save_match_options(match_options(top_k, meta["min_score"], meta["semantic"]))
+    metrics.incr("match_rows.written", writer.rows_written)
+    print(f"Merged {shards} shards; matching results saved to: {MATCH_RESULTS_FILE}")
+    if parquet_path:
+        print(f"Matching results saved to: {parquet_path}")
@@ -0,0 +1,136 @@
+import os
+import sys
+import logging
+import numpy as np
+from rapidfuzz import process, fuzz
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import SKILL_SIMILARITY_FILE, SKILL_SIMILARITY_MIN_SCORE, LOG_FILE
+from utils import setup_logger, log_exceptions
+from Scripts import metrics
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Upper bound on scores computed per cdist call, to keep memory bounded on large vocabularies
+CDIST_BLOCK_CELLS = 10_000_000
+
+# Sparse fuzz.partial_ratio matrix between job skills (rows) and resume skills (columns).
+# Each unique pair is scored once; only scores >= min_score are kept, and the matrix is
+# extended rather than recomputed when new skill strings appear.
+class SkillSimilarity:
+    def __init__(self, min_score=SKILL_SIMILARITY_MIN_SCORE):
+        self.min_score = min_score
+        self.job_skills = []
+        self.resume_skills = []
+        self._job_ids = {}
+        self._resume_ids = {}
+        self._rows = []  # per job skill: {resume skill id: score}
+        self._matches = {}
+        self.dirty = False
+
+    def _score_block(self, queries, choices):
+        # Yields (query offset, choice offset, score) for every stored pair
+        if not queries or not choices:
+            return
+        step = max(1, CDIST_BLOCK_CELLS // len(choices))
+        for start in range(0, len(queries), step):
+            scores = process.cdist(queries[start:start + step], choices, scorer=fuzz.partial_ratio,
+                                   processor=None, score_cutoff=self.min_score, dtype=np.float64, workers=-1)
+            for i, j in zip(*np.nonzero(scores >= self.min_score)):
+                yield start + int(i), int(j), float(scores[i, j])
+
+    def ensure(self, job_skills, resume_skills):
+        job_skills, resume_skills = dict.fromkeys(job_skills), dict.fromkeys(resume_skills)
+        new_jobs = [s for s in job_skills if s not in self._job_ids]
+        new_resumes = [s for s in resume_skills if s not in self._resume_ids]
+        metrics.incr("skill_similarity.hits", len(job_skills) + len(resume_skills) - len(new_jobs) - len(new_resumes))
+        metrics.incr("skill_similarity.misses", len(new_jobs) + len(new_resumes))
+        if not new_jobs and not new_resumes:
+            return
+
+        old_jobs = list(self.job_skills)
+        for skill in new_resumes:
+            self._resume_ids[skill] = len(self.resume_skills)
+            self.resume_skills.append(skill)
+        for skill in new_jobs:
+            self._job_ids[skill] = len(self.job_skills)
+            self.job_skills.append(skill)
+            self._rows.append({})
+
+        # New job skills against every resume skill, then existing job skills against new resume skills
+        metrics.incr("fuzzy_comparisons.skills", len(new_jobs) * len(self.resume_skills) + len(old_jobs) * len(new_resumes))
+        first_new_job = len(old_jobs)
+        for i, j, score in self._score_block(new_jobs, self.resume_skills):
+            self._rows[first_new_job + i][j] = score
+        first_new_resume = len(self.resume_skills) - len(new_resumes)
+        for i, j, score in self._score_block(old_jobs, new_resumes):
+            self._rows[i][first_new_resume + j] = score
+
+        self._matches.clear()
+        self.dirty = True
+
+    def covers(self, job_skills=(), resume_skills=()):
+        # True when ensure() would score nothing new, i.e. matches() can be read without it
+        return all(s in self._job_ids for s in job_skills) and all(s in self._resume_ids for s in resume_skills)
+
+    def matches(self, job_skill, threshold):
+        # Resume skills scoring >= threshold against job_skill (call ensure() first)
+        key = (job_skill, threshold)
+        found = self._matches.get(key)
+        if found is None:
+            row = self._rows[self._job_ids[job_skill]]
+            found = frozenset(self.resume_skills[j] for j, score in row.items() if score >= threshold)
+            self._matches[key] = found
+        return found
+
+    def save(self, path=SKILL_SIMILARITY_FILE):
+        rows, cols, scores = [], [], []
+        for i, row in enumerate(self._rows):
+            rows.extend([i] * len(row))
+            cols.extend(row.keys())
+            scores.extend(row.values())
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            min_score=np.array(self.min_score, dtype=np.float64),
+            job_skills=np.array(self.job_skills, dtype=str),
+            resume_skills=np.array(self.resume_skills, dtype=str),
+            rows=np.array(rows, dtype=np.int32),
+            cols=np.array(cols, dtype=np.int32),
+            scores=np.array(scores, dtype=np.float64),
+        )
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=SKILL_SIMILARITY_FILE, min_score=SKILL_SIMILARITY_MIN_SCORE):
+        similarity = cls(min_score)
+        if not os.path.exists(path):
+            return similarity
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if float(data["min_score"]) != float(min_score):
+                    return similarity
+                similarity.job_skills = data["job_skills"].tolist()
+                similarity.resume_skills = data["resume_skills"].tolist()
+                similarity._rows = [{} for _ in similarity.job_skills]
+                for i, j, score in zip(data["rows"].tolist(), data["cols"].tolist(), data["scores"].tolist()):
+                    similarity._rows[i][j] = score
+        except Exception as e:
+            logger.error(f"Ignoring unreadable skill similarity cache {path}: {e}")
+            return cls(min_score)
+        similarity._job_ids = {s: i for i, s in enumerate(similarity.job_skills)}
+        similarity._resume_ids = {s: i for i, s in enumerate(similarity.resume_skills)}
+        return similarity
+
+_similarity = None
+
+@log_exceptions
+def get_skill_similarity():
+    global _similarity
+    if _similarity is None:
+        _similarity = SkillSimilarity.load()
+    return _similarity
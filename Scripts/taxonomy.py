@@ -0,0 +1,141 @@
+import os
+import re
+import csv
+import sys
+import pickle
+import logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import KEYWORDS_FILE, TAXONOMY_SNAPSHOT_FILE, LOG_FILE
+from utils import setup_logger, log_exceptions
+from Scripts import metrics
+from Scripts.text_cache import file_hash
+from Scripts.keyword_matcher import KeywordMatcher
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Bump whenever SkillTaxonomy's fields or normalization change so old snapshots are rebuilt
+TAXONOMY_VERSION = 2
+
+SKILL_SPLIT_RE = re.compile(r",| or | and |/|\\|;", re.IGNORECASE)
+SKILL_PREFIX_RE = re.compile(
+    r"^(proficient in|experienced with|experience in|strong|good knowledge of|familiarity with|bachelor's in|master's in|related field|skills in|including)\s*")
+
+def split_skills(skill_str):
+    cleaned = []
+    for part in SKILL_SPLIT_RE.split(skill_str):
+        part = SKILL_PREFIX_RE.sub("", part.strip().lower())
+        if part and len(part) > 1 and not part.startswith("("):
+            cleaned.append(part)
+    return cleaned
+
+def split_keywords(cell):
+    return [part.strip() for part in cell.lower().strip().split(',')]
+
+# Normalized view of KEYWORDS_FILE, built once per process:
+#   skill_map / titles     raw skills string per job title (resume parser)
+#   title_skills           title -> tuple of normalized skills from split_skills
+#   title_skill_ids        title -> tuple of skill IDs into vocab
+#   skill_keywords         normalized 'Skills' keywords in first-seen order (job parser)
+#   requirement_keywords   normalized 'Keywords' keywords in first-seen order (job parser)
+#   keyword_matcher        single-pass matcher over both keyword sets (job parser)
+#   skill_matcher          single-pass matcher over every title skill (resume parser)
+class SkillTaxonomy:
+    def __init__(self, rows, source_hash=None):
+        self.source_hash = source_hash
+        self.vocab = []
+        self.skill_ids = {}
+        self.skill_map = {}
+        self.title_skills = {}
+        self.title_skill_ids = {}
+        skill_keywords = {}
+        requirement_keywords = {}
+
+        for row in rows:
+            job = (row.get('Job Title') or '').strip()
+            skills_str = (row.get('Skills') or '').strip()
+            keywords_str = (row.get('Keywords') or '').strip()
+
+            # Empty cells are skipped, matching pandas' dropna in the original keyword loader
+            if skills_str:
+                skill_keywords.update(dict.fromkeys(self.intern(k) for k in split_keywords(skills_str)))
+            if keywords_str:
+                requirement_keywords.update(dict.fromkeys(self.intern(k) for k in split_keywords(keywords_str)))
+
+            if job and skills_str:
+                job = sys.intern(job)
+                skills = tuple(self.intern(s) for s in split_skills(skills_str))
+                self.skill_map[job] = skills_str
+                self.title_skills[job] = skills
+                self.title_skill_ids[job] = tuple(self.skill_ids[s] for s in skills)
+
+        # Tuples rather than sets: iteration order decides the row order of parsed job skills
+        # and must not change between a freshly built taxonomy and one loaded from a snapshot
+        self.skill_keywords = tuple(skill_keywords)
+        self.requirement_keywords = tuple(requirement_keywords)
+        self.titles = list(self.skill_map.keys())
+        self.keyword_matcher = KeywordMatcher(sorted(skill_keywords.keys() | requirement_keywords.keys()))
+        self.skill_matcher = KeywordMatcher(sorted({s for skills in self.title_skills.values() for s in skills}))
+
+    def intern(self, skill):
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is not None:
+            return self.vocab[skill_id]
+        skill = sys.intern(skill)
+        self.skill_ids[skill] = len(self.vocab)
+        self.vocab.append(skill)
+        return skill
+
+    def skill_id(self, skill):
+        return self.skill_ids.get(skill)
+
+    @classmethod
+    def from_csv(cls, path=KEYWORDS_FILE, source_hash=None):
+        with open(path, mode='r', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file)
+            if 'Skills' not in (reader.fieldnames or []) or 'Keywords' not in reader.fieldnames:
+                raise KeyError("Both 'Skills' and 'Keywords' columns are required.")
+            return cls(list(reader), source_hash or file_hash(path))
+
+# ------------ Snapshot Section ------------ #
+
+_taxonomy = None
+_taxonomy_stat = None
+
+def _load_snapshot(path, source_hash):
+    try:
+        with open(path, 'rb') as f:
+            version, snapshot_hash, taxonomy = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Ignoring unreadable taxonomy snapshot {path}: {e}")
+        return None
+    if version != TAXONOMY_VERSION or snapshot_hash != source_hash:
+        return None
+    return taxonomy
+
+def _save_snapshot(path, taxonomy):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((TAXONOMY_VERSION, taxonomy.source_hash, taxonomy), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+@log_exceptions
+def get_taxonomy(path=KEYWORDS_FILE, snapshot_file=TAXONOMY_SNAPSHOT_FILE):
+    global _taxonomy, _taxonomy_stat
+    stat = os.stat(path)
+    current_stat = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if _taxonomy is not None and _taxonomy_stat == current_stat:
+        return _taxonomy
+
+    source_hash = file_hash(path)
+    taxonomy = _load_snapshot(snapshot_file, source_hash)
+    metrics.incr("taxonomy_snapshot.misses" if taxonomy is None else "taxonomy_snapshot.hits")
+    if taxonomy is None:
+        taxonomy = SkillTaxonomy.from_csv(path, source_hash)
+        _save_snapshot(snapshot_file, taxonomy)
+    _taxonomy, _taxonomy_stat = taxonomy, current_stat
+    return taxonomy
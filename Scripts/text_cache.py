@@ -0,0 +1,116 @@
+import os
+import hashlib
+import logging
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import TEXT_CACHE_DIR, TEXT_CACHE_MAX_BYTES, LOG_FILE
+from utils import setup_logger
+
+setup_logger(LOG_FILE)
+logger = logging.getLogger(__name__)
+
+# Running size of the cache directory, measured once per process on first write; the lock
+# covers it and eviction, since extraction threads, the service and the app write concurrently
+_cache_bytes = None
+_cache_lock = threading.Lock()
+
+# ------------ Hashing Section ------------ #
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def bytes_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+# ------------ Cache Storage Section ------------ #
+
+def _entry_path(digest, extractor, version):
+    # Shard by hash prefix so one directory never holds every cached document
+    return os.path.join(TEXT_CACHE_DIR, digest[:2], f"{digest}-{extractor}-v{version}.txt")
+
+def get_text(digest, extractor, version):
+    path = _entry_path(digest, extractor, version)
+    try:
+        with open(path, mode='r', encoding='utf-8', newline='') as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)  # mark as recently used for eviction
+    except OSError:
+        pass
+    return text
+
+def put_text(digest, extractor, version, text):
+    path = _entry_path(digest, extractor, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a private temp file first so concurrent workers and threads never read a partial entry
+    data = text.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _track_size(len(data))
+
+def _scan_entries():
+    entries = []
+    if not os.path.isdir(TEXT_CACHE_DIR):
+        return entries
+    for shard in os.scandir(TEXT_CACHE_DIR):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.endswith(".txt"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # evicted by another process meanwhile
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+def evict(max_bytes=TEXT_CACHE_MAX_BYTES):
+    with _cache_lock:
+        return _evict(max_bytes)
+
+def _evict(max_bytes=TEXT_CACHE_MAX_BYTES):
+    global _cache_bytes
+    entries = _scan_entries()
+    total = sum(size for _, size, _ in entries)
+
+    if total > max_bytes:
+        # Drop least recently used entries until comfortably under the cap
+        target = int(max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.error(f"Failed to evict cached text {path}: {e}")
+
+    _cache_bytes = total
+    return total
+
+def _track_size(added_bytes):
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is None:
+            _evict()
+            return
+        _cache_bytes += added_bytes
+        if _cache_bytes > TEXT_CACHE_MAX_BYTES:
+            _evict()
@@ -0,0 +1,81 @@
+import re
+from collections import OrderedDict
+import numpy as np
+from rapidfuzz import process, fuzz
+from Scripts import metrics
+
+# Lines seen in resume headers ("Data Analyst", "Ottawa, ON", ...) repeat across resumes,
+# so their scores against every reference title are memoized up to this many lines.
+LINE_CACHE_SIZE = 20000
+
+# fuzzywuzzy's force_ascii drops code points 128-255 before scoring
+_FORCE_ASCII = {i: None for i in range(128, 256)}
+# fuzzywuzzy's full_process: \W keeps underscores, unlike rapidfuzz's utils.default_process
+_NON_WORD_RE = re.compile(r"(?ui)\W")
+
+def normalize_title(text):
+    # Same preprocessing as fuzzywuzzy's token_sort_ratio: force_ascii, non-word characters to
+    # spaces, lower case, tokens sorted. ratio() on the result then equals token_sort_ratio().
+    text = _NON_WORD_RE.sub(" ", text.translate(_FORCE_ASCII)).lower().strip()
+    return " ".join(sorted(text.split()))
+
+# Batched fuzzy title scoring against a fixed list of reference titles.
+class TitleIndex:
+    def __init__(self, titles):
+        self.titles = list(titles)
+        self._normalized = [normalize_title(t) for t in self.titles]
+        self._line_scores = OrderedDict()
+        self._title_scores = {}
+
+    def _score(self, queries):
+        # Integer scores like fuzzywuzzy (round half to even), shape (len(queries), len(titles))
+        metrics.incr("fuzzy_comparisons.titles", len(queries) * len(self._normalized))
+        scores = process.cdist(queries, self._normalized, scorer=fuzz.ratio, processor=None, dtype=np.float64)
+        return np.rint(scores).astype(np.int16)
+
+    def line_scores(self, lines):
+        keys = [normalize_title(line) for line in lines]
+        missing = list(dict.fromkeys(k for k in keys if k not in self._line_scores))
+        metrics.incr("title_line_cache.hits", len(keys) - len(missing))
+        metrics.incr("title_line_cache.misses", len(missing))
+        if missing:
+            for key, row in zip(missing, self._score(missing)):
+                self._line_scores[key] = row
+            while len(self._line_scores) > LINE_CACHE_SIZE:
+                self._line_scores.popitem(last=False)
+        rows = []
+        for key in keys:
+            self._line_scores.move_to_end(key)
+            rows.append(self._line_scores[key])
+        return np.vstack(rows) if rows else np.zeros((0, len(self.titles)), dtype=np.int16)
+
+    def title_similarities(self, title):
+        # token_sort_ratio of `title` against every reference title, in reference order
+        row = self._title_scores.get(title)
+        if row is None:
+            row = self._score([normalize_title(title)])[0]
+            if len(self._title_scores) >= LINE_CACHE_SIZE:
+                self._title_scores.clear()
+            self._title_scores[title] = row
+        return row
+
+    def resolve(self, lines):
+        # Best reference title for the given lines, plus the similarity of every reference title
+        # to it. Ties go to the earliest title, as in the original nested loops; "" if nothing scores.
+        if not lines or not self.titles:
+            return "", self.title_similarities("")
+        best_per_title = self.line_scores(lines).max(axis=0)
+        best = int(np.argmax(best_per_title))
+        if best_per_title[best] <= 0:
+            return "", self.title_similarities("")
+        title = self.titles[best]
+        return title, self.title_similarities(title)
+
+_indexes = {}
+
+def get_title_index(titles):
+    key = tuple(titles)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = TitleIndex(key)
+    return index
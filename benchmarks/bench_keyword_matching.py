@@ -0,0 +1,93 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Scripts.taxonomy import get_taxonomy
+from Scripts.keyword_matcher import KeywordMatcher
+from Scripts.job_parser import extract_keywords
+
+# Benchmark of job description keyword extraction: the original one-regex-per-keyword
+# implementation against the single-pass KeywordMatcher, on a synthetic taxonomy.
+#
+#   python benchmarks/bench_keyword_matching.py --keywords 1000 10000 30000 --words 2000
+
+FILLER = ("the candidate will work with teams to deliver and support projects across the "
+          "department including planning reviews reports and daily operations").split()
+
+def regex_extract_keywords(description, skill_keywords, requirement_keywords):
+    description_lower = description.lower()
+    skill_freq = defaultdict(int)
+    requirement_freq = defaultdict(int)
+
+    for skill in skill_keywords:
+        matches = re.findall(r'\b' + re.escape(skill) + r'\b', description_lower)
+        if matches:
+            skill_freq[skill] = len(matches)
+
+    for req in requirement_keywords:
+        if req in skill_freq:
+            continue
+        matches = re.findall(r'\b' + re.escape(req) + r'\b', description_lower)
+        if matches:
+            requirement_freq[req] = len(matches)
+
+    return list(skill_freq.keys()), list(requirement_freq.keys()), skill_freq, requirement_freq
+
+def synthetic_keywords(count, rng):
+    taxonomy = get_taxonomy()
+    base = sorted(set(taxonomy.skill_keywords) | set(taxonomy.requirement_keywords))
+    words = sorted({w for k in base for w in re.findall(r"[a-z]+", k)})
+    keywords = set(base)
+    while len(keywords) < count:
+        keywords.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    keywords = sorted(keywords)[:count]
+    split = len(keywords) // 2
+    return set(keywords[:split]), set(keywords[split:])
+
+def synthetic_description(skill_keywords, requirement_keywords, word_count, rng):
+    pool = sorted(skill_keywords | requirement_keywords)
+    words = []
+    while len(words) < word_count:
+        words.extend(rng.choice(pool).split() if rng.random() < 0.2 else [rng.choice(FILLER)])
+    return " ".join(words[:word_count]).title()
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark regex vs single-pass keyword extraction.")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[300, 3000, 30000])
+    parser.add_argument("--words", type=int, default=1500, help="job description length in words")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'keywords':>9} {'regex (s)':>10} {'build (s)':>10} {'single-pass (s)':>16} {'speedup':>8}")
+    for count in args.keywords:
+        skills, requirements = synthetic_keywords(count, rng)
+        description = synthetic_description(skills, requirements, args.words, rng)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(sorted(skills | requirements))
+        build = time.perf_counter() - start
+
+        regex_time, expected = best_of(lambda: regex_extract_keywords(description, skills, requirements), args.repeat)
+        fast_time, actual = best_of(lambda: extract_keywords(description, skills, requirements, matcher), args.repeat)
+        if actual != expected:
+            raise SystemExit(f"Mismatch between implementations at {count} keywords")
+
+        print(f"{count:>9} {regex_time:>10.4f} {build:>10.4f} {fast_time:>16.4f} {regex_time / fast_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
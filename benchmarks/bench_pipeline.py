@@ -0,0 +1,276 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import platform
+import argparse
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from settings import KEYWORDS_FILE, RESUME_FOLDER, JD_FOLDER
+from Scripts.metrics import peak_rss_mb
+from generate_corpus import corpus_params, generate_corpus
+
+# Per-stage benchmark of the batch pipeline on synthetic corpora (see generate_corpus.py).
+# Every corpus size runs in a fresh interpreter inside a scratch workspace laid out like the
+# repo (input/, output/), so caches start cold and the repo's own output/ is never touched.
+#
+#   python benchmarks/bench_pipeline.py run --resumes 10 100 1000 10000 100000 --jobs 20 --out bench.json
+#   python benchmarks/bench_pipeline.py compare base.json bench.json --threshold 0.10
+#
+# run writes one JSON document: meta (commit, python, cpus), the corpus parameters and, per
+# corpus size, the seconds and item count of every stage plus peak RSS. compare matches the
+# stages of two such files (e.g. from two commits) and exits non-zero on any regression.
+
+STAGES = [
+    "import",                      # Scripts.resume_parser, job_parser and matcher
+    "resume_extraction",           # raw DOCX/PDF text extraction, no cache
+    "jd_extraction",
+    "taxonomy",                    # KEYWORDS_FILE parsed and indexed (no snapshot)
+    "resume_title",                # resolve_job_title
+    "extract_skills_from_resume",
+    "extract_keywords",
+    "process_resumes",             # full resume stage, cold text cache
+    "parse_jobs",
+    "load_resumes",
+    "load_job_skills",
+    "calculate_match",             # per resume x job pair, on up to --pairs pairs
+    "match_all_resumes",
+]
+
+# ------------ Stage Section ------------ #
+
+def _read_text(path):
+    from Scripts.extraction import read_docx, read_pdf
+    if path.endswith(".pdf"):
+        return read_pdf(path)
+    if path.endswith(".docx"):
+        return read_docx(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def run_stages(max_pairs):
+    # Runs inside the workspace (cwd); returns {stage: {"seconds", "items"}}
+    stages = {}
+
+    @contextlib.contextmanager
+    def timed(name, items):
+        start = time.perf_counter()
+        yield
+        stages[name] = {"seconds": round(time.perf_counter() - start, 6), "items": items}
+
+    with timed("import", 3):
+        from Scripts import resume_parser, job_parser, matcher
+        from Scripts.taxonomy import get_taxonomy
+
+    resume_files = [os.path.join(RESUME_FOLDER, f) for f in resume_parser.list_resume_files()]
+    jd_files = [os.path.join(JD_FOLDER, f) for f in job_parser.list_job_files()]
+
+    with timed("resume_extraction", len(resume_files)):
+        resume_texts = [_read_text(f) for f in resume_files]
+    with timed("jd_extraction", len(jd_files)):
+        jd_texts = [_read_text(f) for f in jd_files]
+
+    with timed("taxonomy", 1):
+        taxonomy = get_taxonomy()
+    with timed("resume_title", len(resume_texts)):
+        titles = [resume_parser.resolve_job_title(text, taxonomy.titles) for text in resume_texts]
+    with timed("extract_skills_from_resume", len(resume_texts)):
+        for text, (title, similarities) in zip(resume_texts, titles):
+            resume_parser.extract_skills_from_resume(text, title, taxonomy=taxonomy, similarities=similarities)
+
+    skill_keywords, requirement_keywords = job_parser.load_keywords()
+    with timed("extract_keywords", len(jd_texts)):
+        for text in jd_texts:
+            job_parser.extract_keywords(text, skill_keywords, requirement_keywords)
+
+    with timed("process_resumes", len(resume_files)):
+        resume_parser.process_resumes()
+    with timed("parse_jobs", len(jd_files)):
+        job_parser.parse_jobs()
+
+    with timed("load_resumes", len(resume_files)):
+        resumes = matcher.load_resumes()
+    with timed("load_job_skills", len(jd_files)):
+        jobs = matcher.load_job_skills()
+
+    pairs = [(skills, job_skills) for skills in resumes["skills"] for _, job_skills in jobs.values()][:max_pairs]
+    with timed("calculate_match", len(pairs)):
+        for skills, job_skills in pairs:
+            matcher.calculate_match(skills, job_skills)
+
+    with timed("match_all_resumes", len(resumes) * len(jobs)):
+        matcher.match_all_resumes()
+    return stages
+
+def stages_main(args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        stages = run_stages(args.pairs)
+    with open(args.result, 'w', encoding='utf-8') as f:
+        json.dump({"stages": stages, "peak_rss_mb": peak_rss_mb()}, f)
+
+# ------------ Run Section ------------ #
+
+def _link_files(paths, folder):
+    os.makedirs(folder, exist_ok=True)
+    for path in paths:
+        target = os.path.join(folder, os.path.basename(path))
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+
+def prepare_workspace(workspace, pool_dir, resume_paths, jd_paths):
+    shutil.rmtree(workspace, ignore_errors=True)
+    _link_files(resume_paths, os.path.join(workspace, RESUME_FOLDER))
+    _link_files(jd_paths, os.path.join(workspace, JD_FOLDER))
+    keywords = os.path.join(workspace, KEYWORDS_FILE)
+    os.makedirs(os.path.dirname(keywords), exist_ok=True)
+    shutil.copyfile(os.path.join(pool_dir, KEYWORDS_FILE), keywords)
+    os.makedirs(os.path.join(workspace, "output"), exist_ok=True)
+
+def _commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_main(args):
+    sizes = sorted(set(args.resumes))
+    params = corpus_params(max(sizes), args.jobs, args.resume_pages, args.jd_pages, args.taxonomy_size,
+                           args.pdf_share, args.seed)
+    # One pool per generation setting; smaller corpora are its first n resumes
+    pool_key = {k: v for k, v in params.items() if k not in ("resumes", "jobs")}
+    pool_dir = os.path.join(args.workdir, "pool-" + hashlib.sha1(json.dumps(pool_key, sort_keys=True).encode()).hexdigest()[:10])
+    start = time.perf_counter()
+    resume_paths, jd_paths = generate_corpus(pool_dir, params, args.gen_workers)
+    print(f"Corpus ready in {time.perf_counter() - start:.1f}s: {pool_dir}")
+
+    results = {"meta": {"commit": _commit(), "python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count(), "created": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+               "params": {**pool_key, "jobs": args.jobs, "pairs": args.pairs},
+               "runs": []}
+    workspace = os.path.join(args.workdir, "workspace")
+    result_path = os.path.join(args.workdir, "stages.json")
+    for n in sizes:
+        best = None
+        for _ in range(args.repeat):
+            prepare_workspace(workspace, pool_dir, resume_paths[:n], jd_paths)
+            subprocess.run([sys.executable, os.path.abspath(__file__), "_stages", "--pairs", str(args.pairs),
+                            "--result", os.path.abspath(result_path)], cwd=workspace, check=True,
+                           stderr=subprocess.DEVNULL if not args.verbose else None)
+            with open(result_path, encoding='utf-8') as f:
+                run = json.load(f)
+            if best is None:
+                best = run
+            else:
+                # Best of --repeat per stage
+                for name, stage in run["stages"].items():
+                    if stage["seconds"] < best["stages"][name]["seconds"]:
+                        best["stages"][name] = stage
+                best["peak_rss_mb"] = max(best["peak_rss_mb"] or 0, run["peak_rss_mb"] or 0) or None
+        results["runs"].append({"resumes": n, "jobs": len(jd_paths), **best})
+        print_run(results["runs"][-1])
+
+    shutil.rmtree(workspace, ignore_errors=True)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+    if len(sizes) > 1:
+        print_scaling(results["runs"])
+
+def print_run(run):
+    print(f"\n{run['resumes']} resumes x {run['jobs']} jobs (peak RSS {run['peak_rss_mb']} MB)")
+    for name in STAGES:
+        stage = run["stages"].get(name)
+        if stage:
+            per_item = stage["seconds"] / stage["items"] * 1000 if stage["items"] else 0.0
+            print(f"  {name:28s} {stage['seconds']:10.3f} s  {stage['items']:>10d} items  {per_item:10.4f} ms/item")
+
+def print_scaling(runs):
+    # Seconds per stage (rows) against corpus size (columns)
+    print("\nScaling (seconds)")
+    print(f"  {'resumes':28s}" + "".join(f"{run['resumes']:>11d}" for run in runs))
+    for name in STAGES:
+        print(f"  {name:28s}" + "".join(f"{run['stages'].get(name, {}).get('seconds', float('nan')):11.3f}" for run in runs))
+
+# ------------ Compare Section ------------ #
+
+def compare_main(args):
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    if base["params"] != new["params"]:
+        print(f"Warning: corpus parameters differ\n  base {base['params']}\n  new  {new['params']}")
+    print(f"base {base['meta'].get('commit')}  ->  new {new['meta'].get('commit')}")
+
+    base_runs = {(run["resumes"], run["jobs"]): run for run in base["runs"]}
+    regressions = 0
+    for run in new["runs"]:
+        base_run = base_runs.get((run["resumes"], run["jobs"]))
+        if base_run is None:
+            continue
+        print(f"\n{run['resumes']} resumes x {run['jobs']} jobs")
+        for name in STAGES:
+            if name not in run["stages"] or name not in base_run["stages"]:
+                continue
+            old_s, new_s = base_run["stages"][name]["seconds"], run["stages"][name]["seconds"]
+            ratio = new_s / old_s if old_s else float("inf")
+            flag = ""
+            if new_s > old_s * (1 + args.threshold) and new_s - old_s > args.min_seconds:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif old_s > new_s * (1 + args.threshold) and old_s - new_s > args.min_seconds:
+                flag = "  faster"
+            print(f"  {name:28s} {old_s:10.3f} s -> {new_s:10.3f} s  x{ratio:6.2f}{flag}")
+
+    if regressions:
+        print(f"\n{regressions} stage(s) slower by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on synthetic corpora.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time every stage for one or more corpus sizes")
+    run.add_argument("--resumes", type=int, nargs="+", default=[100], help="corpus sizes (one run each)")
+    run.add_argument("--jobs", type=int, default=20)
+    run.add_argument("--resume-pages", type=int, default=1)
+    run.add_argument("--jd-pages", type=int, default=2)
+    run.add_argument("--taxonomy-size", type=int, help="job titles in the keywords file (default: as shipped)")
+    run.add_argument("--pdf-share", type=float, default=0.5)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--pairs", type=int, default=20000, help="resume x job pairs timed through calculate_match")
+    run.add_argument("--repeat", type=int, default=1, help="runs per size; the best time of each stage is kept")
+    run.add_argument("--workdir", default=os.path.join(ROOT, "output", "bench"))
+    run.add_argument("--gen-workers", type=int, default=os.cpu_count() or 1)
+    run.add_argument("--out", help="write the results as JSON")
+    run.add_argument("--verbose", action="store_true", help="show the pipeline's stderr")
+
+    compare = commands.add_parser("compare", help="flag stages that got slower between two result files")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that counts as a regression")
+    compare.add_argument("--min-seconds", type=float, default=0.05, help="ignore differences smaller than this")
+
+    stages = commands.add_parser("_stages")  # internal: one timed run inside a prepared workspace
+    stages.add_argument("--pairs", type=int, required=True)
+    stages.add_argument("--result", required=True)
+
+    args = parser.parse_args()
+    {"run": run_main, "compare": compare_main, "_stages": stages_main}[args.command](args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cold-start benchmark: import time of the CLI and of the modules process-pool workers load,
+# measured with `python -X importtime` in fresh interpreters (best of --runs). Exits non-zero
+# when a module is over its budget or pulls in a dependency it should only load on use.
+#
+#   python benchmarks/bench_startup.py --runs 5 --budget-ms 1000
+
+MODULES = ["main", "Scripts.resume_parser", "Scripts.job_parser", "Scripts.matcher"]
+
+# Only imported on the code paths that need them (document extraction, local-model encoders)
+LAZY_MODULES = ["nltk", "fitz", "pymupdf", "docx", "pdfplumber", "sentence_transformers", "torch"]
+
+BUDGET_MS = 1000  # per module; also enforced by tests/test_startup.py
+
+def import_times(module):
+    # {imported module: cumulative microseconds} for one fresh `import module`
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+def check(module, runs=5, budget_ms=BUDGET_MS):
+    # (best run's import times, problems): over budget, or loading one of LAZY_MODULES on import
+    times = [import_times(module) for _ in range(runs)]
+    best = min(times, key=lambda t: t.get(module, 0))
+    problems = []
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        problems.append(f"imports {', '.join(eager)} eagerly")
+    if best[module] / 1000 > budget_ms:
+        problems.append(f"over the {budget_ms:.0f} ms budget")
+    return best, problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark module import (cold start) time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="import budget per module")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per module")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        best, problems = check(module, args.runs, args.budget_ms)
+        print(f"{module}: {best[module] / 1000:.0f} ms (best of {args.runs})")
+        for name, us in sorted(best.items(), key=lambda item: -item[1])[1:args.top + 1]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+        for problem in problems:
+            print(f"    {problem}")
+        failed = failed or bool(problems)
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
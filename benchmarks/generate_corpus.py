@@ -0,0 +1,238 @@
+import os
+import sys
+import csv
+import json
+import random
+import argparse
+import textwrap
+import zipfile
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from settings import KEYWORDS_FILE
+
+# Synthetic corpus generator for the pipeline benchmarks. Builds DOCX/PDF resumes and job
+# descriptions laid out like the samples in input/, from the titles, skills and keywords of
+# KEYWORDS_FILE (optionally grown to --taxonomy-size titles). Output is deterministic for a
+# given seed, and document i is the same whatever the count, so a large corpus contains
+# every smaller one as its first n files:
+#
+#   <out>/input/resumes/RES000001.pdf ...
+#   <out>/input/job_descriptions/JD00001.docx ...
+#   <out>/input/Other/<keywords file>
+#   <out>/corpus.json                   generation parameters
+#
+#   python benchmarks/generate_corpus.py output/bench/corpus --resumes 1000 --jobs 20 --resume-pages 2
+
+LINES_PER_PAGE = 50
+LINE_WIDTH = 95
+
+FIRST_NAMES = ["Jane", "Omar", "Claire", "Aadi", "Isabelle", "Michael", "Priya", "Liam", "Sofia", "Wei",
+               "Fatima", "Noah", "Chloe", "Mateo", "Aisha", "Ethan", "Mei", "Lucas", "Amara", "Hugo"]
+LAST_NAMES = ["Doe", "Tremblay", "Morgan", "Fraser", "Tamrakar", "Alkaderi", "Nguyen", "Singh", "Roy",
+              "Gagnon", "Chen", "Martin", "Bouchard", "Wilson", "Côté", "Patel", "Leblanc", "Campbell"]
+CITIES = [("Ottawa", "ON"), ("Toronto", "ON"), ("Montréal", "QC"), ("Gatineau", "QC"), ("Vancouver", "BC"),
+          ("Halifax", "NS"), ("Winnipeg", "MB"), ("Calgary", "AB"), ("Moncton", "NB"), ("Regina", "SK")]
+UNIVERSITIES = ["University of Ottawa", "McGill University", "University of Toronto", "Carleton University",
+                "Queen's University", "University of British Columbia", "Dalhousie University"]
+DEGREES = ["Bachelor of Science in", "Master of Science in", "Bachelor of Arts in", "Master of Public Health in",
+           "Master of Public Administration in", "Diploma in"]
+FIELDS = ["Biology", "Public Health", "Nursing", "Computer Science", "Statistics", "Policy Studies",
+          "Chemistry", "Epidemiology", "Communications", "Business Administration"]
+ORGS = ["Health Canada", "Public Health Agency of Canada", "Statistics Canada", "CIHI", "Ottawa Hospital",
+        "Ontario Ministry of Health", "Canadian Food Inspection Agency"]
+SUFFIXES = ["II", "III", "Senior", "Lead", "Regional", "Principal", "Associate", "Junior"]
+SKILL_WORDS = ["data", "risk", "policy", "clinical", "program", "field", "quality", "vendor", "budget", "grant",
+               "network", "records", "laboratory", "survey", "audit", "training", "case", "compliance"]
+SKILL_NOUNS = ["analysis", "management", "reporting", "coordination", "assessment", "planning", "review",
+               "monitoring", "design", "operations", "modelling", "governance"]
+FILLER = [
+    "Supported cross-functional teams to deliver {k} initiatives on schedule and within budget.",
+    "Prepared briefing notes and reports on {k} for senior management.",
+    "Worked with stakeholders across the department to improve {k} processes.",
+    "Reviewed documentation and provided recommendations related to {k}.",
+    "Led weekly meetings to track progress and resolve issues in {k}.",
+    "Contributed to planning, evaluation and continuous improvement of {k}.",
+]
+JD_FILLER = [
+    "The successful candidate will apply {k} to support program delivery across the branch.",
+    "You will work closely with partners and use {k} to inform decisions.",
+    "Experience with {k} is considered an asset for this position.",
+    "This role requires sound judgement and demonstrated {k}.",
+    "Responsibilities include planning, coordinating and reporting on {k}.",
+]
+
+# ------------ Taxonomy Section ------------ #
+
+def _split(cell):
+    return [part.strip() for part in cell.split(",") if part.strip()]
+
+def build_taxonomy(size, seed, source=KEYWORDS_FILE):
+    # [{Job Title, Keywords, Skills}] rows: the source rows, then synthetic titles until size
+    with open(source, mode='r', encoding='utf-8-sig') as f:
+        rows = [row for row in csv.DictReader(f) if (row.get("Job Title") or "").strip()]
+    if size is None or size <= len(rows):
+        return rows[:size] if size else rows
+
+    rng = random.Random(seed)
+    skill_pool = sorted({s for row in rows for s in _split(row["Skills"])})
+    keyword_pool = sorted({k for row in rows for k in _split(row["Keywords"])})
+    synthetic = []
+    while len(rows) + len(synthetic) < size:
+        base = rows[len(synthetic) % len(rows)]["Job Title"]
+        round_no = len(synthetic) // len(rows)
+        suffix = SUFFIXES[round_no % len(SUFFIXES)]
+        title = f"{base} {suffix}" if round_no < len(SUFFIXES) else f"{base} {suffix} {round_no // len(SUFFIXES) + 1}"
+        new_skills = [f"{rng.choice(SKILL_WORDS)} {rng.choice(SKILL_NOUNS)}".capitalize() for _ in range(3)]
+        skills = rng.sample(skill_pool, 4) + new_skills
+        keywords = rng.sample(keyword_pool, 6) + new_skills[:2]
+        synthetic.append({"Job Title": title, "Keywords": ", ".join(dict.fromkeys(keywords)),
+                          "Skills": ", ".join(dict.fromkeys(skills))})
+    return rows + synthetic
+
+def write_taxonomy(rows, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode='w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["Job Title", "Keywords", "Skills"], extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+# ------------ Document Section ------------ #
+
+def _fill(lines, rng, templates, keywords, n_lines):
+    while len(lines) < n_lines:
+        lines.append("- " + rng.choice(templates).format(k=rng.choice(keywords).lower()))
+    return lines
+
+def resume_lines(i, rows, pages, seed):
+    rng = random.Random(f"{seed}-resume-{i}")
+    row = rng.choice(rows)
+    title = row["Job Title"]
+    skills = _split(row["Skills"])
+    other = _split(rng.choice(rows)["Skills"])
+    picked = rng.sample(skills, max(1, int(len(skills) * rng.uniform(0.4, 1.0)))) + rng.sample(other, min(2, len(other)))
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, province = rng.choice(CITIES)
+    email = f"{first.lower()}.{last.lower()}{i}@email.com".replace("ô", "o").replace("é", "e")
+
+    lines = [f"{first} {last} - {title}",
+             f"{city}, {province} | {email} | ({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}",
+             "Professional Summary",
+             f"{title} with {rng.randint(2, 20)}+ years of experience in the federal public service.",
+             "Core Competencies"]
+    lines.extend(f"- {skill}" for skill in dict.fromkeys(picked))
+    lines.append("Professional Experience")
+    lines.append(f"{title} at {rng.choice(ORGS)} ({rng.choice(['Jan', 'Apr', 'Sep'])} {rng.randint(2010, 2022)} - Present)")
+    body = _fill([], rng, FILLER, skills + _split(row["Keywords"]), max(4, pages * LINES_PER_PAGE - len(lines) - 3))
+    lines.extend(body)
+    lines.append("Education")
+    lines.append(f"{rng.choice(DEGREES)} {rng.choice(FIELDS)}, {rng.choice(UNIVERSITIES)}, {city}, {province} | {rng.randint(1995, 2022)}")
+    return lines
+
+def jd_lines(i, rows, pages, seed):
+    rng = random.Random(f"{seed}-jd-{i}")
+    row = rows[i % len(rows)]
+    keywords = _split(row["Skills"]) + _split(row["Keywords"])
+    lines = [f"Job id- {i + 1}", f"Job Title- {row['Job Title']}", "Why is this role important?"]
+    return _fill(lines, rng, JD_FILLER, keywords, max(6, pages * LINES_PER_PAGE))
+
+# Smallest package python-docx reads: one paragraph per line, no styles. Writing the XML
+# directly is ~50x faster than python-docx, which loads its default template per document.
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/></Relationships>')
+DOCX_DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{}</w:body></w:document>')
+
+def write_docx(lines, path):
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        docx.writestr("_rels/.rels", DOCX_RELS)
+        docx.writestr("word/document.xml", DOCX_DOCUMENT.format(paragraphs))
+
+def write_pdf(lines, path):
+    import fitz
+    wrapped = [part for line in lines for part in (textwrap.wrap(line, LINE_WIDTH) or [""])]
+    doc = fitz.open()
+    for start in range(0, len(wrapped), LINES_PER_PAGE):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(wrapped[start:start + LINES_PER_PAGE]), fontsize=10, lineheight=1.4)
+    doc.save(path)
+    doc.close()
+
+def _document_format(kind, i, pdf_share, seed):
+    return "pdf" if random.Random(f"{seed}-{kind}-format-{i}").random() < pdf_share else "docx"
+
+def _write_document(task):
+    kind, i, rows, pages, pdf_share, seed, folder = task
+    ext = _document_format(kind, i, pdf_share, seed)
+    if kind == "resume":
+        path, lines = os.path.join(folder, f"RES{i + 1:06d}.{ext}"), resume_lines(i, rows, pages, seed)
+    else:
+        path, lines = os.path.join(folder, f"JD{i + 1:05d}.{ext}"), jd_lines(i, rows, pages, seed)
+    if not os.path.exists(path):
+        write_pdf(lines, path) if ext == "pdf" else write_docx(lines, path)
+    return path
+
+# ------------ Corpus Section ------------ #
+
+def corpus_params(resumes, jobs, resume_pages=1, jd_pages=1, taxonomy_size=None, pdf_share=0.5, seed=0):
+    return {"resumes": resumes, "jobs": jobs, "resume_pages": resume_pages, "jd_pages": jd_pages,
+            "taxonomy_size": taxonomy_size, "pdf_share": pdf_share, "seed": seed}
+
+def generate_corpus(out_dir, params, workers=1):
+    # Writes (or tops up) the corpus under out_dir; files that already exist are kept, so
+    # growing a corpus only generates the new documents
+    rows = build_taxonomy(params["taxonomy_size"], params["seed"])
+    resume_dir = os.path.join(out_dir, "input", "resumes")
+    jd_dir = os.path.join(out_dir, "input", "job_descriptions")
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(jd_dir, exist_ok=True)
+    write_taxonomy(rows, os.path.join(out_dir, KEYWORDS_FILE))
+
+    tasks = [("resume", i, rows, params["resume_pages"], params["pdf_share"], params["seed"], resume_dir)
+             for i in range(params["resumes"])]
+    tasks += [("jd", i, rows, params["jd_pages"], params["pdf_share"], params["seed"], jd_dir)
+              for i in range(params["jobs"])]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = list(pool.map(_write_document, tasks, chunksize=64))
+    else:
+        paths = [_write_document(task) for task in tasks]
+
+    with open(os.path.join(out_dir, "corpus.json"), "w", encoding="utf-8") as f:
+        json.dump(params, f, indent=2)
+    return paths[:params["resumes"]], paths[params["resumes"]:]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume / job description corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--resume-pages", type=int, default=1)
+    parser.add_argument("--jd-pages", type=int, default=1)
+    parser.add_argument("--taxonomy-size", type=int, help="job titles in the keywords file (default: as shipped)")
+    parser.add_argument("--pdf-share", type=float, default=0.5, help="fraction of documents written as PDF")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    params = corpus_params(args.resumes, args.jobs, args.resume_pages, args.jd_pages, args.taxonomy_size,
+                           args.pdf_share, args.seed)
+    resumes, jobs = generate_corpus(args.out_dir, params, args.workers)
+    print(f"Wrote {len(resumes)} resumes and {len(jobs)} job descriptions to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
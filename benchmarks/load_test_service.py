@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Scripts.taxonomy import get_taxonomy
+from Scripts.skill_similarity import SkillSimilarity
+from Scripts.match_service import MatchService, ResumeIndex, make_server
+from Scripts.match_client import MatchClient
+
+# Load test of the matching service: single-JD /match requests against a synthetic resume set
+# built from the real taxonomy, served in-process (or an already running service via --url).
+# Exits non-zero when the p95 latency is over --budget-ms.
+#
+#   python benchmarks/load_test_service.py --resumes 100000 --queries 500 --concurrency 4
+
+def synthetic_index(n_resumes, seed):
+    rng = random.Random(seed)
+    taxonomy = get_taxonomy()
+    title_skills = [skills for skills in taxonomy.title_skills.values() if skills]
+    index = ResumeIndex()
+    for i in range(n_resumes):
+        skills = rng.choice(title_skills)
+        picked = rng.sample(skills, min(len(skills), rng.randint(2, 12)))
+        index.add(f"RES{i + 1:06d}", {"name": f"Candidate {i + 1}", "email": f"c{i + 1}@example.com",
+                                      "phone": "\t(613) 555-0100", "current_job_title": ""}, picked)
+    return index
+
+def synthetic_jds(n_queries, seed):
+    rng = random.Random(seed + 1)
+    taxonomy = get_taxonomy()
+    keywords = list(taxonomy.skill_keywords) + list(taxonomy.requirement_keywords)
+    filler = "the successful candidate will support the team with".split()
+    jds = []
+    for i in range(n_queries):
+        words = [rng.choice(keywords) if rng.random() < 0.3 else rng.choice(filler) for _ in range(300)]
+        jds.append(f"Job Title: Synthetic Role {i}\n" + " ".join(words))
+    return jds
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the matching service.")
+    parser.add_argument("--resumes", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="p95 latency budget")
+    parser.add_argument("--url", help="test a running service instead of an in-process one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        client = MatchClient(args.url)
+    else:
+        start = time.perf_counter()
+        service = MatchService(synthetic_index(args.resumes, args.seed), {}, similarity=SkillSimilarity())
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = MatchClient(f"http://127.0.0.1:{server.server_port}")
+        print(f"Started service with {args.resumes} resumes in {time.perf_counter() - start:.1f}s")
+
+    jds = synthetic_jds(args.queries, args.seed)
+    for jd in jds[:min(20, len(jds))]:
+        client.match_text(jd, args.top_k)  # warm-up: first sight of each job skill scores it once
+
+    def timed(jd):
+        start = time.perf_counter()
+        client.match_text(jd, args.top_k)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = np.array(list(pool.map(timed, jds)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{len(jds)} queries, concurrency {args.concurrency}: {len(jds) / elapsed:.1f} req/s")
+    print(f"latency ms  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {latencies.max():.1f}")
+    if server is not None:
+        server.shutdown()
+    if p95 > args.budget_ms:
+        print(f"p95 {p95:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
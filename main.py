@@ -1,23 +1,121 @@
 import os
 import sys
+import argparse
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'project_root')))
 
 # Import scripts
+from settings import (MATCH_TOP_K, MATCH_MIN_SCORE, SEMANTIC_ENCODER, MATCH_RESULTS_PARQUET, MATCH_SHARD_BY,
+                      MATCH_SHARD_DIR, METRICS_ENABLED, METRICS_REPORT_FILE, METRICS_PROMETHEUS_FILE)
+from Scripts import metrics
 from Scripts.resume_parser import process_resumes
 from Scripts.job_parser import parse_jobs
-from Scripts.matcher import match_all_resumes
+from Scripts.matcher import match_all_resumes, StreamingMatcher
+from Scripts.shards import SHARD_BY, parse_shard, match_shard, merge_shards, run_shards
+
+def shard_spec(value):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parse resumes and job descriptions, then match them.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-parse new or changed files and recompute the affected match rows")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stream", action="store_true",
+                      help="parse job descriptions first, then extract, parse and match resumes concurrently "
+                           "as they are read (same output as a normal run)")
+    mode.add_argument("--shard", metavar="I/N", type=shard_spec,
+                      help=f"only match shard I of N (0 <= I < N) of the already parsed files and save it under "
+                           f"{MATCH_SHARD_DIR}; run every shard, on any machines sharing output/, then --merge-shards N")
+    mode.add_argument("--merge-shards", metavar="N", type=int,
+                      help="combine the N shard files into the match results, with the options they were matched with")
+    mode.add_argument("--shards", metavar="N", type=int,
+                      help="parse as usual, then match in N shards on --workers processes and merge them")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes used to parse resumes and job descriptions, and to match --shards (default: 1)")
+    parser.add_argument("--shard-by", choices=SHARD_BY, default=MATCH_SHARD_BY,
+                        help="split resumes or jobs into shards (default: %(default)s)")
+    parser.add_argument("--top-k", type=int, default=MATCH_TOP_K,
+                        help="keep only the K best-matching resumes per job")
+    parser.add_argument("--min-score", type=float, default=MATCH_MIN_SCORE,
+                        help="keep only matches scoring at least this percent")
+    parser.add_argument("--semantic", metavar="ENCODER", default=SEMANTIC_ENCODER,
+                        help="match skills by embedding similarity: 'hashing' or a local model directory")
+    parser.add_argument("--parquet", action="store_true", default=MATCH_RESULTS_PARQUET,
+                        help="also write the match results as a Parquet file")
+    parser.add_argument("--metrics", action="store_true", default=METRICS_ENABLED,
+                        help=f"write per-stage timings, counters and cache hit rates to {METRICS_REPORT_FILE}")
+    parser.add_argument("--prometheus", action="store_true",
+                        help=f"with --metrics, also write them as Prometheus text to {METRICS_PROMETHEUS_FILE}")
+    args = parser.parse_args()
+    if args.stream and args.incremental:
+        parser.error("--stream always rebuilds every output; it cannot be combined with --incremental")
+    if args.incremental and (args.shard or args.merge_shards or args.shards):
+        parser.error("sharded matching always recomputes every match row; it cannot be combined with --incremental")
+    for option, value in (("--merge-shards", args.merge_shards), ("--shards", args.shards)):
+        if value is not None and value < 1:
+            parser.error(f"{option} needs at least one shard")
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1; leave it out to keep every resume")
+    return args
 
 def main():
+    args = parse_args()
+    if args.metrics:
+        metrics.enable()
+
+    with metrics.stage("total"):
+        run_pipeline(args)
+
+    if args.metrics:
+        metrics.write_report(METRICS_REPORT_FILE, METRICS_PROMETHEUS_FILE if args.prometheus else None)
+        print(f"Run metrics saved to: {METRICS_REPORT_FILE}")
+
+def run_pipeline(args):
+    if args.stream:
+        run_streaming(args)
+        return
+    if args.shard:
+        print(f"\n--- Starting Resume-Job Matching (shard {args.shard[0]}/{args.shard[1]}) ---")
+        match_shard(*args.shard, by=args.shard_by, top_k=args.top_k, min_score=args.min_score, semantic=args.semantic)
+        return
+    if args.merge_shards:
+        print("\n--- Merging Resume-Job Matching Shards ---")
+        merge_shards(args.merge_shards, parquet=args.parquet)
+        return
+
     print("\n--- Starting Resume Parsing ---")
-    process_resumes()
+    changed_resume_ids = process_resumes(incremental=args.incremental, workers=args.workers)
 
     print("\n--- Starting Job Description Parsing ---")
-    parse_jobs()
+    changed_job_ids = parse_jobs(incremental=args.incremental, workers=args.workers)
 
     print("\n--- Starting Resume-Job Matching ---")
-    match_all_resumes()
+    if args.shards:
+        run_shards(args.shards, workers=args.workers, by=args.shard_by, top_k=args.top_k, min_score=args.min_score,
+                   semantic=args.semantic, parquet=args.parquet)
+    elif changed_resume_ids is None or changed_job_ids is None:
+        match_all_resumes(top_k=args.top_k, min_score=args.min_score, semantic=args.semantic,
+                          parquet=args.parquet)
+    else:
+        match_all_resumes(changed_resume_ids, changed_job_ids, top_k=args.top_k, min_score=args.min_score,
+                          semantic=args.semantic, parquet=args.parquet)
+
+    print("\n✅ All processes completed successfully.")
+
+# Resumes are scored against the parsed jobs as they arrive instead of after all of them are written
+def run_streaming(args):
+    print("\n--- Starting Job Description Parsing ---")
+    parse_jobs(workers=args.workers)
+
+    print("\n--- Starting Resume Parsing and Matching ---")
+    with metrics.stage("streaming"), StreamingMatcher(top_k=args.top_k, min_score=args.min_score,
+                                                      semantic=args.semantic, parquet=args.parquet) as matcher:
+        process_resumes(workers=args.workers, on_parsed=matcher.add)
 
     print("\n✅ All processes completed successfully.")
 
@@ -2,16 +2,95 @@
 # Input paths
 RESUME_FOLDER = "input/resumes/"
 JD_FOLDER = "input/job_descriptions/"
-KEYWORDS_FILE = "input/other/Health_Canada_Jobs_With_Skills_1.csv"
+KEYWORDS_FILE = "input/Other/Health_Canada_Jobs_With_Skills_1.csv"
 
 # Output paths
 PARSED_RESUMES_FILE = "output/parsed_resumes.csv"
 PARSED_JD_FILE = "output/parsed_job_skills.csv"
 MATCH_RESULTS_FILE = "output/resume_match_results.csv"
+PARSED_RESUMES_STORE = "output/parsed_resumes.arrow"  # columnar copies read by the matcher
+PARSED_JD_STORE = "output/parsed_job_skills.arrow"
+MATCH_RESULTS_PARQUET_FILE = "output/resume_match_results.parquet"
+MANIFEST_FILE = "output/manifest.json"
+
+# Resume skill search: None searches the whole text. A tuple of section names from
+# Scripts/resume_sections.py, e.g. ("header", "summary", "skills", "experience"), searches only
+# those sections of resumes with recognizable headings, so a long work history costs nothing extra.
+RESUME_SKILL_SECTIONS = None
+
+# PDF extraction (Scripts/extraction.py): PyMuPDF text is replaced by pdfplumber's only when it
+# has fewer than PDF_MIN_CHARS_PER_PAGE characters per page or too many unreadable characters
+PDF_MIN_CHARS_PER_PAGE = 20
+PDF_MAX_BAD_CHAR_RATIO = 0.05
+
+# Fault-isolated extraction (Scripts/isolation.py): documents missing from the text cache are
+# extracted in a separate process, killed after EXTRACT_TIMEOUT_SECONDS or when it needs more than
+# EXTRACT_MEMORY_MB (the memory cap is not enforced on Windows). PDFs over EXTRACT_MAX_PAGES pages
+# and documents whose extraction failed are retried with a cheaper extractor (PyMuPDF on the first
+# EXTRACT_RETRY_PAGES pages; the raw XML text for DOCX). A file whose every extractor failed in
+# QUARANTINE_AFTER_FAILURES runs is listed in QUARANTINE_FILE and skipped until its contents change.
+EXTRACT_ISOLATION = True  # False extracts in-process: page cap, retry and quarantine still apply
+EXTRACT_SANDBOXES = 4  # sandbox processes shared by the threads of one process
+EXTRACT_TIMEOUT_SECONDS = 60
+EXTRACT_MEMORY_MB = 2048
+EXTRACT_MAX_PAGES = 200
+EXTRACT_RETRY_PAGES = 10
+QUARANTINE_AFTER_FAILURES = 2
+QUARANTINE_FILE = "output/quarantine.jsonl"
+
+# Matching: keep only the best MATCH_TOP_K resumes per job and/or those scoring at least
+# MATCH_MIN_SCORE percent; None for both writes every resume x job pair
+MATCH_TOP_K = None
+MATCH_MIN_SCORE = None
+MATCH_RESULTS_PARQUET = False  # also write MATCH_RESULTS_PARQUET_FILE
+RESULT_CHUNK_ROWS = 50000  # match rows buffered in memory before each write
+
+# Streaming pipeline (main.py --stream): resume text is extracted on STREAM_EXTRACT_THREADS threads,
+# at most STREAM_QUEUE_SIZE documents wait between stages, and parsed resumes are scored against
+# every job in batches of STREAM_BATCH_SIZE
+STREAM_EXTRACT_THREADS = 4
+STREAM_QUEUE_SIZE = 64
+STREAM_BATCH_SIZE = 256
+
+# Sharded matching (main.py --shard i/N, --merge-shards N, --shards N): shards split "resumes" or
+# "jobs" by a hash of their ID; partial results are kept in MATCH_SHARD_DIR until merged
+MATCH_SHARD_BY = "resumes"
+MATCH_SHARD_DIR = "output/shards/"
+
+# Semantic matching: None keeps fuzzy matching; "hashing" uses the built-in offline encoder,
+# any other value is a local sentence-transformers model directory
+SEMANTIC_ENCODER = None
+SEMANTIC_THRESHOLD = 80  # cosine similarity * 100 at which two skills count as the same
+SEMANTIC_MIN_SCORE = 50  # pairs scoring below this are not stored
+SEMANTIC_BATCH_SIZE = 256
+HASHING_ENCODER_DIM = 512
+
+# Matching service (Scripts/match_service.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_TOP_K = 10
+
+# Run metrics (Scripts/metrics.py): off unless enabled here or with main.py --metrics
+METRICS_ENABLED = False
+METRICS_REPORT_FILE = "output/metrics/run_report.json"
+METRICS_PROMETHEUS_FILE = "output/metrics/run_report.prom"  # written with main.py --prometheus
+METRICS_SLOWEST_DOCUMENTS = 20  # slowest extractions listed in the report
 
 # Logging
 LOG_FILE = "output/logs/errors.log"
 
 # Aliases for backward compatibility
 RESUME_FILE = PARSED_RESUMES_FILE
-JOB_SKILL_FILE = PARSED_JD_FILE
\ No newline at end of file
+JOB_SKILL_FILE = PARSED_JD_FILE
+
+# Caching
+CACHE_DIR = "output/cache/"
+TEXT_CACHE_DIR = "output/cache/text/"
+TEXT_CACHE_ENABLED = True
+TEXT_CACHE_MAX_BYTES = 2 * 1024 ** 3  # evict least recently used entries past 2 GB
+PARSED_UPLOAD_CACHE_SIZE = 5000  # parsed app uploads kept in memory, by content hash
+TAXONOMY_SNAPSHOT_FILE = "output/cache/taxonomy.pkl"
+SKILL_SIMILARITY_FILE = "output/cache/skill_similarity.npz"
+SKILL_SIMILARITY_MIN_SCORE = 70  # pairs scoring below this are not stored; lower thresholds are scored directly
+EMBEDDING_CACHE_DIR = "output/cache/embeddings/"
+EMBEDDING_DTYPE = "float16"  # on-disk precision of cached skill/title embeddings
@@ -0,0 +1,19 @@
+import os
+import sys
+
+# Tests import the project the way main.py does, from the repository root
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+def input_texts(folder):
+    # Extracted text of every document in input/<folder>, for comparing against reference implementations
+    from Scripts.extraction import read_docx, read_pdf
+    directory = os.path.join(ROOT, "input", folder)
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.lower().endswith(".pdf"):
+            texts.append(read_pdf(path))
+        elif name.lower().endswith(".docx"):
+            texts.append(read_docx(path))
+    return texts
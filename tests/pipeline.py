@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import pandas as pd
+
+from conftest import ROOT
+
+OUTPUTS = ["parsed_resumes.csv", "parsed_job_skills.csv", "resume_match_results.csv"]
+
+def make_tree(path):
+    # A copy of the project and its inputs with an empty output directory, so runs share no caches
+    path.mkdir(parents=True, exist_ok=True)
+    for name in ["main.py", "settings.py", "utils.py"]:
+        shutil.copy(os.path.join(ROOT, name), path)
+    ignore = shutil.ignore_patterns("__pycache__")
+    shutil.copytree(os.path.join(ROOT, "Scripts"), path / "Scripts", ignore=ignore)
+    shutil.copytree(os.path.join(ROOT, "input"), path / "input", ignore=ignore)
+    return path
+
+def run_main(tree, *args):
+    # stdout of `python main.py args` in tree; fixed hash seed so set-ordered columns are comparable
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    result = subprocess.run([sys.executable, "main.py", *args], cwd=tree, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+def read_outputs(tree):
+    return {name: (tree / "output" / name).read_bytes() for name in OUTPUTS}
+
+def resume_ids(tree):
+    # {resume file name: resume ID} recorded by the last run
+    manifest = json.loads((tree / "output" / "manifest.json").read_text(encoding="utf-8"))
+    return {name: entry["id"] for name, entry in manifest["resumes"].items()}
+
+def read_rows_by_file(tree):
+    # Output rows with resume IDs replaced by file names, sorted: runs that number the same
+    # resumes differently (incremental runs keep the IDs of unchanged files) compare equal
+    files = {resume_id: name for name, resume_id in resume_ids(tree).items()}
+    rows = {}
+    for name in OUTPUTS:
+        df = pd.read_csv(tree / "output" / name, dtype=str, keep_default_na=False)
+        if "resume_id" in df:
+            df["resume_id"] = df["resume_id"].map(files)
+        rows[name] = sorted(df.itertuples(index=False, name=None))
+    return rows
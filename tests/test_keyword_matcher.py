@@ -0,0 +1,81 @@
+import os
+import re
+from collections import defaultdict
+
+import pytest
+
+from conftest import ROOT, input_texts
+from settings import KEYWORDS_FILE
+from Scripts.taxonomy import get_taxonomy
+from Scripts.keyword_matcher import KeywordMatcher
+from Scripts.job_parser import extract_keywords
+
+# Keywords whose edges are not word characters, or that overlap themselves or each other
+TRICKY = ["c++", "c#", ".net", "c", "aa", "a a", "data", "data analysis", "analysis", "r&d",
+          "snake_case", "_", "café", "naïve bayes", "ms-excel", "excel", "-", "sql server", "sql"]
+
+SYNTHETIC = [
+    "c++ and c# and .net; c/c++ c++11 (c#) .net.net",
+    "aaaa aa a a a aa_aa aa-aa",
+    "data analysis, data-analysis, data_analysis, big data analysis analysis",
+    "r&d and r & d; snake_case snake_case_ _ __ ms-excel excel-ms excel",
+    "Café café naïve bayes naïve bayesian sql server sqlserver sql",
+    "",
+]
+
+def regex_count(keyword, text):
+    return len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+
+def regex_extract_keywords(description, skill_keywords, requirement_keywords):
+    # The original one-regex-per-keyword implementation
+    description_lower = description.lower()
+    skill_freq = defaultdict(int)
+    requirement_freq = defaultdict(int)
+
+    for skill in skill_keywords:
+        matches = re.findall(r'\b' + re.escape(skill) + r'\b', description_lower)
+        if matches:
+            skill_freq[skill] = len(matches)
+
+    for req in requirement_keywords:
+        if req in skill_freq:
+            continue
+        matches = re.findall(r'\b' + re.escape(req) + r'\b', description_lower)
+        if matches:
+            requirement_freq[req] = len(matches)
+
+    return list(skill_freq.keys()), list(requirement_freq.keys()), skill_freq, requirement_freq
+
+@pytest.fixture(scope="module")
+def taxonomy(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "taxonomy.pkl"
+    return get_taxonomy(os.path.join(ROOT, KEYWORDS_FILE), str(snapshot))
+
+@pytest.fixture(scope="module")
+def descriptions():
+    return [text.lower() for text in input_texts("job_descriptions")] + SYNTHETIC
+
+def test_counts_match_regex_findall(taxonomy, descriptions):
+    matcher = taxonomy.keyword_matcher
+    for text in descriptions:
+        expected = {k: n for k in matcher.keywords if (n := regex_count(k, text))}
+        assert matcher.count(text) == expected
+
+def test_tricky_keywords_match_regex_findall(descriptions):
+    matcher = KeywordMatcher(TRICKY)
+    for text in descriptions:
+        expected = {k: n for k in TRICKY if (n := regex_count(k, text))}
+        assert matcher.count(text) == expected
+
+def test_present_matches_substring_search(descriptions):
+    matcher = KeywordMatcher(TRICKY)
+    for text in descriptions:
+        assert matcher.present(text) == {k for k in TRICKY if k in text}
+
+def test_extract_keywords_matches_regex_version(taxonomy, descriptions):
+    skills, requirements = taxonomy.skill_keywords, taxonomy.requirement_keywords
+    for text in descriptions + [text.upper() for text in descriptions]:
+        expected = regex_extract_keywords(text, skills, requirements)
+        assert extract_keywords(text, skills, requirements) == expected
+        assert extract_keywords(text, skills, requirements, matcher=taxonomy.keyword_matcher) == expected
+        assert extract_keywords(text, TRICKY[:10], TRICKY[5:]) == regex_extract_keywords(text, TRICKY[:10], TRICKY[5:])
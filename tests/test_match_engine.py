@@ -0,0 +1,66 @@
+import os
+import random
+
+import pytest
+from rapidfuzz import fuzz
+
+from conftest import ROOT
+from settings import KEYWORDS_FILE
+from Scripts.taxonomy import get_taxonomy
+from Scripts.skill_similarity import SkillSimilarity
+from Scripts.match_engine import MatchEngine, JOB_BLOCK_SIZE
+
+def calculate_match(resume_skills, job_skills_with_weights, threshold=85):
+    # The original per-pair scoring loop
+    matched = {}
+    missing = {}
+    for job_skill, weight in job_skills_with_weights.items():
+        is_matched = any(fuzz.partial_ratio(job_skill, res_skill) >= threshold for res_skill in resume_skills)
+        (matched if is_matched else missing)[job_skill] = weight
+    total_weight = sum(job_skills_with_weights.values())
+    matched_weight = sum(matched.values())
+    match_score = round((matched_weight / total_weight) * 100, 1) if total_weight else 0.0
+    return match_score, list(matched.keys()), list(missing.keys())
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "taxonomy.pkl"
+    taxonomy = get_taxonomy(os.path.join(ROOT, KEYWORDS_FILE), str(snapshot))
+    rng = random.Random(0)
+    title_skills = [list(skills) for skills in taxonomy.title_skills.values() if skills]
+    vocab = sorted({s for skills in title_skills for s in skills})
+
+    resumes = [[], ["sql"], ["sql", "sql"]]
+    for _ in range(60):
+        skills = rng.sample(vocab, rng.randint(1, 15))
+        resumes.append(skills + [f"{s} reporting" for s in rng.sample(vocab, 2)] + [s[:-1] for s in rng.sample(vocab, 2)])
+
+    # Frequencies as job parsing counts them, plus weights that land on ...5 rounding boundaries
+    jobs = {"empty": ("Empty", {})}
+    for i in range(JOB_BLOCK_SIZE + 10):
+        skills = rng.choice(title_skills)
+        weights = rng.choice([lambda: 1, lambda: rng.randint(1, 9), lambda: rng.choice([1, 3, 5, 7])])
+        jobs[f"job-{i}"] = (f"Job {i}", {s: weights() for s in skills})
+    jobs["eighths"] = ("Eighths", {s: 1 for s in vocab[:8]})
+    jobs["sixteenths"] = ("Sixteenths", {s: 1 for s in vocab[8:24]})
+    return resumes, jobs
+
+@pytest.mark.parametrize("threshold", [85, 70])
+def test_rows_equal_calculate_match(corpus, threshold):
+    resumes, jobs = corpus
+    engine = MatchEngine(resumes, jobs, SkillSimilarity(), threshold=threshold)
+    for job_idx, (_, skills) in enumerate(jobs.values()):
+        rows = list(engine.iter_job_rows(job_idx))
+        expected = [calculate_match(resume, skills, threshold) for resume in resumes]
+        assert [(score, matched, missing) for _, score, matched, missing in rows] == expected
+        assert engine.job_scores(job_idx).tolist() == [score for score, _, _ in expected]
+
+def test_top_rows_equal_sorted_calculate_match(corpus):
+    resumes, jobs = corpus
+    engine = MatchEngine(resumes, jobs, SkillSimilarity())
+    for job_idx, (_, skills) in enumerate(jobs.values()):
+        expected = [(r, *calculate_match(resume, skills)) for r, resume in enumerate(resumes)]
+        expected.sort(key=lambda row: -row[1])
+        assert list(engine.iter_top_rows(job_idx)) == expected
+        assert list(engine.iter_top_rows(job_idx, top_k=5)) == expected[:5]
+        assert list(engine.iter_top_rows(job_idx, min_score=50)) == [row for row in expected if row[1] >= 50]
@@ -0,0 +1,65 @@
+import threading
+import pytest
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+from Scripts.skill_similarity import SkillSimilarity
+from Scripts.match_service import MatchService, ResumeIndex, make_server
+from Scripts.match_client import MatchClient, MatchServiceError
+
+SKILLS = ["sql", "python", "excel", "power bi", "tableau", "communication", "reporting", "data analysis"]
+JOB = {"sql": 2, "python": 1, "reporting": 1, "data analysis": 3}
+
+def make_service(n=40):
+    index = ResumeIndex()
+    for i in range(n):
+        index.add(f"RES{i + 1:04d}", {"name": f"Candidate {i + 1}"}, SKILLS[i % 5:i % 5 + 1 + i % 4])
+    return MatchService(index, {"JOB101": ("Data Analyst", JOB)}, similarity=SkillSimilarity())
+
+@pytest.fixture
+def client():
+    server = make_server(make_service(), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield MatchClient(f"http://127.0.0.1:{server.server_port}")
+    server.shutdown()
+    server.server_close()
+
+def status(call, *args, **kwargs):
+    try:
+        call(*args, **kwargs)
+    except MatchServiceError as e:
+        return e.status
+    return 200
+
+def test_status_codes(client):
+    assert status(client.match_job, "JOB101") == 200
+    assert status(client.match_job, "JOB999") == 404
+    assert status(client._request, "DELETE", "/resumes/RES9999") == 404
+    assert status(client._request, "POST", "/match", {"file": "c3Fs"}) == 400  # no filename
+    assert status(client._request, "POST", "/resumes", {"file": "c3Fs"}) == 400
+    assert status(client._request, "POST", "/match", ["sql"]) == 400
+    assert status(client.match_job, "JOB101", top_k=0) == 400
+    assert status(client.match_text, "Data analysis with SQL", top_k=0) == 400
+    assert len(client.match_text("Data analysis with SQL", top_k=None)["results"]) == 40
+
+def test_concurrent_queries_and_updates_match_serial_ranking():
+    service, serial = make_service(), make_service()
+    adds = [(f"NEW{i}", SKILLS[i % len(SKILLS):] or ["sql"]) for i in range(20)]
+
+    def update(i):
+        resume_id, skills = adds[i]
+        service.add_resume(resume_id, skills)
+        service.remove_resume(f"RES{i + 1:04d}")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        queries = [pool.submit(service.rank, JOB, 5) for _ in range(40)]
+        list(pool.map(update, range(len(adds))))
+        assert all(len(q.result()) == 5 for q in queries)
+
+    for i in range(len(adds)):
+        resume_id, skills = adds[i]
+        serial.add_resume(resume_id, skills)
+        serial.remove_resume(f"RES{i + 1:04d}")
+    # Same rows; ties may be in another order, since the updates ran in another order
+    by_id = itemgetter("resume_id")
+    assert sorted(service.rank(JOB, None), key=by_id) == sorted(serial.rank(JOB, None), key=by_id)
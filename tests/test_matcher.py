@@ -0,0 +1,8 @@
+from Scripts import matcher
+
+def test_previous_results_without_rows_or_header(tmp_path, monkeypatch):
+    # What a run that matched nothing wrote before ResultWriter always wrote the header
+    path = tmp_path / "results.csv"
+    path.write_text("\n", encoding="utf-8")
+    monkeypatch.setattr(matcher, "MATCH_RESULTS_FILE", str(path))
+    assert matcher.load_previous_results(["RES0001"], ["JOB101"], [], []) is None
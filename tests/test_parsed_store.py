@@ -0,0 +1,16 @@
+import pandas as pd
+
+from Scripts.parsed_store import jobs_from_frame, save_job_store_from_csv, load_job_table
+
+def test_blank_job_title_round_trips(tmp_path):
+    # A JD whose title line is blank ("Position Title:    ") is written with an empty job_title
+    source = tmp_path / "parsed_job_skills.csv"
+    store = tmp_path / "parsed_job_skills.arrow"
+    pd.DataFrame({"job_id": ["JOB101", "JOB101", "JOB102"], "job_title": ["", "", "Data Analyst"],
+                  "skill": ["sql", "excel", "python"], "weight": [2, 1, 1],
+                  "timestamp": ["2025-06-01"] * 3}).to_csv(source, index=False)
+
+    save_job_store_from_csv(str(store), str(source))
+    jobs = load_job_table(path=str(store), source=str(source))
+    assert jobs == {"JOB101": ("", {"sql": 2.0, "excel": 1.0}), "JOB102": ("Data Analyst", {"python": 1.0})}
+    assert jobs == jobs_from_frame(pd.read_csv(source))  # the CSV fallback reads it the same way
@@ -0,0 +1,77 @@
+import sys
+import shutil
+import subprocess
+import pytest
+
+from conftest import ROOT
+from pipeline import make_tree, run_main, read_outputs, read_rows_by_file, resume_ids
+
+# Every way of running the pipeline writes the same bytes as a plain full run with the same options
+MODES = [
+    ([], ["--workers", "2"]),
+    (["--top-k", "3"], ["--top-k", "3", "--workers", "2"]),
+    ([], ["--stream"]),
+    (["--top-k", "3"], ["--top-k", "3", "--stream"]),
+    ([], ["--shards", "2"]),
+    ([], ["--shards", "2", "--shard-by", "jobs"]),
+    (["--top-k", "3"], ["--top-k", "3", "--shards", "2"]),
+]
+
+@pytest.fixture(scope="module")
+def full_run(tmp_path_factory):
+    runs = {}
+    def outputs(*args):
+        if args not in runs:
+            tree = make_tree(tmp_path_factory.mktemp("full"))
+            run_main(tree, *args)
+            runs[args] = read_outputs(tree)
+        return runs[args]
+    return outputs
+
+@pytest.mark.parametrize("base_args, args", MODES, ids=[" ".join(args) for _, args in MODES])
+def test_modes_match_full_run(tmp_path, full_run, base_args, args):
+    tree = make_tree(tmp_path)
+    run_main(tree, *args)
+    assert read_outputs(tree) == full_run(*base_args)
+
+def edit_inputs(tree):
+    # One removed, one added and one rewritten resume, and one removed job description
+    resumes = tree / "input" / "resumes"
+    (resumes / "Biologist_Resume.pdf").unlink()
+    shutil.copy(resumes / "Medical_Officer_Resume.pdf", resumes / "Medical_Officer_Resume_2.pdf")
+    shutil.copy(resumes / "Data Analyst_Resume.docx", resumes / "Financial Analyst.docx")
+    (tree / "input" / "job_descriptions" / "Job title-101_Data Analyst.docx").unlink()
+
+# (options of the first run, options of the incremental run after the inputs change)
+INCREMENTAL = [([], []), (["--top-k", "3"], ["--top-k", "3"]), ([], ["--top-k", "3"]), (["--top-k", "3"], [])]
+
+@pytest.mark.parametrize("first_args, args", INCREMENTAL,
+                         ids=["all", "top-k", "all then top-k", "top-k then all"])
+def test_incremental_matches_full_rebuild(tmp_path, first_args, args):
+    tree = make_tree(tmp_path / "incremental")
+    run_main(tree, "--incremental", *first_args)
+    before = resume_ids(tree)
+    edit_inputs(tree)
+    run_main(tree, "--incremental", *args)
+
+    rebuilt = make_tree(tmp_path / "rebuilt")
+    edit_inputs(rebuilt)
+    run_main(rebuilt, *args)
+    assert read_rows_by_file(tree) == read_rows_by_file(rebuilt)
+    after = resume_ids(tree)
+    assert all(after[name] == before[name] for name in after if name in before)
+
+def test_incremental_after_removing_every_job(tmp_path):
+    # The run without job descriptions writes no match rows; the one after it must still start
+    tree = make_tree(tmp_path)
+    run_main(tree, "--incremental")
+    for path in (tree / "input" / "job_descriptions").iterdir():
+        path.unlink()
+    run_main(tree, "--incremental")
+    run_main(tree, "--incremental")
+    assert read_rows_by_file(tree)["resume_match_results.csv"] == []
+
+@pytest.mark.parametrize("top_k", ["0", "-1"])
+def test_top_k_below_one_is_rejected(top_k):
+    result = subprocess.run([sys.executable, "main.py", "--top-k", top_k], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "--top-k must be at least 1" in result.stderr
@@ -0,0 +1,25 @@
+import json
+
+from pipeline import make_tree, run_main
+
+BROKEN = "input/resumes/Broken_Resume.docx"
+
+def test_file_is_quarantined_after_two_failed_runs(tmp_path):
+    tree = make_tree(tmp_path)
+    (tree / BROKEN).write_bytes(b"not a zip archive")
+    quarantine = tree / "output" / "quarantine.jsonl"
+
+    # Both extractor tiers fail on each of the first two runs; each run appends one line
+    assert f"Could not extract {BROKEN} (failed 1 time(s))" in run_main(tree)
+    assert f"Could not extract {BROKEN} (quarantined)" in run_main(tree)
+    events = [json.loads(line) for line in quarantine.read_text(encoding="utf-8").splitlines()]
+    assert [event["file"] for event in events] == [BROKEN] * 2
+    assert events[0]["hash"] == events[1]["hash"] and len(events[0]["errors"]) == 2
+
+    # Later runs skip it without trying to extract it again
+    assert f"{BROKEN} is quarantined after 2 failed extractions" in run_main(tree)
+    assert len(quarantine.read_text(encoding="utf-8").splitlines()) == 2
+
+    # New contents are a new document
+    (tree / BROKEN).write_bytes(b"still not a zip archive")
+    assert f"Could not extract {BROKEN} (failed 1 time(s))" in run_main(tree)
@@ -0,0 +1,22 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+from Scripts.result_writer import ResultWriter, RESULT_COLUMNS
+
+def test_zero_rows_still_write_the_header(tmp_path):
+    path, parquet_path = tmp_path / "results.csv", tmp_path / "results.parquet"
+    with ResultWriter(str(path), str(parquet_path)):
+        pass
+    assert path.read_text(encoding="utf-8") == ",".join(RESULT_COLUMNS) + "\n"
+    assert list(pd.read_csv(path).columns) == RESULT_COLUMNS
+    assert pq.read_table(parquet_path).num_rows == 0
+
+def test_rows_written_in_chunks_match_one_write(tmp_path):
+    rows = [{"resume_id": f"RES{i:04d}", "name": "A", "email": "", "phone": "", "current_job_title": "Analyst",
+             "job_id": "JOB101", "target_job_title": "Data Analyst", "match_percent": 50.0,
+             "matched_skills": ["sql"], "missing_skills": ["python", "excel"]} for i in range(7)]
+    with ResultWriter(str(tmp_path / "chunked.csv"), chunk_rows=3) as writer:
+        writer.write_rows(rows)
+    expected = pd.DataFrame([{**row, "matched_skills": "sql", "missing_skills": "python, excel"} for row in rows])
+    expected.to_csv(tmp_path / "expected.csv", index=False)
+    assert (tmp_path / "chunked.csv").read_bytes() == (tmp_path / "expected.csv").read_bytes()
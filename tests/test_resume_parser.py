@@ -0,0 +1,149 @@
+import os
+import re
+import random
+
+import pytest
+
+from conftest import ROOT, input_texts
+from settings import KEYWORDS_FILE
+from Scripts import resume_parser
+from Scripts.taxonomy import get_taxonomy
+from Scripts.title_index import get_title_index
+
+# The text-based extractors the segmented ones replaced, as they were
+
+def reference_name(text):
+    for line in text.splitlines()[:10]:
+        line = line.strip()
+        if not line or any(char in line for char in "@/|•") or re.search(r'\d', line):
+            continue
+        if re.search(r"(analyst|engineer|manager|consultant|developer|nurse|student)", line.lower()):
+            continue
+        words = line.split()
+        if len(words) >= 2 and all(word[0].isupper() for word in words if word.isalpha()):
+            return line
+    return ""
+
+def reference_email(text):
+    match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+    return match.group(0) if match else ""
+
+def reference_phone(text):
+    match = re.search(r"(\+?\d{1,2}[\s\-\.])?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}", text)
+    return match.group(0) if match else ""
+
+def reference_education(text):
+    lines = text.splitlines()
+    capture = False
+    edu_lines = []
+    edu_block = ""
+    for line in lines:
+        if "education" in line.lower():
+            capture = True
+            continue
+        if capture:
+            line = line.strip()
+            if not line or re.match(r"^[A-Z\s]{5,}$", line): break
+            edu_lines.append(line)
+            edu_block += " " + line
+            if len(edu_lines) >= 3: break
+
+    match = re.search(r"(Bachelor|Master|PhD|Doctor|Diploma|Certificate)[^0-9\n]*(?:in)?[^0-9\n]*?\b(?:19|20)\d{2}\b", edu_block, re.IGNORECASE)
+    if match:
+        entry = match.group().strip()
+        year = re.search(r"\b(19|20)\d{2}\b", entry)
+        year = int(year.group()) if year else None
+        parts = entry.split(str(year)) if year else [entry]
+        course = parts[0].strip()
+        institution = parts[1].strip() if len(parts) > 1 else ""
+    else:
+        if len(edu_lines) < 2: return []
+        course, institution = edu_lines[0], edu_lines[1]
+        year_line = edu_lines[2] if len(edu_lines) > 2 else ""
+        year = re.search(r"\b(19|20)\d{2}\b", year_line or institution)
+        year = int(year.group()) if year else None
+
+    level_map = {
+        "bachelor": "Bachelor's", "master": "Master's",
+        "phd": "PhD", "doctor": "PhD",
+        "diploma": "Diploma", "certificate": "Certificate"
+    }
+    degree_level = next((v for k, v in level_map.items() if k in course.lower()), "N/A")
+
+    return [{
+        "level": degree_level,
+        "course": course.strip(),
+        "institution": institution.strip(),
+        "year": year
+    }]
+
+def reference_header_lines(text):
+    return [line.strip() for line in text.splitlines()[:10] if line.strip()]
+
+def reference_skills(resume_text, similarities, taxonomy):
+    resume_text = resume_text.lower()
+    matched_skills = []
+    fallback_skills = []
+    for skills, similarity in zip(taxonomy.title_skills.values(), similarities):
+        found = [sk for sk in skills if sk in resume_text]
+        if similarity >= 70:
+            matched_skills.extend(found)
+        elif not matched_skills:
+            fallback_skills.extend(found)
+    return list(dict.fromkeys(matched_skills)) if matched_skills else list(dict.fromkeys(fallback_skills))
+
+SYNTHETIC = [
+    "",
+    "\n\n\n",
+    "Jane Doe",
+    "jane doe\nJANE DOE\nJane Doe-Smith\njane@example.com | 613-555-0101",
+    "Senior Data Analyst\nJohn Q. Public\nEDUCATION\nEDUCATION\nBachelor of Science in Biology\nUniversity of Ottawa 2015",
+    "Alex Martin\nEducation and Training\nCollege Diploma\nAlgonquin College\nGraduated 2019\nMore",
+    "Alex Martin\nSKILLS\nPython, SQL\neducation\nMaster of Public Health, 2020, McGill\n\nCERTIFICATIONS",
+    "Alex Martin\nEducation\nPROFESSIONAL EXPERIENCE\nBachelor 2010",
+    "Alex Martin\nContinuing education: Certificate in Project Management 2021\nEducation\nPhD Chemistry\nUBC\n",
+    "Chris Lee Education Bachelor of Commerce 2012\x0cCarleton University\x0bOttawa",
+    "Chris Lee\rEducation\rMaster of Data Science\rUniversity of Waterloo\r2018",
+    "İlker Öztürk\nEDUCATİON\nBachelor of Arts 2001\nCafé Université",
+]
+
+def variants(text, rng):
+    lines = text.splitlines()
+    shuffled = lines[:]
+    rng.shuffle(shuffled)
+    yield text
+    yield text.replace("\n", "\r\n")
+    yield "\n".join(shuffled)
+    yield "\n".join(lines[:12])
+    yield text + "\n" + text
+    yield "\n\n" + text.upper()
+
+@pytest.fixture(scope="module")
+def taxonomy(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "taxonomy.pkl"
+    return get_taxonomy(os.path.join(ROOT, KEYWORDS_FILE), str(snapshot))
+
+@pytest.fixture(scope="module")
+def resumes():
+    rng = random.Random(0)
+    return [variant for text in input_texts("resumes") + SYNTHETIC for variant in variants(text, rng)]
+
+def test_fields_match_text_based_extractors(resumes):
+    for text in resumes:
+        resume = resume_parser.segment_resume(text)
+        for source in (text, resume):
+            assert resume_parser.extract_name(source) == reference_name(text)
+            assert resume_parser.extract_email(source) == reference_email(text)
+            assert resume_parser.extract_phone(source) == reference_phone(text)
+            assert resume_parser.extract_education(source) == reference_education(text)
+            assert resume_parser._header_lines(source) == reference_header_lines(text)
+
+def test_skills_match_whole_text_search(resumes, taxonomy, monkeypatch):
+    monkeypatch.setattr(resume_parser, "RESUME_SKILL_SECTIONS", None)
+    index = get_title_index(taxonomy.titles)
+    for text in resumes:
+        job_title, similarities = resume_parser.resolve_job_title(text, taxonomy.titles)
+        expected_title, expected_similarities = index.resolve(reference_header_lines(text))
+        assert (job_title, list(similarities)) == (expected_title, list(expected_similarities))
+        skills = resume_parser.extract_skills_from_resume(text, job_title, taxonomy=taxonomy, similarities=similarities)
+        assert skills == reference_skills(text, similarities, taxonomy)
@@ -0,0 +1,59 @@
+import os
+import random
+
+import pytest
+from rapidfuzz import fuzz
+
+from conftest import ROOT
+from settings import KEYWORDS_FILE
+from Scripts.taxonomy import get_taxonomy
+from Scripts.skill_similarity import SkillSimilarity
+
+THRESHOLDS = [70, 85, 100]
+
+@pytest.fixture(scope="module")
+def skills(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "taxonomy.pkl"
+    taxonomy = get_taxonomy(os.path.join(ROOT, KEYWORDS_FILE), str(snapshot))
+    job_skills = sorted({s for title_skills in taxonomy.title_skills.values() for s in title_skills})
+    rng = random.Random(0)
+    # Resume skills as parsing produces them: taxonomy skills, near misses and longer phrases around them
+    resume_skills = rng.sample(job_skills, 150)
+    resume_skills += [s[:-1] for s in rng.sample(job_skills, 40)]
+    resume_skills += [s.upper() for s in rng.sample(job_skills, 20)]
+    resume_skills += [f"advanced {s} skills" for s in rng.sample(job_skills, 40)]
+    resume_skills += ["", "c", "r", "sql", "ms excel", "power bi", "data analysis", "café"]
+    return job_skills, list(dict.fromkeys(resume_skills))
+
+def expected_matches(job_skill, resume_skills, threshold):
+    # The original per-pair check from calculate_match
+    return {r for r in resume_skills if fuzz.partial_ratio(job_skill, r) >= threshold}
+
+def assert_matches(similarity, job_skills, resume_skills):
+    for job_skill in job_skills:
+        for threshold in THRESHOLDS:
+            assert similarity.matches(job_skill, threshold) == expected_matches(job_skill, resume_skills, threshold)
+
+def test_matches_equal_partial_ratio(skills):
+    job_skills, resume_skills = skills
+    similarity = SkillSimilarity()
+    similarity.ensure(job_skills, resume_skills)
+    assert_matches(similarity, job_skills, resume_skills)
+
+def test_incremental_ensure_equals_one_pass(skills):
+    job_skills, resume_skills = skills
+    similarity = SkillSimilarity()
+    similarity.ensure(job_skills[:50], resume_skills[:100])
+    similarity.matches(job_skills[0], 85)
+    similarity.ensure(job_skills[25:], resume_skills[50:])
+    assert_matches(similarity, job_skills, resume_skills)
+
+def test_save_and_load_keep_scores(skills, tmp_path):
+    job_skills, resume_skills = skills
+    similarity = SkillSimilarity()
+    similarity.ensure(job_skills, resume_skills)
+    path = str(tmp_path / "similarity.npz")
+    similarity.save(path)
+    loaded = SkillSimilarity.load(path)
+    assert loaded.covers(job_skills, resume_skills)
+    assert_matches(loaded, job_skills, resume_skills)
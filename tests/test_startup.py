@@ -0,0 +1,15 @@
+import os
+import sys
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import bench_startup
+
+# The CLI and the modules pool workers import stay within bench_startup's budget and leave
+# document extraction and model libraries to the code paths that use them
+@pytest.mark.parametrize("module", bench_startup.MODULES)
+def test_import_within_budget(module):
+    best, problems = bench_startup.check(module, runs=3)
+    assert not problems, f"{module} ({best[module] / 1000:.0f} ms): {'; '.join(problems)}"
@@ -0,0 +1,26 @@
+import threading
+
+from Scripts import text_cache
+
+def test_threads_writing_one_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_cache, "TEXT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(text_cache, "_cache_bytes", None)
+    digest = text_cache.bytes_hash(b"resume")
+    text = "Jane Doe\r\nData Analyst – SQL, Python\n" * 100
+    errors = []
+
+    def write():
+        try:
+            for _ in range(50):
+                text_cache.put_text(digest, "docx", 1, text)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert text_cache.get_text(digest, "docx", 1) == text
+    assert [p.name for p in (tmp_path / digest[:2]).iterdir()] == [f"{digest}-docx-v1.txt"]
@@ -0,0 +1,39 @@
+import os
+import pytest
+
+from conftest import ROOT
+from settings import KEYWORDS_FILE
+from Scripts.taxonomy import get_taxonomy
+from Scripts.title_index import TitleIndex
+
+fuzz = pytest.importorskip("fuzzywuzzy.fuzz")
+
+# Header lines of the kinds that tell fuzzywuzzy's and rapidfuzz's preprocessing apart
+LINES = [
+    "Data_Analyst",
+    "linkedin.com/in/data_analyst",
+    "john_smith@gmail.com",
+    "Senior Data Analyst",
+    "Analyste principal(e) – données",
+    "PROGRAM OFFICER | Ottawa, ON",
+    "__init__",
+    "---",
+    "",
+]
+
+@pytest.fixture(scope="module")
+def titles(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "taxonomy.pkl"
+    return get_taxonomy(os.path.join(ROOT, KEYWORDS_FILE), str(snapshot)).titles
+
+def test_line_scores_match_token_sort_ratio(titles):
+    scores = TitleIndex(titles).line_scores(LINES)
+    for line, row in zip(LINES, scores):
+        expected = [fuzz.token_sort_ratio(line, title) for title in titles]
+        assert row.tolist() == expected, line
+
+def test_title_similarities_match_token_sort_ratio(titles):
+    index = TitleIndex(titles)
+    for title in titles[:50] + LINES:
+        expected = [fuzz.token_sort_ratio(title, other) for other in titles]
+        assert index.title_similarities(title).tolist() == expected, title
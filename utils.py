@@ -3,11 +3,16 @@ import logging
 from functools import wraps
 
 def setup_logger(log_file):
+    # Every module calls this on import: only the first call configures logging, and the
+    # log file is opened when the first record is written rather than at import
+    if logging.getLogger().handlers:
+        return
+
     # ✅ Ensure the logs directory exists
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
     logging.basicConfig(
-        filename=log_file,
+        handlers=[logging.FileHandler(log_file, delay=True)],
         level=logging.ERROR,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )